@@ -0,0 +1,161 @@
+# nexa/agent.py
+"""
+Pilot agent: runs a subgraph of a remote run inside one SLURM allocation.
+
+In pilot mode RemoteBackend submits a run's short modules as a single job
+whose script starts ``python -m nexa.agent <name>.json``. The agent rebuilds
+those modules from the manifest and runs them with LocalBackend, so the ready
+queue, resource budget and critical-path ordering of a local run apply,
+bounded by the cores and memory of the allocation. Outputs land in
+``outputs/<module_id>`` next to the manifest, where the job scripts of
+ordinary SLURM jobs put them.
+
+Every module event is appended to ``<name>.status.jsonl`` next to the manifest
+as one complete JSON line, which RemoteBackend tails while it polls, so
+modules are reported one by one while the allocation is still running.
+Modules that never started because an upstream module failed are reported as
+skipped at the end. The agent exits 0 only if every module succeeded. Jobs
+outside the pilot therefore wait for it with ``afterany`` and check the
+completion marker ``<name>.done/<module_id>`` of each module they need, which
+is created before the module's completion is logged.
+
+Manifest::
+
+    {"workflow_id": "...",
+     "modules": [<Module.to_dict(), script absolute, parameters merged>, ...],
+     "connections": [<connections between the listed modules>],
+     "inputs": {"<module_id>": {"<port>": "<absolute path>"}}}
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .backends.base import ModuleResult
+from .backends.local import LocalBackend
+from .backends.scheduler import ReadyQueue
+from .core.module import Module
+from .core.workflow import Workflow
+
+# Event data fields forwarded to the status log
+_STATUS_FIELDS = ("error", "returncode", "skipped", "cached", "metrics")
+
+
+class StatusLog:
+    """Event callback appending one JSON line per module event to a file.
+
+    With ``done_dir``, an empty file named after each completed module is
+    created there as well.
+    """
+
+    def __init__(self, path: Path, done_dir: Optional[Path] = None):
+        self.path = path
+        self.path.write_text("")
+        self.done_dir = done_dir
+        if done_dir is not None:
+            done_dir.mkdir(parents=True, exist_ok=True)
+        self.reported: set = set()   # modules with a final event
+        self._lock = threading.Lock()
+
+    def __call__(self, event: str, module_id: str, data: Dict[str, Any]) -> None:
+        if event not in ("module_start", "module_complete", "module_failed"):
+            return
+        record = {"event": event, "module": module_id, "time": time.time()}
+        record.update((key, data[key]) for key in _STATUS_FIELDS if key in data)
+        line = json.dumps(record, default=str) + "\n"
+        if event == "module_complete" and self.done_dir is not None:
+            (self.done_dir / module_id).touch()
+        with self._lock, open(self.path, "a") as f:
+            # one write per line: readers only ever see whole lines before the last newline
+            f.write(line)
+            f.flush()
+            if event != "module_start":
+                self.reported.add(module_id)
+
+
+class PilotBackend(LocalBackend):
+    """LocalBackend whose module inputs are absolute paths from the manifest.
+
+    Inputs may come from modules outside the pilot (completed in an earlier
+    run), which are not part of the rebuilt workflow. A failure only stops
+    the modules downstream of it.
+    """
+
+    def __init__(self, inputs: Dict[str, Dict[str, str]], **kwargs):
+        super().__init__(**kwargs)
+        self.inputs = inputs
+
+    def _collect_inputs(self, workflow: Workflow, mod_id: str) -> Dict[str, Path]:
+        return {port: Path(path) for port, path in self.inputs.get(mod_id, {}).items()}
+
+    def _ready_queue(self, workflow: Workflow, done: Dict[str, ModuleResult]) -> ReadyQueue:
+        # independent branches keep starting after a failure, as separate jobs would
+        queue = super()._ready_queue(workflow, done)
+        queue.keep_going = True
+        return queue
+
+
+def load_manifest(path: Path) -> tuple:
+    """Return (workflow, inputs) described by a pilot manifest."""
+    with open(path) as f:
+        manifest = json.load(f)
+    modules = [Module.from_dict(data, base_path=path.parent) for data in manifest["modules"]]
+    data = {"workflow_id": manifest["workflow_id"], "connections": manifest["connections"]}
+    return Workflow(data, base_dir=path.parent, modules=modules), manifest.get("inputs", {})
+
+
+def run_pilot(manifest: Path, cpus: Optional[int] = None, mem: Optional[str] = None) -> int:
+    """Run every module of a manifest; returns the process exit code."""
+    manifest = manifest.resolve()
+    workflow, inputs = load_manifest(manifest)
+    status = StatusLog(manifest.with_suffix(".status.jsonl"), manifest.with_suffix(".done"))
+    print(f"[AGENT] Running {len(workflow.modules)} modules of "
+          f"'{workflow.workflow_id}' on {cpus or 'all'} cpus")
+    # modules running when another fails are not killed, as separate jobs would not be
+    backend = PilotBackend(inputs, workdir=manifest.parent, on_event=status,
+                           cpus=cpus, mem=mem, fail_fast=False)
+    result = backend.execute(workflow)
+
+    for mod_id, res in result.modules.items():
+        if mod_id not in status.reported:
+            _report_unstarted(status, res)
+    print(f"[AGENT] Done. Status: {result.status}")
+    return 0 if result.status == "success" else 1
+
+
+def _report_unstarted(status: StatusLog, res: ModuleResult) -> None:
+    """Report a module that finished without an event (e.g. left out after a failure)."""
+    if res.status == "skipped":
+        status("module_failed", res.module_id,
+               {"error": f"Cancelled: {res.error}" if res.error else "Cancelled",
+                "skipped": True})
+    elif res.status == "failed":
+        status("module_failed", res.module_id, {"error": res.error, "returncode": res.returncode})
+
+
+def _slurm_cpus() -> Optional[int]:
+    for var in ("SLURM_CPUS_PER_TASK", "SLURM_CPUS_ON_NODE"):
+        if os.environ.get(var, "").isdigit():
+            return int(os.environ[var])
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nexa.agent",
+        description="Run the modules of a pilot manifest inside a SLURM allocation.",
+    )
+    parser.add_argument("manifest", type=Path, help="Pilot manifest written by RemoteBackend")
+    parser.add_argument("--cpus", type=int, default=None,
+                        help="Cores to use (default: the allocation's, else all)")
+    parser.add_argument("--mem", default=None,
+                        help="Memory to use, e.g. 16G (default: physical memory)")
+    args = parser.parse_args(argv)
+    return run_pilot(args.manifest, args.cpus or _slurm_cpus(), args.mem)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
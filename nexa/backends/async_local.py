@@ -0,0 +1,221 @@
+# nexa/backends/async_local.py
+"""
+asyncio-native local execution backend.
+
+Same scheduling, resource budget, output cache and journal as LocalBackend,
+but modules are awaited on the event loop instead of occupying one pool
+thread each. A module is started with ``subprocess.Popen``, and its stdout and
+stderr pipes are attached to the loop with ``connect_read_pipe``. Its output
+is streamed line by line as "module_output" events while it runs, and written
+to the same ``logs/<module_id>.{out,err}`` files LocalBackend uses.
+
+Children are reaped with ``os.wait4`` (``_wait4``) rather than by asyncio's
+child watcher, so their CPU time and peak RSS end up in the run's
+ModuleMetrics. On Linux the wait is driven by a pidfd registered with the
+event loop, so thousands of lightweight modules can be in flight at once.
+Without pidfd support (macOS, kernels before 5.3) each running module ties up
+one thread of the loop's default executor (at most ``min(32, cpus + 4)``) in
+``os.wait4``. Beyond that many modules, completions are noticed only as
+threads free up, much as with LocalBackend's thread pool.
+
+Use ``await AsyncLocalBackend(...).execute_async(workflow)`` (or
+``UnifiedExecutor.run_async``) from inside an event loop; ``execute`` is a
+blocking wrapper for synchronous callers.
+"""
+import asyncio
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from .base import ModuleMetrics, ModuleResult, WorkflowResult
+from .local import LocalBackend
+from ..utils.resources import rusage_usage
+from ..core.workflow import Workflow
+
+# Longest output line reported as one module_output event; longer ones are split
+_LINE_LIMIT = 1 << 20
+# Bytes read from a child's pipe at a time
+_CHUNK = 1 << 16
+
+
+class AsyncLocalBackend(LocalBackend):
+    """Execute workflow modules as asyncio subprocesses on the running event loop."""
+
+    def execute(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
+        return asyncio.run(self.execute_async(workflow, parameters))
+
+    async def execute_async(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
+        module_results = self._begin_run(workflow)
+        queue = self._ready_queue(workflow, module_results)
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while queue.active:
+                for mid in queue.startable():
+                    module = workflow.module_map[mid]
+                    task = asyncio.ensure_future(self._run_and_record_async(
+                        module,
+                        self._collect_inputs(workflow, mid),
+                        self._merge_params(module, parameters),
+                        queue.ready_since.get(mid),
+                    ))
+                    running[task] = mid
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(finished, key=lambda t: queue.position[running[t]]):
+                    mid = running.pop(task)
+                    result = task.result()
+                    module_results[mid] = result
+                    queue.finish(mid, result.status != "failed")
+                    if result.status == "failed" and self.fail_fast:
+                        self._cancel_running(mid)
+        finally:
+            # also on errors and cancellation: module servers must not outlive the run
+            self.servers.close()
+
+        return self._end_run(workflow, queue, module_results)
+
+    async def _run_and_record_async(self, module, inputs: Dict[str, Path],
+                                    params: Dict[str, Any],
+                                    queued_at: Optional[float] = None) -> ModuleResult:
+        # journal writes fsync and hash outputs; keep them off the event loop
+        await asyncio.to_thread(self.journal.module_start, module.id)
+        result = await self._run_module_async(module, inputs, params, queued_at)
+        if result.status == "success":
+            await asyncio.to_thread(self.journal.module_complete, module.id, result.outputs)
+        else:
+            await asyncio.to_thread(self.journal.module_failed, module.id, result.error)
+        return result
+
+    async def _run_module_async(self, module, inputs: Dict[str, Path],
+                                params: Dict[str, Any],
+                                queued_at: Optional[float] = None) -> ModuleResult:
+        dispatched = time.time()
+        script_path = module.get_script_path()
+        if script_path is None:
+            return ModuleResult(module_id=module.id, status="failed", error="No script defined")
+
+        out_dir = self.outputs_dir / module.id
+        outputs = {port: str(out_dir / port) for port in module.output_ports}
+
+        cache_key = None
+        if self.cache:
+            cache_key = await asyncio.to_thread(self.cache.key, module, params, inputs)
+            cached = await asyncio.to_thread(
+                self._restore_cached, module, cache_key, out_dir, outputs
+            )
+            if cached:
+                return cached
+
+        cmd = self._build_command(module, script_path, inputs, params, out_dir)
+        self._emit("module_start", module.id, {"cmd": " ".join(str(c) for c in cmd)})
+        print(f"Running: {' '.join(str(c) for c in cmd)}")
+
+        stdout_log, stderr_log = self._log_paths(module.id)
+        start = time.time()
+        if module.mode == "server" or (self.warm_pool and self.warm_pool.accepts(module)):
+            # Output goes straight to the log files; no line streaming
+            if module.mode == "server":
+                returncode, usage = await asyncio.to_thread(
+                    self._invoke_server, module, script_path, inputs, params, out_dir
+                )
+            else:
+                returncode, usage = await self._run_warm(cmd, stdout_log, stderr_log)
+        else:
+            returncode, usage = await self._run_streamed(module.id, cmd, stdout_log, stderr_log)
+        metrics = ModuleMetrics.measured(start, time.time(), queued_at, **usage)
+        if returncode != 0 and module.id in self._terminated:
+            return self._cancelled_result(module, metrics)
+
+        phases = {"staging": (dispatched, start)}
+        if cache_key and returncode == 0:
+            synced = time.time()
+            await asyncio.to_thread(self.cache.store, cache_key, out_dir)
+            phases["sync"] = (synced, time.time())
+        return self._finish_module(module, returncode, outputs, out_dir, None, metrics, phases)
+
+    async def _run_streamed(self, module_id: str, cmd, stdout_log: Path,
+                            stderr_log: Path) -> Tuple[int, Dict[str, Any]]:
+        """Run a command, streaming its output; return its exit code and usage."""
+        loop = asyncio.get_running_loop()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._track(module_id, proc)
+        try:
+            streams = []
+            for pipe in (proc.stdout, proc.stderr):
+                reader = asyncio.StreamReader(limit=_CHUNK)
+                await loop.connect_read_pipe(lambda r=reader: asyncio.StreamReaderProtocol(r), pipe)
+                streams.append(reader)
+            with open(stdout_log, "wb") as out, open(stderr_log, "wb") as err:
+                await asyncio.gather(
+                    self._pump(module_id, streams[0], "stdout", out),
+                    self._pump(module_id, streams[1], "stderr", err),
+                )
+            status, ru = await _wait4(proc.pid)
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            self._untrack(module_id)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return proc.returncode, rusage_usage(ru)
+
+    async def _run_warm(self, cmd, stdout_log: Path,
+                        stderr_log: Path) -> Tuple[int, Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self.warm_pool.submit(
+            cmd[1], cmd[2:], stdout_log, stderr_log,
+            callback=lambda outcome: loop.call_soon_threadsafe(done.set_result, outcome),
+            error_callback=lambda exc: loop.call_soon_threadsafe(done.set_exception, exc),
+        )
+        return await done
+
+    async def _pump(self, module_id: str, stream: asyncio.StreamReader, name: str,
+                    sink: BinaryIO) -> None:
+        """Copy a child's output stream to its log, one module_output event per line.
+
+        The log gets every byte as read. Lines longer than ``_LINE_LIMIT``
+        are reported in pieces of that size.
+        """
+        pending = b""
+        while True:
+            chunk = await stream.read(_CHUNK)
+            if not chunk:
+                break
+            sink.write(chunk)
+            *lines, pending = (pending + chunk).split(b"\n")
+            for raw in lines:
+                self._emit_output(module_id, name, raw)
+            while len(pending) >= _LINE_LIMIT:
+                self._emit_output(module_id, name, pending[:_LINE_LIMIT])
+                pending = pending[_LINE_LIMIT:]
+        if pending:
+            self._emit_output(module_id, name, pending)
+
+    def _emit_output(self, module_id: str, name: str, raw: bytes) -> None:
+        self._emit("module_output", module_id,
+                   {"stream": name, "line": raw.decode(errors="replace")})
+
+
+async def _wait4(pid: int):
+    """Reap a child without blocking the loop; returns ``(wait status, rusage)``."""
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        # no pidfd (older kernel, macOS): park the wait in a worker thread
+        _, status, ru = await asyncio.to_thread(os.wait4, pid, 0)
+        return status, ru
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+    loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+    try:
+        await exited
+    finally:
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+    _, status, ru = os.wait4(pid, 0)
+    return status, ru
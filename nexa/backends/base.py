@@ -6,12 +6,45 @@ backends must produce. Callers (ModelWave runner, tests) can inspect per-module
 status without parsing stdout.
 """
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Callable, Dict, Optional, Any
+from ..core.journal import RunJournal
 from ..core.workflow import Workflow
 
 
+# Bytes of each output stream kept on ModuleResult when the full text is in a log file
+LOG_TAIL_BYTES = 16 * 1024
+
+
+@dataclass
+class ModuleMetrics:
+    """Timing and resource usage of one module run; None where a backend cannot tell."""
+    submit_time: Optional[float] = None  # epoch seconds: ready to run / submitted to SLURM
+    start_time: Optional[float] = None   # epoch seconds
+    end_time: Optional[float] = None     # epoch seconds
+    wall_time: Optional[float] = None    # seconds, end - start
+    queue_time: Optional[float] = None   # seconds, start - submit
+    user_cpu: Optional[float] = None     # seconds
+    sys_cpu: Optional[float] = None      # seconds
+    max_rss: Optional[int] = None        # bytes
+
+    @classmethod
+    def measured(cls, start_time: Optional[float], end_time: Optional[float],
+                 submit_time: Optional[float] = None, **usage) -> "ModuleMetrics":
+        """Fill in wall and queue time from the timestamps that are known."""
+        return cls(
+            submit_time=submit_time, start_time=start_time, end_time=end_time,
+            wall_time=end_time - start_time if start_time and end_time else None,
+            queue_time=(start_time - submit_time
+                        if submit_time and start_time and start_time >= submit_time else None),
+            **usage,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
 @dataclass
 class ModuleResult:
     """Outcome of executing one module."""
@@ -20,8 +53,22 @@ class ModuleResult:
     outputs: Dict[str, str] = field(default_factory=dict)  # port -> output file path
     returncode: Optional[int] = None
     error: str = ""
-    stdout: str = ""
-    stderr: str = ""
+    stdout: str = ""        # tail of the output when stdout_log is set
+    stderr: str = ""        # tail of the output when stderr_log is set
+    cached: bool = False    # outputs restored from the output cache, not recomputed
+    resumed: bool = False   # completed in an earlier, interrupted run (--resume)
+    stdout_log: Optional[str] = None  # full stdout, e.g. <workdir>/logs/<module_id>.out
+    stderr_log: Optional[str] = None  # full stderr, e.g. <workdir>/logs/<module_id>.err
+    metrics: Optional[ModuleMetrics] = None  # timing and resource usage of the run
+
+    def read_log(self, stream: str = "stdout") -> str:
+        """Return the complete stdout or stderr text, reading the log file on demand."""
+        if stream not in ("stdout", "stderr"):
+            raise ValueError(f"stream must be 'stdout' or 'stderr', not {stream!r}")
+        log = self.stdout_log if stream == "stdout" else self.stderr_log
+        if log is None:
+            return getattr(self, stream)
+        return Path(log).read_text(errors="replace")
 
     def to_dict(self) -> dict:
         return {
@@ -30,6 +77,11 @@ class ModuleResult:
             "outputs": self.outputs,
             "returncode": self.returncode,
             "error": self.error,
+            "cached": self.cached,
+            "resumed": self.resumed,
+            "stdout_log": self.stdout_log,
+            "stderr_log": self.stderr_log,
+            "metrics": self.metrics.to_dict() if self.metrics else None,
         }
 
 
@@ -53,17 +105,26 @@ class WorkflowResult:
 
 
 # Callback signature: on_event(event_type, module_id, data)
-# event_type in {"module_start", "module_complete", "module_failed"}
+# event_type in {"module_start", "module_running", "module_complete", "module_failed",
+#                "module_output"}
+# ("module_output" carries {"stream", "line"} and is only fired by AsyncLocalBackend;
+#  "module_running" carries {"job_id"} and is fired by RemoteBackend when the job starts;
+#  "module_failed" carries "skipped": True for a module cancelled after another failed;
+#  "module_complete" and "module_failed" carry "metrics" when the run was measured,
+#  with "phases" {"staging" | "sync": (start, end)} and, on SLURM, "job_id")
 EventCallback = Callable[[str, str, Dict[str, Any]], None]
 
 
 class BaseBackend(ABC):
     """Abstract base class for workflow execution backends."""
 
-    def __init__(self, workdir: Path = None, on_event: EventCallback = None):
+    def __init__(self, workdir: Path = None, on_event: EventCallback = None,
+                 resume: bool = False):
         self.workdir = workdir or Path("workdir")
         self.workdir.mkdir(parents=True, exist_ok=True)
         self._on_event: EventCallback = on_event or (lambda *_: None)
+        self.resume = resume
+        self.journal = RunJournal(self.workdir)
 
     def _emit(self, event: str, module_id: str, data: Dict[str, Any] = None) -> None:
         self._on_event(event, module_id, data or {})
@@ -0,0 +1,106 @@
+"""
+Content-addressed store of staged files on the cluster.
+
+RemoteBackend no longer copies module scripts and params files into every
+run. Each thing a job needs, such as a module script with its data files or a
+params file, is an *object*: a small directory tree named by the hash of its
+contents, ``<root>/<hash>/<files>``. Objects are immutable once installed,
+so any number of runs and workflows share them. Before a run is submitted,
+one remote ``ls`` finds which of its objects are missing. Only those are
+added to the run's bundle, and ``submit_all.sh`` moves them into the store.
+Repeat runs of an unchanged workflow upload nothing but job scripts.
+
+Because job scripts reference the staged copies, runs also work on clusters
+that do not share a filesystem with the submitting machine.
+"""
+import hashlib
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Union
+
+from ..utils.hashing import hash_file
+
+# Object hashes per remote ``ls`` call
+_QUERY_CHUNK = 1000
+
+Content = Union[Path, bytes]   # a local file, or contents generated in memory
+
+
+class RemoteStore:
+    """The objects a run needs from a content-addressed directory on the host."""
+
+    def __init__(self, root: str):
+        self.root = root.rstrip("/")
+        self.objects: Dict[str, Dict[str, Content]] = {}   # hash -> {relative name: content}
+        self._file_hashes: Dict[Path, str] = {}
+
+    def _hash(self, content: Content) -> str:
+        if isinstance(content, bytes):
+            return hashlib.sha256(content).hexdigest()
+        if content not in self._file_hashes:
+            self._file_hashes[content] = hash_file(content)
+        return self._file_hashes[content]
+
+    def add(self, files: Dict[str, Content]) -> str:
+        """Register an object made of ``files`` (relative name -> content).
+
+        Returns its remote directory.
+        """
+        h = hashlib.sha256()
+        for name in sorted(files):
+            h.update(name.encode())
+            h.update(b"\0")
+            h.update(self._hash(files[name]).encode())
+            h.update(b"\0")
+        key = h.hexdigest()
+        self.objects.setdefault(key, dict(files))
+        return f"{self.root}/{key}"
+
+    def missing(self, run: Callable[[str], Tuple[int, str, str]]) -> List[str]:
+        """Hashes of the registered objects not yet installed on the host.
+
+        ``run`` executes a remote shell command. If the query fails, every
+        object counts as missing; uploading too much is harmless.
+        """
+        keys = sorted(self.objects)
+        present = set()
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i:i + _QUERY_CHUNK]
+            rc, out, _ = run(
+                f"mkdir -p {self.root} && cd {self.root} && "
+                f"ls -d {' '.join(chunk)} 2>/dev/null || true"
+            )
+            if rc != 0:
+                return keys
+            present.update(line.strip() for line in out.splitlines())
+        return [key for key in keys if key not in present]
+
+    def write(self, directory: Path, keys: List[str]) -> int:
+        """Write the listed objects below ``directory``; returns the bytes written."""
+        total = 0
+        for key in keys:
+            for name, content in self.objects[key].items():
+                target = directory / key / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                if isinstance(content, bytes):
+                    target.write_bytes(content)
+                else:
+                    shutil.copy2(content, target)
+                total += target.stat().st_size
+        return total
+
+    def install_script(self, directory: str) -> str:
+        """Shell lines moving the objects unpacked in ``directory`` into the store.
+
+        A rename is atomic, so a concurrent run never sees a partial object;
+        if another run installed the same object first, this copy is dropped.
+        """
+        return (
+            f"if [ -d {directory} ]; then\n"
+            f"    mkdir -p {self.root}\n"
+            f"    for obj in {directory}/*; do\n"
+            f"        [ -e \"{self.root}/${{obj##*/}}\" ] || mv \"$obj\" {self.root}/\n"
+            f"    done\n"
+            f"    rm -rf {directory}\n"
+            f"fi\n"
+        )
@@ -2,77 +2,293 @@
 """
 Local execution backend using subprocess.
 
-Independent modules (no dependency between them) are run in parallel via a
-thread pool — each topological level executes concurrently. This maps to the
+Modules are dispatched from a ReadyQueue onto a single persistent thread pool:
+a module starts as soon as all of its upstream modules have finished, rather
+than waiting for its whole topological level to drain. This maps to the
 natural parallelism of the module DAG without requiring a cluster.
+
+Admission is bounded by a machine ResourceBudget: a ready module is only
+started while the cores and memory it declares in `resources` still fit next
+to the modules already running.
+
+With an OutputCache attached, a module whose script, executable, parameters and
+input files are unchanged since an earlier run has its outputs restored from the
+cache instead of being executed.
+
+Every start and completion is appended to the run journal; with ``resume=True``
+modules whose journaled outputs are still intact are not run again.
+
+Module stdout/stderr go straight to ``logs/<module_id>.out`` / ``.err`` in the
+workdir; only a bounded tail is kept in memory on the ModuleResult.
+
+With a WarmWorkerPool attached, Python modules run in pre-forked workers with
+their heavy imports already loaded instead of in a fresh interpreter each.
+Modules declaring ``"mode": "server"`` are started once per run and invoked
+over the module-server protocol (see module_server.py).
+
+Ready modules compete for free slots in critical-path order by default: the
+module with the most (estimated) work still downstream of it starts first.
+Estimates are the mean runtimes recorded in the RunHistory, if one is
+attached, else the module runtimes of the previous run in the same workdir
+read from its journal; ``schedule="fifo"`` starts modules in the order they
+became ready instead.
+
+Each run is measured: the ModuleResult carries a ModuleMetrics with its
+timestamps, time spent waiting in the ready queue, and the CPU time and peak
+RSS reported by ``os.wait4`` (or by the warm worker / module server).
+
+Runs fail fast: once a module fails nothing new is started, and with
+``fail_fast=True`` (the default) the subprocesses of modules still running
+are terminated rather than waited for; those modules end up "skipped".
 """
 import json
+import os
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-from .base import BaseBackend, ModuleResult, WorkflowResult
+from .base import LOG_TAIL_BYTES, BaseBackend, ModuleMetrics, ModuleResult, WorkflowResult
+from .module_server import ModuleServerPool
+from .scheduler import SCHEDULES, ReadyQueue, critical_path_priorities
+from .worker_pool import WarmWorkerPool
+from ..core.cache import OutputCache
+from ..core.history import RunHistory
 from ..core.workflow import Workflow
+from ..utils.resources import ResourceBudget, rusage_usage
+
+# Seconds a cancelled module gets to exit after SIGTERM before it is killed
+CANCEL_GRACE = 5.0
 
 
 class LocalBackend(BaseBackend):
     """Execute workflow modules locally via subprocess, in parallel where possible."""
 
-    def __init__(self, workdir: Path = None, on_event=None, parallel: bool = True):
-        super().__init__(workdir, on_event)
+    def __init__(self, workdir: Path = None, on_event=None, parallel: bool = True,
+                 max_workers: Optional[int] = None, cpus: Optional[int] = None,
+                 mem=None, cache: Optional[OutputCache] = None, resume: bool = False,
+                 warm_pool: Optional[WarmWorkerPool] = None, schedule: str = "critical-path",
+                 history: Optional[RunHistory] = None, fail_fast: bool = True):
+        super().__init__(workdir, on_event, resume)
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}'. Choose from: {list(SCHEDULES)}")
         self.outputs_dir = self.workdir / "outputs"
         self.outputs_dir.mkdir(exist_ok=True)
+        self.logs_dir = self.workdir / "logs"
+        self.logs_dir.mkdir(exist_ok=True)
         self.parallel = parallel
+        self.max_workers = max_workers
+        self.budget = ResourceBudget(cpus=cpus, mem=mem)
+        self.cache = cache
+        self.warm_pool = warm_pool
+        self.servers = ModuleServerPool(self.logs_dir)
+        self.schedule = schedule
+        self.history = history
+        self.runtime_estimates: Dict[str, float] = {}
+        self.fail_fast = fail_fast
+        self._procs: Dict[str, subprocess.Popen] = {}   # module id -> running subprocess
+        self._procs_lock = threading.Lock()
+        self._failed_first: Optional[str] = None       # failure that cancelled the run
+        self._terminated: set = set()                  # modules stopped by that cancellation
 
     def _get_output_path(self, module_id: str, port: str) -> Path:
         return self.outputs_dir / module_id / port
 
-    def _run_module(self, module, inputs: Dict[str, Path], params: Dict[str, Any]) -> ModuleResult:
-        """Run a single module as a subprocess; return a ModuleResult."""
-        script_path = module.get_script_path()
-        if script_path is None:
-            return ModuleResult(module_id=module.id, status="failed", error="No script defined")
+    def _params_path(self, module_id: str) -> Path:
+        return self.workdir / f"{module_id}_params.json"
+
+    def _log_paths(self, module_id: str) -> Tuple[Path, Path]:
+        return self.logs_dir / f"{module_id}.out", self.logs_dir / f"{module_id}.err"
 
+    def _build_command(self, module, script_path: Path, inputs: Dict[str, Path],
+                       params: Dict[str, Any], out_dir: Path) -> List[str]:
+        """Materialise the params file and return the module's command line."""
         cmd: List[str] = [module.executable, str(script_path)]
 
         for port, path in inputs.items():
             cmd.extend(["--input", port, str(path)])
 
         if params:
-            param_file = self.workdir / f"{module.id}_params.json"
+            param_file = self._params_path(module.id)
             with open(param_file, "w") as f:
                 json.dump(params, f)
             cmd.extend(["--params", str(param_file)])
 
-        out_dir = self.outputs_dir / module.id
         out_dir.mkdir(exist_ok=True)
         cmd.extend(["--output_dir", str(out_dir)])
+        return cmd
 
-        self._emit("module_start", module.id, {"cmd": " ".join(str(c) for c in cmd)})
-        print(f"Running: {' '.join(str(c) for c in cmd)}")
+    def _restore_cached(self, module, cache_key: Optional[str], out_dir: Path,
+                        outputs: Dict[str, str]) -> Optional[ModuleResult]:
+        """Restore a module's outputs from the cache; None on a miss."""
+        if not cache_key or not self.cache.restore(cache_key, out_dir):
+            return None
+        self._emit("module_start", module.id, {"cached": True})
+        print(f"Module {module.id} restored from cache.")
+        self._emit("module_complete", module.id, {"outputs": outputs, "cached": True})
+        return ModuleResult(
+            module_id=module.id, status="success",
+            returncode=0, outputs=outputs, cached=True,
+        )
 
-        proc = subprocess.run(cmd, capture_output=True, text=True)
-        outputs = {port: str(out_dir / port) for port in module.output_ports}
+    def _finish_module(self, module, returncode: int, outputs: Dict[str, str],
+                       out_dir: Path, cache_key: Optional[str],
+                       metrics: Optional[ModuleMetrics] = None,
+                       phases: Optional[Dict[str, Tuple[float, float]]] = None) -> ModuleResult:
+        """Turn a finished process into a ModuleResult and fire the matching event.
 
-        if proc.returncode != 0:
-            err = proc.stderr.strip()
-            self._emit("module_failed", module.id, {"error": err, "returncode": proc.returncode})
+        ``phases`` maps "staging" / "sync" to their (start, end) times; the
+        cache store done here is added as "sync".
+        """
+        stdout_log, stderr_log = self._log_paths(module.id)
+        stdout, stderr = _read_tail(stdout_log), _read_tail(stderr_log)
+        logs = {"stdout_log": str(stdout_log), "stderr_log": str(stderr_log)}
+        phases = dict(phases or {})
+        if returncode == 0 and cache_key:
+            synced = time.time()
+            self.cache.store(cache_key, out_dir)
+            phases["sync"] = (synced, time.time())
+        measured = {"metrics": metrics.to_dict(), "phases": phases} if metrics else {}
+
+        if returncode != 0:
+            err = stderr.strip()
+            self._emit("module_failed", module.id,
+                       {"error": err, "returncode": returncode, **measured})
             return ModuleResult(
                 module_id=module.id, status="failed",
-                returncode=proc.returncode, error=err,
-                stdout=proc.stdout, stderr=proc.stderr,
-                outputs=outputs,
+                returncode=returncode, error=err,
+                stdout=stdout, stderr=stderr,
+                outputs=outputs, metrics=metrics, **logs,
             )
 
         print(f"Module {module.id} completed.")
-        self._emit("module_complete", module.id, {"outputs": outputs})
+        self._emit("module_complete", module.id, {"outputs": outputs, **measured})
         return ModuleResult(
             module_id=module.id, status="success",
             returncode=0, outputs=outputs,
-            stdout=proc.stdout, stderr=proc.stderr,
+            stdout=stdout, stderr=stderr, metrics=metrics, **logs,
         )
 
+    def _run_module(self, module, inputs: Dict[str, Path], params: Dict[str, Any],
+                    queued_at: Optional[float] = None) -> ModuleResult:
+        """Run a single module as a subprocess; return a ModuleResult.
+
+        ``queued_at`` is when the module became ready, for its queue time.
+        """
+        dispatched = time.time()
+        script_path = module.get_script_path()
+        if script_path is None:
+            return ModuleResult(module_id=module.id, status="failed", error="No script defined")
+
+        out_dir = self.outputs_dir / module.id
+        outputs = {port: str(out_dir / port) for port in module.output_ports}
+
+        cache_key = self.cache.key(module, params, inputs) if self.cache else None
+        cached = self._restore_cached(module, cache_key, out_dir, outputs)
+        if cached:
+            return cached
+
+        cmd = self._build_command(module, script_path, inputs, params, out_dir)
+        self._emit("module_start", module.id, {"cmd": " ".join(str(c) for c in cmd)})
+        print(f"Running: {' '.join(str(c) for c in cmd)}")
+
+        stdout_log, stderr_log = self._log_paths(module.id)
+        start = time.time()
+        if module.mode == "server":
+            returncode, usage = self._invoke_server(module, script_path, inputs, params, out_dir)
+        elif self.warm_pool and self.warm_pool.accepts(module):
+            returncode, usage = self.warm_pool.run(cmd[1], cmd[2:], stdout_log, stderr_log)
+        else:
+            try:
+                with open(stdout_log, "wb") as out, open(stderr_log, "wb") as err:
+                    returncode, usage = _run_process(
+                        cmd, out, err, lambda proc: self._track(module.id, proc)
+                    )
+            finally:
+                self._untrack(module.id)
+        metrics = ModuleMetrics.measured(start, time.time(), queued_at, **usage)
+        if returncode != 0 and module.id in self._terminated:
+            return self._cancelled_result(module, metrics)
+        return self._finish_module(module, returncode, outputs, out_dir, cache_key, metrics,
+                                   {"staging": (dispatched, start)})
+
+    def _invoke_server(self, module, script_path: Path, inputs: Dict[str, Path],
+                       params: Dict[str, Any], out_dir: Path) -> Tuple[int, Dict[str, Any]]:
+        """Run one invocation on the module's persistent server.
+
+        Returns its exit code and the resource usage the server reported.
+        """
+        server = self.servers.get(module, script_path)
+        returncode, log, error, usage = server.invoke(
+            module.id, inputs, self._params_path(module.id) if params else None, out_dir
+        )
+        stdout_log, stderr_log = self._log_paths(module.id)
+        stdout_log.write_text(log)
+        stderr_log.write_text(error)
+        return returncode, usage
+
+    def _run_and_record(self, module, inputs: Dict[str, Path], params: Dict[str, Any],
+                        queued_at: Optional[float] = None) -> ModuleResult:
+        """Run a module, journaling its start and outcome."""
+        self.journal.module_start(module.id)
+        result = self._run_module(module, inputs, params, queued_at)
+        if result.status == "success":
+            self.journal.module_complete(module.id, result.outputs)
+        else:
+            self.journal.module_failed(module.id, result.error)
+        return result
+
+    # ── fail-fast cancellation ───────────────────────────────────────────────
+
+    def _track(self, module_id: str, proc: subprocess.Popen) -> None:
+        """Register a module's subprocess; stop it at once if the run is being cancelled."""
+        with self._procs_lock:
+            self._procs[module_id] = proc
+            if self._failed_first is None:
+                return
+            self._terminated.add(module_id)
+        proc.terminate()
+
+    def _untrack(self, module_id: str) -> None:
+        with self._procs_lock:
+            self._procs.pop(module_id, None)
+
+    def _cancel_running(self, failed: str) -> None:
+        """Terminate every module subprocess still running after ``failed`` failed.
+
+        Stragglers that ignore SIGTERM are killed after CANCEL_GRACE seconds.
+        Warm-worker and server invocations are left to finish.
+        """
+        with self._procs_lock:
+            if self._failed_first is None:
+                self._failed_first = failed
+            victims = dict(self._procs)
+            self._terminated.update(victims)
+        if not victims:
+            return
+        print(f"Module {failed} failed: cancelling {sorted(victims)}")
+        for proc in victims.values():
+            proc.terminate()
+        timer = threading.Timer(CANCEL_GRACE, self._kill_stragglers, [victims])
+        timer.daemon = True
+        timer.start()
+
+    def _kill_stragglers(self, victims: Dict[str, subprocess.Popen]) -> None:
+        with self._procs_lock:
+            # still tracked means not reaped yet, so the pid is still ours
+            for module_id, proc in victims.items():
+                if self._procs.get(module_id) is proc:
+                    proc.kill()
+
+    def _cancelled_result(self, module, metrics: Optional[ModuleMetrics]) -> ModuleResult:
+        error = f"Cancelled: module {self._failed_first} failed"
+        print(f"Module {module.id} cancelled ({error[len('Cancelled: '):]}).")
+        self._emit("module_failed", module.id,
+                   {"error": error, "skipped": True, "metrics": metrics.to_dict()})
+        return ModuleResult(module_id=module.id, status="skipped", error=error, metrics=metrics)
+
     def _parallel_levels(self, workflow: Workflow) -> List[List[str]]:
         """Group module IDs into topological levels respecting DAG dependencies.
 
@@ -80,106 +296,148 @@ class LocalBackend(BaseBackend):
         concurrently. Levels are ordered so each level's modules depend only on
         modules in earlier levels.
         """
-        deps: Dict[str, set] = {m.id: set() for m in workflow.modules}
-        for conn in workflow.connections:
-            deps[conn["to"]["module"]].add(conn["from"]["module"])
-
-        remaining = set(deps)
-        done: set = set()
-        levels: List[List[str]] = []
-
-        while remaining:
-            level = [m for m in remaining if deps[m].issubset(done)]
-            if not level:
-                break
-            levels.append(level)
-            done.update(level)
-            remaining -= set(level)
-
-        return levels
+        return workflow.index.levels
 
     def _collect_inputs(self, workflow: Workflow, mod_id: str) -> Dict[str, Path]:
-        inputs: Dict[str, Path] = {}
-        for conn in workflow.connections:
-            if conn["to"]["module"] == mod_id:
-                inputs[conn["to"]["input"]] = self._get_output_path(
-                    conn["from"]["module"], conn["from"]["output"]
-                )
-        return inputs
+        return {
+            port: self._get_output_path(src, output)
+            for port, src, output in workflow.index.inputs(mod_id)
+        }
 
     def _merge_params(self, module, parameters: Optional[dict]) -> dict:
-        mod_params = dict(module.parameters)
-        if parameters:
-            for k, v in parameters.items():
-                if k in mod_params:
-                    mod_params[k] = v
-        return mod_params
+        return module.merged_parameters(parameters)
 
     def _skip_remaining(self, workflow: Workflow, done: Dict[str, ModuleResult], reason: str):
         for mid in workflow.module_map:
             if mid not in done:
                 done[mid] = ModuleResult(module_id=mid, status="skipped", error=reason)
 
-    def execute(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
+    def _begin_run(self, workflow: Workflow) -> Dict[str, ModuleResult]:
+        """Open the run journal; on resume, return results for reusable modules."""
         module_results: Dict[str, ModuleResult] = {}
+        resumed: Dict[str, Dict[str, str]] = {}
+        self._failed_first = None
+        self._terminated = set()
+        # the previous run's journal is about to be replaced; keep its timings
+        self.runtime_estimates = self.journal.module_durations()
+        if self.history is not None and self.schedule == "critical-path":
+            self.runtime_estimates.update(
+                (mid, est.wall_time) for mid, est in self.history.estimates(workflow).items()
+                if est.wall_time is not None
+            )
+        if self.resume:
+            state = self.journal.load()
+            if state["run"] and state["run"]["workflow_id"] != workflow.workflow_id:
+                raise ValueError(
+                    f"Journal in {self.workdir} belongs to workflow "
+                    f"'{state['run']['workflow_id']}', not '{workflow.workflow_id}'"
+                )
+            resumed = self.journal.completed_modules(workflow, state)
+            print(f"Resuming: {len(resumed)}/{len(workflow.modules)} modules already complete")
+        self.journal.begin(workflow.workflow_id, resume=self.resume, backend="local")
+        for mid, outputs in resumed.items():
+            module_results[mid] = ModuleResult(
+                module_id=mid, status="success", returncode=0,
+                outputs=outputs, resumed=True,
+            )
+            self._emit("module_complete", mid, {"outputs": outputs, "resumed": True})
+        return module_results
 
+    def _ready_queue(self, workflow: Workflow, done: Dict[str, ModuleResult]) -> ReadyQueue:
         if self.parallel:
-            levels = self._parallel_levels(workflow)
+            print(f"Execution levels: {self._parallel_levels(workflow)}")
+            max_workers = self.max_workers or max(len(workflow.modules), 1)
         else:
-            levels = [[mid] for mid in workflow.get_execution_order()]
-
-        print(f"Execution levels: {levels}")
-
-        for level in levels:
-            if len(level) == 1:
-                # Single module — run directly, no thread overhead
-                mod_id = level[0]
-                module = workflow.module_map[mod_id]
-                result = self._run_module(
-                    module,
-                    self._collect_inputs(workflow, mod_id),
-                    self._merge_params(module, parameters),
-                )
-                module_results[mod_id] = result
-                if result.status == "failed":
-                    self._skip_remaining(workflow, module_results,
-                                         f"Upstream module {mod_id} failed")
-                    return WorkflowResult(
-                        workflow_id=workflow.workflow_id, status="failed",
-                        modules=module_results, outputs_dir=self.outputs_dir,
-                        error=f"Module {mod_id} failed: {result.error}",
-                    )
+            max_workers = 1
+        print(f"Resource budget: {self.budget}")
+        priority = None
+        if self.schedule == "critical-path":
+            priority = critical_path_priorities(workflow, self.runtime_estimates)
+        return ReadyQueue(workflow, self.budget, max_workers, done=done, priority=priority)
+
+    def _end_run(self, workflow: Workflow, queue: ReadyQueue,
+                 module_results: Dict[str, ModuleResult]) -> WorkflowResult:
+        failed = queue.failed
+        if failed:
+            if len(failed) == 1:
+                reason = f"Upstream module {failed[0]} failed"
+                error = f"Module {failed[0]} failed: {module_results[failed[0]].error}"
             else:
-                # Parallel level — run all modules concurrently
-                with ThreadPoolExecutor(max_workers=len(level)) as pool:
-                    futures = {
-                        pool.submit(
-                            self._run_module,
-                            workflow.module_map[mid],
-                            self._collect_inputs(workflow, mid),
-                            self._merge_params(workflow.module_map[mid], parameters),
-                        ): mid
-                        for mid in level
-                    }
-                    level_failed = False
-                    for fut in as_completed(futures):
-                        mid = futures[fut]
-                        result = fut.result()
-                        module_results[mid] = result
-                        if result.status == "failed":
-                            level_failed = True
-
-                if level_failed:
-                    failed = [mid for mid, r in module_results.items() if r.status == "failed"]
-                    self._skip_remaining(workflow, module_results,
-                                         f"Modules in level failed: {failed}")
-                    return WorkflowResult(
-                        workflow_id=workflow.workflow_id, status="failed",
-                        modules=module_results, outputs_dir=self.outputs_dir,
-                        error=f"Modules failed: {failed}",
-                    )
+                reason = f"Upstream modules failed: {failed}"
+                error = f"Modules failed: {failed}"
+            self._skip_remaining(workflow, module_results, reason)
+            return WorkflowResult(
+                workflow_id=workflow.workflow_id, status="failed",
+                modules=module_results, outputs_dir=self.outputs_dir,
+                error=error,
+            )
 
         return WorkflowResult(
             workflow_id=workflow.workflow_id, status="success",
             modules=module_results, outputs_dir=self.outputs_dir,
         )
+
+    def execute(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
+        module_results = self._begin_run(workflow)
+        queue = self._ready_queue(workflow, module_results)
+        running: Dict[Future, str] = {}
+
+        try:
+            with ThreadPoolExecutor(max_workers=queue.max_workers) as pool:
+                while queue.active:
+                    for mid in queue.startable():
+                        module = workflow.module_map[mid]
+                        fut = pool.submit(
+                            self._run_and_record,
+                            module,
+                            self._collect_inputs(workflow, mid),
+                            self._merge_params(module, parameters),
+                            queue.ready_since.get(mid),
+                        )
+                        running[fut] = mid
+
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in sorted(finished, key=lambda f: queue.position[running[f]]):
+                        mid = running.pop(fut)
+                        result = fut.result()
+                        module_results[mid] = result
+                        queue.finish(mid, result.status != "failed")
+                        if result.status == "failed" and self.fail_fast:
+                            self._cancel_running(mid)
+        finally:
+            # also on errors and Ctrl-C: module servers must not outlive the run
+            self.servers.close()
+
+        return self._end_run(workflow, queue, module_results)
+
+
+def _run_process(cmd: List[str], stdout, stderr,
+                 started=None) -> Tuple[int, Dict[str, Any]]:
+    """Run a command to completion; return its exit code and its resource usage.
+
+    ``started(proc)`` is called once the process exists.
+    """
+    proc = subprocess.Popen(cmd, stdout=stdout, stderr=stderr)
+    if started:
+        started(proc)
+    try:
+        _, status, ru = os.wait4(proc.pid, 0)
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, rusage_usage(ru)
+
+
+def _read_tail(path: Path, nbytes: int = LOG_TAIL_BYTES) -> str:
+    """Last ``nbytes`` of a log file, decoded leniently ("" if it does not exist)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            f.seek(max(size - nbytes, 0))
+            data = f.read()
+    except FileNotFoundError:
+        return ""
+    return data.decode(errors="replace")
@@ -0,0 +1,133 @@
+# nexa/backends/module_server.py
+"""
+Persistent module servers.
+
+A module whose definition declares ``"mode": "server"`` is started once as
+``<executable> <script> --serve`` and then receives one invocation per module
+run over a line-delimited JSON protocol, so expensive initialisation (force
+field tables, ML models, ...) is paid once per workflow instead of once per run.
+
+Request (one line on the server's stdin)::
+
+    {"id": 7, "module_id": "ff_builder__3", "inputs": {"species": "/path"},
+     "params": "/path/params.json" | null, "output_dir": "/path/outputs/ff_builder__3"}
+
+Reply (one line on the server's stdout)::
+
+    {"id": 7, "status": "ok"}
+    {"id": 7, "status": "error", "error": "traceback or message"}
+
+Either reply may carry a "log" string, which is written to the module run's
+stdout log, and a "usage" object (``user_cpu``/``sys_cpu`` seconds for the
+invocation, ``max_rss`` bytes for the server) for the run's metrics. The
+server's stdout is reserved for replies; anything it prints for humans must
+go to stderr, which is collected in ``logs/<module_id>.server.err``.
+`nexa.utils.module_server.serve` implements the server side for Python
+scripts.
+"""
+import json
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class ModuleServer:
+    """One running server process; invocations are serialised over its pipes."""
+
+    def __init__(self, module, script_path: Path, log_path: Path):
+        self.module_id = module.id
+        self._log = open(log_path, "ab")
+        self.proc = subprocess.Popen(
+            [module.executable, str(script_path), "--serve"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=self._log,
+            text=True, bufsize=1,
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        print(f"Started module server for {module.id} (pid {self.proc.pid})")
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def invoke(self, module_id: str, inputs: Dict[str, Path], params_file: Optional[Path],
+               output_dir: Path) -> Tuple[int, str, str, Dict[str, Any]]:
+        """Send one invocation and wait for its reply.
+
+        Returns ``(returncode, log, error, usage)``; returncode is 0 on success.
+        """
+        with self._lock:
+            self._next_id += 1
+            request = {
+                "id": self._next_id,
+                "module_id": module_id,
+                "inputs": {port: str(path) for port, path in inputs.items()},
+                "params": str(params_file) if params_file else None,
+                "output_dir": str(output_dir),
+            }
+            try:
+                self.proc.stdin.write(json.dumps(request) + "\n")
+                self.proc.stdin.flush()
+                line = self.proc.stdout.readline()
+            except (BrokenPipeError, OSError):
+                line = ""
+
+            if not line:
+                rc = self.proc.wait()
+                return rc or 1, "", f"Module server exited (rc={rc}) before replying", {}
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                return 1, "", f"Malformed reply from module server: {line.strip()!r}", {}
+            if reply.get("id") != request["id"]:
+                return 1, "", (f"Module server replied to request {reply.get('id')}, "
+                               f"expected {request['id']}"), {}
+
+            usage = {k: v for k, v in reply.get("usage", {}).items()
+                     if k in ("user_cpu", "sys_cpu", "max_rss")}
+            if reply.get("status") == "ok":
+                return 0, reply.get("log", ""), "", usage
+            error = reply.get("error", "module server reported an error")
+            return 1, reply.get("log", ""), error, usage
+
+    def close(self, timeout: float = 10) -> None:
+        """Close stdin (the server's cue to exit) and reap the process."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self._log.close()
+
+
+class ModuleServerPool:
+    """Servers keyed by (executable, script): sweep instances share one server."""
+
+    def __init__(self, logs_dir: Path):
+        self.logs_dir = logs_dir
+        self._servers: Dict[Tuple[str, Path], ModuleServer] = {}
+        self._lock = threading.Lock()
+
+    def get(self, module, script_path: Path) -> ModuleServer:
+        key = (module.executable, script_path)
+        with self._lock:
+            server = self._servers.get(key)
+            if server is None or not server.alive:
+                if server is not None:
+                    server.close()
+                server = ModuleServer(
+                    module, script_path, self.logs_dir / f"{module.id}.server.err"
+                )
+                self._servers[key] = server
+            return server
+
+    def close(self) -> None:
+        with self._lock:
+            for server in self._servers.values():
+                server.close()
+            self._servers.clear()
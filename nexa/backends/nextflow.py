@@ -12,16 +12,30 @@ Generates a correct Nextflow pipeline where:
   their input files via NEXA's standard interface.
 - publishDir copies outputs to workdir/outputs/<module_id>/ so the rest of
   ModelWave can find them in the usual place.
+- Nextflow writes a raw trace file (trace.txt) whose submit/start/complete
+  times, realtime and peak_rss become each module's ModuleMetrics. The trace
+  only has combined CPU usage, so user_cpu/sys_cpu stay unset.
 """
 import json
 import subprocess
 from pathlib import Path
 from textwrap import dedent
-from typing import Dict, Any, List, Tuple
-from .base import BaseBackend, ModuleResult, WorkflowResult
+from typing import Dict, Any, List, Optional, Tuple
+from .base import BaseBackend, ModuleMetrics, ModuleResult, WorkflowResult
 from ..core.workflow import Workflow
 
 
+_TRACE_CONFIG = """\
+trace {
+    enabled   = true
+    file      = 'trace.txt'
+    overwrite = true
+    raw       = true
+    fields    = 'name,status,submit,start,complete,realtime,peak_rss'
+}
+"""
+
+
 class NextflowBackend(BaseBackend):
     """Backend that generates a Nextflow DSL2 script and executes it."""
 
@@ -30,7 +44,12 @@ class NextflowBackend(BaseBackend):
         nf_path = self.workdir / "main.nf"
         nf_path.write_text(nf_script)
 
-        cmd = ["nextflow", "run", str(nf_path.name)]
+        trace_config = self.workdir / "nexa_trace.config"
+        trace_config.write_text(_TRACE_CONFIG)
+        cmd = ["nextflow", "run", str(nf_path.name), "-c", trace_config.name]
+        if self.resume:
+            # Nextflow keeps its own task cache in work/; reuse it
+            cmd.append("-resume")
         if parameters:
             param_file = self.workdir / "params.json"
             param_file.write_text(json.dumps(parameters, indent=2))
@@ -59,6 +78,7 @@ class NextflowBackend(BaseBackend):
 
         # Build WorkflowResult from publishDir outputs
         outputs_dir = self.workdir / "outputs"
+        metrics = _read_trace(self.workdir / "trace.txt")
         module_results: Dict[str, ModuleResult] = {}
         for mod in workflow.modules:
             out_dir = outputs_dir / mod.id
@@ -70,6 +90,7 @@ class NextflowBackend(BaseBackend):
                 outputs=outputs,
                 returncode=0 if all_present else proc.returncode,
                 stderr=proc.stderr if not all_present else "",
+                metrics=metrics.get(mod.id),
             )
 
         stderr = (proc.stderr or "").strip()
@@ -84,15 +105,11 @@ class NextflowBackend(BaseBackend):
     def _generate_nextflow(self, workflow: Workflow, parameters: Dict[str, Any] = None) -> str:
         # For each module, find which of its input ports come from connections
         # (keyed by input_port → (src_module, src_port))
+        index = workflow.index
         connected_inputs: Dict[str, Dict[str, Tuple[str, str]]] = {
-            m.id: {} for m in workflow.modules
+            m.id: {port: (src, output) for port, src, output in index.inputs(m.id)}
+            for m in workflow.modules
         }
-        for conn in workflow.connections:
-            dst_mod   = conn["to"]["module"]
-            dst_port  = conn["to"]["input"]
-            src_mod   = conn["from"]["module"]
-            src_port  = conn["from"]["output"]
-            connected_inputs[dst_mod][dst_port] = (src_mod, src_port)
 
         process_blocks: List[str] = []
         for mod in workflow.modules:
@@ -152,14 +169,13 @@ process {mod.id} {{
         workflow_lines: List[str] = []
         module_vars: Dict[str, str] = {}
 
-        for mod_id in workflow.get_execution_order():
-            mod = workflow.module_map[mod_id]
-            args: List[str] = []
-            for conn in workflow.connections:
-                if conn["to"]["module"] == mod_id:
-                    src_var  = module_vars[conn["from"]["module"]]
-                    src_port = conn["from"]["output"]
-                    args.append(f"{src_var}.{src_port}")
+        for mod_id in index.order_ids:
+            # Arguments bind positionally, so follow the process's sorted input ports
+            connected = connected_inputs[mod_id]
+            args = [
+                f"{module_vars[connected[port][0]]}.{connected[port][1]}"
+                for port in sorted(connected)
+            ]
             call = f"{mod_id}({', '.join(args)})" if args else f"{mod_id}()"
             result_var = f"{mod_id}_out"
             module_vars[mod_id] = result_var
@@ -173,3 +189,31 @@ nextflow.enable.dsl=2
 {workflow_block}
 
 """) + "\n".join(process_blocks)
+
+
+def _read_trace(path: Path) -> Dict[str, ModuleMetrics]:
+    """ModuleMetrics per process from a raw Nextflow trace (last attempt wins)."""
+    if not path.exists():
+        return {}
+    lines = path.read_text().splitlines()
+    if not lines:
+        return {}
+    header = lines[0].split("\t")
+    metrics: Dict[str, ModuleMetrics] = {}
+    for line in lines[1:]:
+        row = dict(zip(header, line.split("\t")))
+        name = row.get("name", "").split(" (")[0]
+        start, end = _trace_seconds(row.get("start")), _trace_seconds(row.get("complete"))
+        realtime = _trace_seconds(row.get("realtime"))
+        measured = ModuleMetrics.measured(start, end, _trace_seconds(row.get("submit")))
+        if realtime is not None:
+            measured.wall_time = realtime
+        rss = row.get("peak_rss", "")
+        measured.max_rss = int(rss) if rss.isdigit() else None
+        metrics[name] = measured
+    return metrics
+
+
+def _trace_seconds(value: Optional[str]) -> Optional[float]:
+    # raw traces report times and durations in milliseconds ("-" when unknown)
+    return int(value) / 1000 if value and value.isdigit() else None
@@ -8,24 +8,104 @@ modules, so SLURM itself manages the DAG — independent modules (same
 topological level) run in parallel, dependent modules start automatically once
 their dependencies complete.
 
+Submission is done in bulk: the job scripts, params files and module scripts
+of the whole run are written into a local bundle, shipped as one tar archive,
+and submitted by a generated ``submit_all.sh`` that chains the ``sbatch
+--parsable`` job ids into the dependencies on the cluster side, so a run
+costs one upload and one remote command to submit however large it is.
+
+Module scripts (with their declared ``data_files``) and params files are
+staged in a content-addressed store on the cluster (``remote.cas_dir``,
+default ``.nexa_cas`` next to the remote workdir; see cas.py), and job scripts
+reference those copies, so no shared filesystem is needed. Only objects the
+store lacks are added to the bundle.
+
+Modules on the same topological level that run the same script with the same
+SLURM resources (sweep instances, fan-out branches) are submitted as one job
+array whose tasks pick their module from a manifest by
+``SLURM_ARRAY_TASK_ID``; each task is still polled and reported as its own
+module (job id ``<array id>_<task>``). Dependencies name the upstream task,
+not the whole array (``afterok:<array id>_<task>``, or ``aftercorr`` when
+each task of an array waits for the matching task of another), so a failed
+task only holds back the modules downstream of it.
+
+In pilot mode (``"pilot": true`` in the ``execution`` config block) the
+short modules whose inputs already exist are instead run together in one
+allocation sized from their aggregate resources, by ``python -m nexa.agent``
+(see nexa/agent.py); RemoteBackend tails the agent's status log while polling
+so each of them is still reported as its own module. Jobs downstream of a
+pilot module wait for the pilot with ``afterany`` and check that module's
+completion marker, so a failure in one branch of the pilot does not hold
+back the others.
+
 Per-module resource overrides: each module can declare `resources` in its
 module.json to request a different partition/memory/time than the global config.
+
+Submissions and completions are appended to the run journal. With
+``resume=True`` the remote workdir of the interrupted run is reused, modules
+whose synced outputs are intact are skipped, and SLURM jobs that are still
+queued, running or already completed are reattached instead of resubmitted.
+
+With a RunHistory attached and ``"predict_resources": true`` in the
+``execution`` config block, modules that do not declare ``time`` or ``mem``
+request what their past successful runs needed instead of the global
+defaults: the longest recorded wall time and the largest peak RSS, times
+``prediction_headroom`` (1.5 by default), with floors of one minute and 128M.
+
+All ssh, scp and rsync calls of a run share one multiplexed SSH connection
+(see ssh.py), opened when ``execute`` starts and closed when it returns.
+
+Job states are polled in bulk: each round is one ``squeue`` call covering
+every pending job, plus one ``sacct`` call for the jobs that left the queue,
+whose accounting records (submit/start/end times, user and system CPU, MaxRSS
+across job steps) are attached to the ModuleResults as ModuleMetrics. A job's
+first RUNNING state is reported as a ``module_running`` event. Rounds in
+which nothing changed stretch the wait before the next one (up to
+``max_poll_interval``), so long queues cost the scheduler few queries.
+
+Outputs of completed jobs are pulled back on a small pool of background
+transfers (``sync_workers``) while polling continues; ``module_complete``
+fires once a module's local copy has arrived with every output port.
 """
 import json
-import subprocess
+import math
+import os
+import posixpath
+import shlex
+import shutil
+import tarfile
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
-from .base import BaseBackend, ModuleResult, WorkflowResult
+from typing import Callable, Dict, List, Optional, Tuple
+from .base import BaseBackend, ModuleMetrics, ModuleResult, WorkflowResult
+from .cas import RemoteStore
+from .ssh import SSHSession
+from ..core.history import Estimate, RunHistory
 from ..core.workflow import Workflow
+from ..utils.hashing import port_files
+from ..utils.resources import parse_mem
+
+_SACCT_FIELDS = "JobID,State,Submit,Start,End,UserCPU,SystemCPU,MaxRSS"
+
+# Job states in which a job may still run (sacct can report these after squeue forgot it)
+_ACTIVE_STATES = ("PENDING", "CONFIGURING", "RUNNING", "COMPLETING", "SUSPENDED",
+                  "REQUEUED", "RESIZING", "REQUEUE_HOLD", "REQUEUE_FED")
+# Polls a job may be missing from both squeue and sacct before it counts as lost
+_ACCOUNTING_RETRIES = 3
+# Growth of the poll interval after a round without changes
+_POLL_BACKOFF = 1.5
+# Job ids per squeue/sacct call
+_QUERY_CHUNK = 1000
 
 
 class RemoteBackend(BaseBackend):
     """Remote execution via SSH + SLURM, DAG-aware parallel submission."""
 
     def __init__(self, workdir: Path = None, remotehost: str = None,
-                 config_file: str = None, on_event=None):
-        super().__init__(workdir, on_event)
+                 config_file: str = None, on_event=None, resume: bool = False,
+                 history: Optional[RunHistory] = None):
+        super().__init__(workdir, on_event, resume)
 
         self.remotehost = remotehost
         self.config = self._load_config(config_file)
@@ -42,16 +122,37 @@ class RemoteBackend(BaseBackend):
         self.remote_workdir      = remote_cfg.get(
             "remote_workdir", f"/tmp/nexa_run_{int(time.time())}"
         )
+        if resume:
+            run = self.journal.load()["run"]
+            if run and run.get("remote_workdir"):
+                self.remote_workdir = run["remote_workdir"]
         self.remote_username     = remote_cfg.get("username", "")
         self.remote_private_key  = remote_cfg.get("private_key", None)
+        self.session = SSHSession(remotehost, self.remote_username, self.remote_private_key)
+        # shared by every run under the same parent directory
+        parent = posixpath.dirname(self.remote_workdir.rstrip("/"))
+        self.store = RemoteStore(remote_cfg.get("cas_dir", posixpath.join(parent, ".nexa_cas")))
 
         exec_cfg = self.config.get("execution", {})
         self._poll_interval = exec_cfg.get("poll_interval", 5)
+        self._max_poll_interval = exec_cfg.get("max_poll_interval", max(60, self._poll_interval))
         self._max_wait      = exec_cfg.get("max_wait_time", 3600)
+        self._sync_workers  = exec_cfg.get("sync_workers", 4)
+        self._job_arrays    = exec_cfg.get("job_arrays", True)
+        self._min_array     = exec_cfg.get("min_array_size", 4)
+        self._pilot         = exec_cfg.get("pilot", False)
+        self._pilot_max_time = exec_cfg.get("pilot_max_time", "00:10:00")
+        self._pilot_python  = exec_cfg.get("pilot_python", "python3")
+        self._predict       = exec_cfg.get("predict_resources", False)
+        self._headroom      = exec_cfg.get("prediction_headroom", 1.5)
+
+        self.history = history
+        self._estimates: Dict[str, Estimate] = {}
 
         print(f"[REMOTE] Backend initialized")
         print(f"  Remote host    : {self.remotehost}")
         print(f"  Remote workdir : {self.remote_workdir}")
+        print(f"  Remote store   : {self.store.root}")
         print(f"  Default partition: {self._default_partition}")
 
     # ── config ───────────────────────────────────────────────────────────────
@@ -68,66 +169,84 @@ class RemoteBackend(BaseBackend):
     def _ssh(self, cmd: str) -> tuple:
         if not self.remotehost:
             raise ValueError("remotehost not specified for remote backend")
-        result = subprocess.run(
-            f"ssh {self.remotehost} '{cmd}'", shell=True,
-            capture_output=True, text=True,
-        )
-        return result.returncode, result.stdout, result.stderr
+        return self.session.run(cmd)
 
     def _scp_to_remote(self, local: Path, remote_path: str) -> None:
-        result = subprocess.run(
-            f"scp {local} {self.remotehost}:{remote_path}",
-            shell=True, capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"scp failed: {result.stderr}")
+        self.session.put(local, remote_path)
 
     def _rsync_from_remote(self, remote_dir: str, local_dir: Path) -> None:
         local_dir.mkdir(parents=True, exist_ok=True)
-        subprocess.run(
-            f"rsync -avz {self.remotehost}:{remote_dir}/ {local_dir}/",
-            shell=True, capture_output=True, text=True,
-        )
+        result = self.session.get_dir(remote_dir, local_dir)
+        if result.returncode != 0:
+            raise RuntimeError(f"rsync failed: {result.stderr.strip()}")
 
     # ── per-module resource resolution ───────────────────────────────────────
 
     def _res(self, module, key: str, default):
         return module.resources.get(key, default)
 
-    # ── SLURM script + submission ─────────────────────────────────────────────
+    def _mem(self, module) -> str:
+        mem = self._res(module, "mem", self._res(module, "memory", None))
+        if mem is None:
+            est = self._estimates.get(module.id)
+            if est and est.max_rss:
+                return f"{max(math.ceil(est.max_rss * self._headroom / 1024 ** 2), 128)}M"
+            return self._default_mem
+        return mem
 
-    def _slurm_script(self, module, script_path: str, inputs: dict,
-                      params_remote: Optional[str],
-                      dependency_ids: List[str]) -> str:
-        partition  = self._res(module, "partition", self._default_partition)
-        nodes      = self._res(module, "nodes",     self._default_nodes)
-        ntasks     = self._res(module, "cpus", self._res(module, "ntasks", self._default_ntasks))
-        time_limit = self._res(module, "time",      self._default_time)
-        mem        = self._res(module, "mem", self._res(module, "memory", self._default_mem))
-
-        dep_line = (
-            f"#SBATCH --dependency=afterok:{':'.join(dependency_ids)}\n"
-            if dependency_ids else ""
+    def _known_time(self, module) -> Optional[str]:
+        """Declared or predicted time limit of a module; None if neither is known."""
+        time_limit = self._res(module, "time", None)
+        if time_limit is None:
+            est = self._estimates.get(module.id)
+            if est and est.max_wall_time:
+                return _slurm_walltime(max(est.max_wall_time * self._headroom, 60))
+        return time_limit
+
+    def _time(self, module) -> str:
+        return self._known_time(module) or self._default_time
+
+    # ── SLURM script + staging ────────────────────────────────────────────────
+
+    def _resources(self, module) -> Tuple[str, int, int, str, str]:
+        """(partition, nodes, ntasks, time, mem) a module's job asks for."""
+        return (
+            self._res(module, "partition", self._default_partition),
+            self._res(module, "nodes",     self._default_nodes),
+            self._res(module, "cpus", self._res(module, "ntasks", self._default_ntasks)),
+            self._time(module),
+            self._mem(module),
         )
-        module_loads = "\n".join(f"module load {m}" for m in self._slurm_modules)
-        output_dir   = f"{self.remote_workdir}/outputs/{module.id}"
-        input_args   = "".join(f"--input {port} {path} " for port, path in inputs.items())
-        params_arg   = f"--params {params_remote}" if params_remote else ""
 
+    def _sbatch_header(self, resources: tuple, job_name: str, log_name: str,
+                       extra: str = "") -> str:
+        partition, nodes, ntasks, time_limit, mem = resources
+        module_loads = "\n".join(f"module load {m}" for m in self._slurm_modules)
         return (
             f"#!/bin/bash\n"
-            f"#SBATCH --job-name={module.id}\n"
+            f"#SBATCH --job-name={job_name}\n"
             f"#SBATCH --partition={partition}\n"
             f"#SBATCH --nodes={nodes}\n"
             f"#SBATCH --ntasks={ntasks}\n"
             f"#SBATCH --time={time_limit}\n"
             f"#SBATCH --mem={mem}\n"
-            f"#SBATCH --output={self.remote_workdir}/{module.id}_%j.out\n"
-            f"#SBATCH --error={self.remote_workdir}/{module.id}_%j.err\n"
-            f"{dep_line}"
+            f"{extra}"
+            f"#SBATCH --output={self.remote_workdir}/{log_name}.out\n"
+            f"#SBATCH --error={self.remote_workdir}/{log_name}.err\n"
             f"\n"
             f"{module_loads}\n"
+        )
+
+    def _slurm_script(self, module, script_path: str, inputs: dict,
+                      params_remote: Optional[str], guard: str = "") -> str:
+        output_dir   = f"{self.remote_workdir}/outputs/{module.id}"
+        input_args   = "".join(f"--input {port} {path} " for port, path in inputs.items())
+        params_arg   = f"--params {params_remote}" if params_remote else ""
+
+        return (
+            self._sbatch_header(self._resources(module), module.id, f"{module.id}_%j") +
             f"\n"
+            f"{guard}"
             f"mkdir -p {output_dir}\n"
             f"\n"
             f"python3 {script_path} \\\n"
@@ -136,168 +255,874 @@ class RemoteBackend(BaseBackend):
             f"    --output_dir {output_dir}\n"
         )
 
-    def _submit_module(self, module, script_path: str, inputs: dict,
-                       params: dict, dependency_ids: List[str]) -> str:
-        """Materialise and submit one SLURM job. Returns SLURM job id."""
-        params_remote = None
-        if params:
-            local_pf = self.workdir / f"{module.id}_params.json"
-            local_pf.write_text(json.dumps(params))
-            remote_pf = f"{self.remote_workdir}/{module.id}_params.json"
-            self._scp_to_remote(local_pf, remote_pf)
-            params_remote = remote_pf
-
-        script_content = self._slurm_script(
-            module, script_path, inputs, params_remote, dependency_ids
+    def _array_script(self, module, name: str, script_path: str, n_tasks: int,
+                      guard: str = "") -> str:
+        """Job array running one task per line of ``<name>.tasks``.
+
+        Each line is ``<mod_id>\\t<arguments>``; task N runs line N+1.
+        """
+        tasks = f"{self.remote_workdir}/{name}.tasks"
+        outputs = f"{self.remote_workdir}/outputs"
+        return (
+            self._sbatch_header(self._resources(module), name, f"{name}_%A_%a",
+                                f"#SBATCH --array=0-{n_tasks - 1}\n") +
+            f"\n"
+            f"{guard}"
+            f"TASK=$(sed -n \"$((SLURM_ARRAY_TASK_ID + 1))p\" {tasks})\n"
+            f"MODULE=${{TASK%%$'\\t'*}}\n"
+            f"mkdir -p {outputs}/$MODULE\n"
+            f"\n"
+            f"eval \"python3 {script_path} ${{TASK#*$'\\t'}} --output_dir {outputs}/$MODULE\"\n"
+        )
+
+    def _stage_params(self, params: dict) -> Optional[str]:
+        """Remote path of a params file with these contents, from the store."""
+        if not params:
+            return None
+        data = json.dumps(params, sort_keys=True).encode()
+        return f"{self.store.add({'params.json': data})}/params.json"
+
+    def _stage_script(self, module, script_path: Path) -> str:
+        """Remote path of a module's script, staged with its data files in the store.
+
+        Data files keep their place relative to the script's directory.
+        """
+        files = {script_path.name: script_path}
+        for name in module.data_files:
+            path = (module.base_path / name).resolve()
+            rel = Path(os.path.relpath(path, script_path.parent))
+            if rel.parts[0] == "..":
+                raise ValueError(f"Module '{module.id}': data file {name} is not below "
+                                 f"the script's directory {script_path.parent}")
+            if not path.is_file():
+                raise FileNotFoundError(f"Module '{module.id}': data file not found: {path}")
+            files[rel.as_posix()] = path
+        return f"{self.store.add(files)}/{script_path.name}"
+
+    def _stage_module(self, bundle: Path, module, script_path: Path, inputs: dict,
+                      params: dict, deps: List[str] = ()) -> str:
+        """Write one module's job script into the bundle.
+
+        Returns the job script's name. Its script and params are staged in
+        the store. Dependencies are not part of the job script; submit_all.sh
+        adds them when it submits. Only pilot modules among ``deps`` are
+        checked by the script itself (see ``_pilot_guard``).
+        """
+        job_script = f"submit_{module.id}.sh"
+        (bundle / job_script).write_text(self._slurm_script(
+            module, self._stage_script(module, script_path), inputs, self._stage_params(params),
+            self._pilot_guard(deps),
+        ))
+        return job_script
+
+    def _stage_array(self, bundle: Path, name: str, modules: list, script_path: Path,
+                     inputs: Dict[str, dict], params: Dict[str, dict],
+                     deps: List[str] = ()) -> str:
+        """Write a job array for ``modules`` (one task each, in order) into the bundle."""
+        lines = []
+        for module in modules:
+            args = [arg for port, path in inputs[module.id].items()
+                    for arg in ("--input", port, path)]
+            params_remote = self._stage_params(params[module.id])
+            if params_remote:
+                args += ["--params", params_remote]
+            lines.append(f"{module.id}\t{' '.join(shlex.quote(a) for a in args)}\n")
+        (bundle / f"{name}.tasks").write_text("".join(lines))
+
+        job_script = f"submit_{name}.sh"
+        (bundle / job_script).write_text(self._array_script(
+            modules[0], name, self._stage_script(modules[0], script_path), len(modules),
+            self._pilot_guard(deps),
+        ))
+        return job_script
+
+    def _array_groups(self, workflow: Workflow, mod_ids: List[str],
+                      scripts: Dict[str, Path]) -> List[List[str]]:
+        """Partition modules to submit into candidate job arrays.
+
+        Modules at the same topological level that run the same script with
+        the same executable and SLURM resources (sweep instances, fan-out
+        branches) are candidates for one array; ``_split_group`` decides
+        which of them share one given their dependencies. Modules on one
+        level never depend on each other, so dependencies between the
+        groups stay acyclic. Groups are returned level by level, in
+        topological order.
+        """
+        if not self._job_arrays:
+            return [[mod_id] for mod_id in mod_ids]
+        index = workflow.index
+        groups: Dict[tuple, List[str]] = {}
+        for mod_id in mod_ids:
+            module = workflow.module_map[mod_id]
+            key = (index.level[index.id_of[mod_id]], module.executable, scripts[mod_id],
+                   tuple(module.data_files),
+                   *self._resources(module))
+            groups.setdefault(key, []).append(mod_id)
+        return [groups[key] for key in sorted(groups, key=lambda k: k[0])]
+
+    def _dependencies(self, mod_id: str, index, job_of: Dict[str, str],
+                      task_of: Dict[str, int], live: Dict[str, str],
+                      pilots: Dict[str, str]) -> frozenset:
+        """Dependency tokens of one module's job, as submit_all.sh reads them.
+
+        ``<job>`` waits for a single job, ``<array>@<task>`` for one task of
+        a job array, never the whole array, so a failed task only holds back
+        the modules downstream of it. ``+<pilot>/<module>`` waits for the
+        pilot job to end in any state, the job script checking that module's
+        completion marker. Reattached modules are named by their module id.
+        Upstream modules that already completed are left out (SLURM may have
+        purged their jobs).
+        """
+        tokens = set()
+        for d in index.upstream_ids(mod_id):
+            if d in pilots and (d in job_of or d in live):
+                tokens.add(f"+{pilots[d]}/{d}")
+            elif d in task_of:
+                tokens.add(f"{job_of[d]}@{task_of[d]}")
+            elif d in job_of:
+                tokens.add(job_of[d])
+            elif d in live:
+                tokens.add(d)
+        return frozenset(tokens)
+
+    def _split_group(self, group: List[str],
+                     deps: Dict[str, frozenset]) -> List[Tuple[List[str], List[str]]]:
+        """Split a candidate array into jobs: (modules in task order, dependency tokens).
+
+        All tasks of an array share its ``--dependency``, so an array only
+        takes modules whose dependencies are identical, or whose tasks each
+        wait for the matching task of the same upstream arrays (``aftercorr``,
+        e.g. the second stage of a fan-out). Others are grouped by identical
+        dependencies; sets smaller than ``min_array_size`` gain little and
+        are submitted as single jobs.
+        """
+        def singles(mod_ids: List[str]) -> List[Tuple[List[str], List[str]]]:
+            return [([mod_id], sorted(deps[mod_id])) for mod_id in mod_ids]
+
+        if len(group) < self._min_array:
+            return singles(group)
+        correlated = _correlated(group, deps)
+        if correlated:
+            return [correlated]
+        same: Dict[frozenset, List[str]] = {}
+        for mod_id in group:
+            same.setdefault(deps[mod_id], []).append(mod_id)
+        jobs: List[Tuple[List[str], List[str]]] = []
+        for tokens, mod_ids in same.items():
+            jobs.extend([(mod_ids, sorted(tokens))] if len(mod_ids) >= self._min_array
+                        else singles(mod_ids))
+        return jobs
+
+    # ── pilot jobs ────────────────────────────────────────────────────────────
+
+    def _pilot_modules(self, workflow: Workflow, mod_ids: List[str],
+                       settled: set) -> List[str]:
+        """Modules to run inside one pilot allocation, in topological order.
+
+        A module qualifies unless it opts out (``"pilot": false`` in its
+        resources), needs another partition or more than one node, or has a
+        declared or predicted time limit above ``pilot_max_time``; modules
+        with no known limit count as short. Only modules whose upstream
+        modules are ``settled`` (complete before this submission) or in the
+        pilot themselves are taken, so the pilot never waits on another job.
+        Fewer than two modules gain nothing from a pilot.
+        """
+        limit = _walltime_seconds(self._pilot_max_time)
+        pilot: List[str] = []
+        for mod_id in mod_ids:
+            module = workflow.module_map[mod_id]
+            partition, nodes, _, _, _ = self._resources(module)
+            known = self._known_time(module)
+            if (module.resources.get("pilot", True) is False
+                    or partition != self._default_partition or int(nodes) != 1
+                    or (known and _walltime_seconds(known) > limit)):
+                continue
+            if all(u in settled or u in pilot for u in workflow.index.upstream_ids(mod_id)):
+                pilot.append(mod_id)
+        return pilot if len(pilot) >= 2 else []
+
+    def _pilot_resources(self, workflow: Workflow, mod_ids: List[str]) -> Tuple[tuple, int]:
+        """Allocation of a pilot: ((partition, nodes, ntasks, time, mem), cpus).
+
+        Cores and memory cover the widest topological level of the subgraph,
+        whose modules may all run at once; the time limit covers its longest
+        chain, each module counted at its time limit (``pilot_max_time`` if
+        it has none).
+        """
+        index = workflow.index
+        limit = _walltime_seconds(self._pilot_max_time)
+        cpus: Dict[int, int] = {}
+        mem: Dict[int, int] = {}
+        chain: Dict[str, float] = {}   # mod_id -> longest chain ending with it, seconds
+        for mod_id in mod_ids:
+            module = workflow.module_map[mod_id]
+            _, _, ntasks, _, module_mem = self._resources(module)
+            level = index.level[index.id_of[mod_id]]
+            cpus[level] = cpus.get(level, 0) + int(ntasks)
+            mem[level] = mem.get(level, 0) + parse_mem(module_mem)
+            known = self._known_time(module)
+            chain[mod_id] = (_walltime_seconds(known) if known else limit) + max(
+                (chain[u] for u in index.upstream_ids(mod_id) if u in chain), default=0.0
+            )
+        time_limit = _slurm_walltime(max(max(chain.values()), 60))
+        mem_limit = f"{max(math.ceil(max(mem.values()) / 1024 ** 2), 128)}M"
+        return (self._default_partition, 1, 1, time_limit, mem_limit), max(cpus.values())
+
+    def _stage_pilot(self, bundle: Path, name: str, workflow: Workflow, mod_ids: List[str],
+                     scripts: Dict[str, Path], inputs: Dict[str, dict],
+                     params: Dict[str, dict]) -> str:
+        """Write a pilot's manifest (see nexa.agent) and job script into the bundle."""
+        members = set(mod_ids)
+        manifest = {
+            "workflow_id": workflow.workflow_id,
+            "modules": [
+                {**workflow.module_map[mod_id].to_dict(),
+                 "script": self._stage_script(workflow.module_map[mod_id], scripts[mod_id]),
+                 "parameters": params[mod_id]}
+                for mod_id in mod_ids
+            ],
+            "connections": [
+                conn for conn in workflow.connections
+                if conn["from"]["module"] in members and conn["to"]["module"] in members
+            ],
+            "inputs": {mod_id: inputs[mod_id] for mod_id in mod_ids},
+        }
+        (bundle / f"{name}.json").write_text(json.dumps(manifest))
+
+        resources, cpus = self._pilot_resources(workflow, mod_ids)
+        job_script = f"submit_{name}.sh"
+        (bundle / job_script).write_text(
+            self._sbatch_header(resources, name, f"{name}_%j",
+                                f"#SBATCH --cpus-per-task={cpus}\n") +
+            f"\n"
+            f"cd {self.remote_workdir}\n"
+            f"{self._pilot_python} -m nexa.agent {name}.json --cpus {cpus} --mem {resources[4]}\n"
+        )
+        return job_script
+
+    def _pilot_status(self, name: str, offset: int) -> Tuple[List[dict], int]:
+        """Records a pilot's agent appended to its status log past byte ``offset``.
+
+        Returns them with the new offset; a trailing partial line is left for
+        the next call.
+        """
+        _, out, _ = self._ssh(
+            f"tail -c +{offset + 1} {self.remote_workdir}/{name}.status.jsonl 2>/dev/null"
         )
-        local_sh = self.workdir / f"submit_{module.id}.sh"
-        local_sh.write_text(script_content)
-        self._scp_to_remote(local_sh, f"{self.remote_workdir}/")
+        complete = out[:out.rfind("\n") + 1]
+        records = []
+        for line in complete.splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records, offset + len(complete.encode())
+
+    def _pilot_guard(self, deps: List[str]) -> str:
+        """Shell lines failing a job unless the pilot modules it depends on succeeded.
+
+        A pilot job ends FAILED if any of its modules failed, so jobs wait for
+        it with ``afterany`` and check the marker the agent leaves for each
+        module that completed (``<pilot>.done/<module>``) instead.
+        """
+        markers = [f"{self.remote_workdir}/{token[1:].replace('/', '.done/', 1)}"
+                   for token in deps if token.startswith("+")]
+        if not markers:
+            return ""
+        return (
+            f"for done in {' '.join(markers)}; do\n"
+            f"    if [ ! -e \"$done\" ]; then\n"
+            f"        echo \"upstream module ${{done##*/}} did not complete\" >&2\n"
+            f"        exit 1\n"
+            f"    fi\n"
+            f"done\n"
+            f"\n"
+        )
+
+    def _pilot_available(self) -> bool:
+        """Whether ``pilot_python`` can import the agent on the cluster.
+
+        Checked on the login node, once per run that would use a pilot.
+        """
+        rc, _, err = self._ssh(f"{self._pilot_python} -c 'import nexa.agent'")
+        if rc != 0:
+            reason = (err.strip().splitlines() or ["import failed"])[-1]
+            print(f"[REMOTE] Warning: {self._pilot_python} on {self.remotehost} cannot "
+                  f"import nexa.agent ({reason}); submitting without a pilot")
+        return rc == 0
 
-        rc, stdout, stderr = self._ssh(
-            f"cd {self.remote_workdir} && sbatch submit_{module.id}.sh"
+    def _submit_bundle(self, bundle: Path, jobs: List[Tuple[str, str, List[str]]],
+                       live: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Ship the bundle in one transfer and submit all its jobs in one call.
+
+        ``jobs`` lists (job name, job script, upstream job names) in
+        topological order, where a job name is a module id or the name of a
+        job array; ``live`` maps upstream modules that are already queued or
+        running (reattached) to their job ids. Returns ({job name: job_id},
+        {job name: error}).
+        """
+        (bundle / "jobs.txt").write_text("".join(
+            f"{mod_id} {job_script} {','.join(deps)}\n" for mod_id, job_script, deps in jobs
+        ))
+        # only objects the store lacks travel with the bundle
+        missing = self.store.missing(self._ssh)
+        size = self.store.write(bundle / "cas", missing)
+        print(f"[REMOTE] Uploading {len(missing)}/{len(self.store.objects)} staged objects "
+              f"({size / 1024:.0f} KiB) to {self.store.root}")
+        (bundle / "submit_all.sh").write_text(
+            _submit_all_script(live, self.store.install_script("cas"))
         )
+        archive = self.workdir / "bundle.tar.gz"
+        with tarfile.open(archive, "w:gz") as tar:
+            for path in sorted(bundle.iterdir()):
+                tar.add(path, arcname=path.name)
+
+        try:
+            self._scp_to_remote(archive, f"{self.remote_workdir}/bundle.tar.gz")
+            rc, stdout, stderr = self._ssh(
+                f"cd {self.remote_workdir} && tar xzf bundle.tar.gz && rm -f bundle.tar.gz "
+                f"&& bash submit_all.sh"
+            )
+        except RuntimeError as exc:
+            rc, stdout, stderr = 1, "", str(exc)
         if rc != 0:
-            raise RuntimeError(f"sbatch failed for {module.id}: {stderr}")
+            error = f"Bundle submission failed: {stderr.strip()}"
+            return {}, {mod_id: error for mod_id, _, _ in jobs}
 
-        job_id = stdout.strip().split()[-1]
-        dep_str = f" after {dependency_ids}" if dependency_ids else " (no deps)"
-        print(f"[REMOTE] {module.id}: submitted job {job_id}{dep_str} "
-              f"(partition={self._res(module, 'partition', self._default_partition)}, "
-              f"mem={self._res(module, 'mem', self._default_mem)})")
-        return job_id
+        submitted: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        for line in stdout.splitlines():
+            mod_id, _, job_id = line.partition(" ")
+            if job_id.startswith("ERROR "):
+                errors[mod_id] = f"sbatch failed for {mod_id}: {job_id[len('ERROR '):].strip()}"
+            elif job_id:
+                submitted[mod_id] = job_id.strip()
+        for mod_id, _, _ in jobs:
+            if mod_id not in submitted and mod_id not in errors:
+                errors[mod_id] = "Not submitted by submit_all.sh"
+        return submitted, errors
 
     # ── polling ───────────────────────────────────────────────────────────────
 
-    def _poll_all(self, pending: Dict[str, str]) -> Dict[str, bool]:
-        """Poll all jobs until done. Returns {mod_id: succeeded}."""
-        results: Dict[str, bool] = {}
+    def _queue_states(self, job_ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        """(state, reason) of every listed job still in the queue, from one squeue call."""
+        states: Dict[str, Tuple[str, str]] = {}
+        for chunk in _chunks(job_ids):
+            _, out, _ = self._ssh(f"squeue -h -r -j {','.join(chunk)} -o '%i %T %r'")
+            for line in out.splitlines():
+                fields = line.split(None, 2)
+                if len(fields) >= 2:
+                    states[fields[0]] = (fields[1], fields[2].strip() if len(fields) > 2 else "")
+        return states
+
+    def _accounting(self, job_ids: List[str]) -> Dict[str, Tuple[str, ModuleMetrics]]:
+        """State and metrics of the listed jobs from one sacct call.
+
+        Jobs the accounting database does not know (yet) are missing.
+        """
+        jobs: Dict[str, Tuple[str, ModuleMetrics]] = {}
+        for chunk in _chunks(job_ids):
+            _, out, _ = self._ssh(
+                f"sacct -j {','.join(chunk)} -P --noheader --format={_SACCT_FIELDS}"
+            )
+            jobs.update(_parse_sacct(out))
+        return jobs
+
+    def _job_states(self, job_ids: List[str]) -> Dict[str, str]:
+        """Current state of each job, queued or finished (UNKNOWN if SLURM forgot it)."""
+        states = {job_id: state for job_id, (state, _) in self._queue_states(job_ids).items()}
+        gone = [job_id for job_id in job_ids if job_id not in states]
+        if gone:
+            states.update((job_id, state) for job_id, (state, _) in self._accounting(gone).items())
+        return {job_id: states.get(job_id, "UNKNOWN") for job_id in job_ids}
+
+    def _poll_all(self, pending: Dict[str, str], index=None,
+                  on_finished: Callable[[str, str, Optional[ModuleMetrics], str], None] = None,
+                  pilots: Optional[Dict[str, str]] = None,
+                  ) -> Dict[str, Tuple[str, Optional[ModuleMetrics], str]]:
+        """Poll all jobs until done. Returns {mod_id: (status, metrics, error)}.
+
+        ``status`` is "success", "failed" or "skipped";
+        ``on_finished(mod_id, status, metrics, error)`` is called as soon as
+        each job is seen to finish (or times out).
+
+        Each round is one squeue call for every pending job, plus one sacct
+        call for the jobs that left the queue. The wait between rounds starts
+        at ``poll_interval`` and grows by half after every round in which
+        nothing changed, up to ``max_poll_interval``.
+
+        A pending job downstream of a failed one can never start under
+        ``afterok``. As soon as a failure is seen, its pending descendants in
+        ``index`` are cancelled with one scancel and reported as skipped; so
+        are jobs SLURM already holds as DependencyNeverSatisfied.
+
+        ``pilots`` maps modules run by a pilot job to the pilot's name. Their
+        progress comes from the pilot's status log, read once per round while
+        any of them is pending; the agent itself skips pilot modules
+        downstream of a failure, so only ordinary jobs are ever cancelled.
+        """
+        results: Dict[str, Tuple[str, Optional[ModuleMetrics], str]] = {}
+        pending = dict(pending)
+        pilots = pilots or {}
+        offsets: Dict[str, int] = {}  # pilot name -> bytes of its status log read
+        seen: Dict[str, str] = {}     # mod_id -> last queue state
+        misses: Dict[str, int] = {}   # mod_id -> rounds missing from both squeue and sacct
+        interval = self._poll_interval
         start = time.time()
 
+        def finish(mod_id: str, status: str, metrics: Optional[ModuleMetrics], error: str) -> None:
+            results[mod_id] = (status, metrics, error)
+            del pending[mod_id]
+            if on_finished:
+                on_finished(mod_id, status, metrics, error)
+
+        def doom_downstream(mod_id: str) -> None:
+            doomed.update((d, f"Cancelled: upstream module {mod_id} failed")
+                          for d in (index.descendant_ids(mod_id) if index else [])
+                          if d in pending and d not in pilots and d not in doomed)
+
         while pending and time.time() - start < self._max_wait:
-            for mod_id in list(pending):
-                job_id = pending[mod_id]
-                rc, stdout, _ = self._ssh(f"squeue -j {job_id} -h")
-                if rc == 0 and not stdout.strip():
-                    # Job left the queue — check final state
-                    _, state_out, _ = self._ssh(
-                        f"sacct -j {job_id} --format=State --noheader"
-                    )
-                    state = state_out.strip()
-                    succeeded = "COMPLETED" in state
-                    status_str = "COMPLETED" if succeeded else f"FAILED ({state})"
-                    print(f"[REMOTE] {mod_id}: job {job_id} {status_str}")
-                    results[mod_id] = succeeded
-                    del pending[mod_id]
+            changed = False
+            doomed: Dict[str, str] = {}   # mod_id -> why it and its descendants cannot run
+            queued = self._queue_states(list(dict.fromkeys(pending.values())))
+            for mod_id, job_id in pending.items():
+                if mod_id in pilots:
+                    continue   # its job is the pilot's, not the module's
+                state, reason = queued.get(job_id, (None, ""))
+                if reason == "DependencyNeverSatisfied":
+                    doomed[mod_id] = f"Cancelled: dependency of job {job_id} can never be satisfied"
+                elif state and state != seen.get(mod_id):
+                    changed = True
+                    seen[mod_id] = state
+                    if state == "RUNNING":
+                        print(f"[REMOTE] {mod_id}: job {job_id} RUNNING")
+                        self._emit("module_running", mod_id, {"job_id": job_id})
+
+            # read after squeue: a pilot that has left the queue has written its last line
+            for name in sorted({pilots[mod_id] for mod_id in pending if mod_id in pilots}):
+                records, offsets[name] = self._pilot_status(name, offsets.get(name, 0))
+                for rec in records:
+                    mod_id = rec.get("module")
+                    if mod_id not in pending or pilots.get(mod_id) != name:
+                        continue
+                    changed = True
+                    job_id = pending[mod_id]
+                    metrics = ModuleMetrics(**rec["metrics"]) if rec.get("metrics") else None
+                    if rec["event"] == "module_start":
+                        seen[mod_id] = "RUNNING"
+                        print(f"[REMOTE] {mod_id}: RUNNING in pilot job {job_id}")
+                        self._emit("module_running", mod_id, {"job_id": job_id})
+                    elif rec["event"] == "module_complete":
+                        print(f"[REMOTE] {mod_id}: COMPLETED in pilot job {job_id}")
+                        finish(mod_id, "success", metrics, "")
+                    elif rec.get("skipped"):
+                        finish(mod_id, "skipped", metrics, rec.get("error") or "Cancelled")
+                    else:
+                        print(f"[REMOTE] {mod_id}: FAILED in pilot job {job_id}")
+                        finish(mod_id, "failed", metrics,
+                               rec.get("error") or f"Module failed in pilot job {job_id}")
+                        doom_downstream(mod_id)
+
+            left = {mod_id: job_id for mod_id, job_id in pending.items() if job_id not in queued}
+            accounting = self._accounting(list(left.values())) if left else {}
+            for mod_id, job_id in left.items():
+                if job_id not in accounting:
+                    # sacct can lag behind squeue; give up after a few rounds
+                    misses[mod_id] = misses.get(mod_id, 0) + 1
+                    if misses[mod_id] < _ACCOUNTING_RETRIES:
+                        continue
+                    state, metrics = "UNKNOWN", None
+                else:
+                    state, metrics = accounting[job_id]
+                    if state in _ACTIVE_STATES:
+                        continue   # missed by squeue, but not finished
+                changed = True
+                if mod_id in pilots:
+                    # the agent reports every module before it exits, unless it was killed
+                    print(f"[REMOTE] {mod_id}: pilot job {job_id} ended {state} "
+                          f"without reporting it")
+                    finish(mod_id, "failed", None,
+                           f"Pilot job {job_id} ended {state} before the module finished")
+                    doom_downstream(mod_id)
+                    continue
+                if state == "COMPLETED":
+                    print(f"[REMOTE] {mod_id}: job {job_id} COMPLETED")
+                    finish(mod_id, "success", metrics, "")
+                    continue
+                print(f"[REMOTE] {mod_id}: job {job_id} FAILED ({state})")
+                failed_up = [u for u in (index.upstream_ids(mod_id) if index else [])
+                             if results.get(u, ("success",))[0] != "success"]
+                if failed_up:
+                    # SLURM cancelled it itself (kill_invalid_depend)
+                    finish(mod_id, "skipped", metrics,
+                           f"Cancelled: upstream module {failed_up[0]} failed")
+                    continue
+                finish(mod_id, "failed", metrics, f"SLURM job {job_id} ended {state}")
+                doom_downstream(mod_id)
+
+            # doomed modules may have left the queue in this very round
+            doomed = {mod_id: reason for mod_id, reason in doomed.items() if mod_id in pending}
+            if doomed:
+                changed = True
+                jobs = {mod_id: job_id for mod_id, job_id in pending.items()
+                        if mod_id not in pilots}
+                for mod_id, reason in self._cancel_jobs(jobs, doomed, index).items():
+                    finish(mod_id, "skipped", None, reason)
 
             if pending:
-                print(f"[REMOTE] waiting for {list(pending)} …")
-                time.sleep(self._poll_interval)
+                interval = (self._poll_interval if changed
+                            else min(interval * _POLL_BACKOFF, self._max_poll_interval))
+                counts: Dict[str, int] = {}
+                for mod_id in pending:
+                    state = seen.get(mod_id, "PENDING")
+                    counts[state] = counts.get(state, 0) + 1
+                summary = ", ".join(f"{n} {state.lower()}" for state, n in sorted(counts.items()))
+                print(f"[REMOTE] waiting for {len(pending)} jobs ({summary}); "
+                      f"next poll in {interval:.0f}s")
+                time.sleep(max(0.0, min(interval, self._max_wait - (time.time() - start))))
 
         # Anything still pending after timeout → failed
-        for mod_id in pending:
+        for mod_id in list(pending):
             print(f"[REMOTE] {mod_id}: TIMEOUT")
-            results[mod_id] = False
+            finish(mod_id, "failed", None, "SLURM job timed out")
 
         return results
 
+    def _cancel_jobs(self, pending: Dict[str, str], doomed: Dict[str, str],
+                     index=None) -> Dict[str, str]:
+        """scancel the doomed pending jobs and their pending descendants, in one call.
+
+        Returns {mod_id: reason} for every cancelled module.
+        """
+        cancel = dict(doomed)
+        for mod_id, reason in doomed.items():
+            for d in (index.descendant_ids(mod_id) if index else []):
+                if d in pending:
+                    cancel.setdefault(d, reason)
+        cancel = {mod_id: reason for mod_id, reason in cancel.items() if mod_id in pending}
+        job_ids = [pending[mod_id] for mod_id in cancel]
+        print(f"[REMOTE] Cancelling {len(job_ids)} jobs that can no longer run: "
+              f"{sorted(cancel)}")
+        for chunk in _chunks(job_ids):
+            rc, _, err = self._ssh(f"scancel {' '.join(chunk)}")
+            if rc != 0:
+                print(f"[REMOTE] Warning: scancel failed: {err.strip()}")
+        return cancel
+
+    # ── output sync ───────────────────────────────────────────────────────────
+
+    def _collect(self, workflow: Workflow, mod_id: str, job_id: str,
+                 metrics: Optional[ModuleMetrics], phases: dict) -> ModuleResult:
+        """Pull a completed job's outputs and check that every output port arrived.
+
+        Runs on the sync pool while other jobs are still being polled; the
+        module only counts as complete once its local copy is verified.
+        """
+        local_out = self.workdir / "outputs" / mod_id
+        outputs = {
+            port: str(local_out / port) for port in workflow.module_map[mod_id].output_ports
+        }
+        synced = time.time()
+        try:
+            self._rsync_from_remote(f"{self.remote_workdir}/outputs/{mod_id}", local_out)
+            missing = [port for port, path in outputs.items() if not port_files(Path(path))]
+            if missing:
+                raise RuntimeError(f"outputs missing after sync: {missing}")
+        except (OSError, RuntimeError) as exc:
+            print(f"[REMOTE] {mod_id}: output sync failed: {exc}")
+            return self._job_failed(mod_id, f"Output sync failed: {exc}", job_id,
+                                    metrics, phases, returncode=0)
+        phases["sync"] = (synced, time.time())
+        print(f"[REMOTE] {mod_id}: outputs synced")
+        self.journal.module_complete(mod_id, outputs)
+        self._emit("module_complete", mod_id,
+                   {"outputs": outputs, **_measured(metrics, phases, job_id)})
+        return ModuleResult(
+            module_id=mod_id, status="success",
+            returncode=0, outputs=outputs, metrics=metrics,
+        )
+
+    def _job_failed(self, mod_id: str, error: str, job_id: Optional[str],
+                    metrics: Optional[ModuleMetrics], phases: dict,
+                    returncode: Optional[int] = 1, status: str = "failed") -> ModuleResult:
+        self.journal.module_failed(mod_id, error)
+        data = {"error": error, **_measured(metrics, phases, job_id)}
+        if status == "skipped":
+            data["skipped"] = True
+        self._emit("module_failed", mod_id, data)
+        return ModuleResult(
+            module_id=mod_id, status=status,
+            returncode=returncode, error=error, metrics=metrics,
+        )
+
+    # ── resume ────────────────────────────────────────────────────────────────
+
+    _REATTACH_STATES = ("PENDING", "CONFIGURING", "RUNNING", "COMPLETING", "COMPLETED")
+
+    def _resume_state(self, workflow: Workflow):
+        """Return (done, reattach) for an interrupted run.
+
+        ``done`` maps module ids whose outputs were synced and are intact to
+        their outputs; ``reattach`` maps module ids to (job_id, state, pilot)
+        for jobs that SLURM still knows as queued, running or completed, where
+        ``pilot`` names the pilot job that runs the module, if any.
+        """
+        state = self.journal.load()
+        if state["run"] and state["run"]["workflow_id"] != workflow.workflow_id:
+            raise ValueError(
+                f"Journal in {self.workdir} belongs to workflow "
+                f"'{state['run']['workflow_id']}', not '{workflow.workflow_id}'"
+            )
+        done = self.journal.completed_modules(workflow, state)
+        reattach: Dict[str, tuple] = {}
+        candidates = {
+            mod_id: rec["job_id"] for mod_id, rec in state["modules"].items()
+            if mod_id not in done and "job_id" in rec and rec["event"] != "failed"
+        }
+        job_states = self._job_states(list(candidates.values())) if candidates else {}
+        for mod_id in workflow.index.order_ids:
+            rec = state["modules"].get(mod_id)
+            if mod_id not in candidates:
+                continue
+            if not all(d in done or d in reattach for d in workflow.index.upstream_ids(mod_id)):
+                continue
+            job_state = job_states[rec["job_id"]]
+            if job_state in self._REATTACH_STATES:
+                reattach[mod_id] = (rec["job_id"], job_state, rec.get("pilot"))
+        print(f"[REMOTE] Resuming: {len(done)} modules complete, "
+              f"{len(reattach)} jobs reattached")
+        return done, reattach
+
     # ── execute ───────────────────────────────────────────────────────────────
 
     def execute(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
         print(f"\n[REMOTE] Executing '{workflow.workflow_id}' on {self.remotehost}")
+        if not self.remotehost:
+            raise ValueError("remotehost not specified for remote backend")
+        self.session.open()
+        try:
+            return self._execute(workflow, parameters)
+        finally:
+            self.session.close()
+
+    def _execute(self, workflow: Workflow, parameters: dict = None) -> WorkflowResult:
 
         rc, _, err = self._ssh(f"mkdir -p {self.remote_workdir}/outputs")
         if rc != 0:
             raise RuntimeError(f"Failed to create remote directory: {err}")
 
-        # Build dependency map: mod_id -> list of mod_ids it depends on
-        dep_mods: Dict[str, List[str]] = {m.id: [] for m in workflow.modules}
-        for conn in workflow.connections:
-            dep_mods[conn["to"]["module"]].append(conn["from"]["module"])
+        index = workflow.index
+        if self._predict and self.history is not None:
+            self._estimates = self.history.estimates(workflow)
+            print(f"[REMOTE] Resource predictions from history for "
+                  f"{len(self._estimates)}/{len(workflow.modules)} modules")
+
+        done: Dict[str, Dict[str, str]] = {}
+        reattach: Dict[str, tuple] = {}
+        if self.resume:
+            done, reattach = self._resume_state(workflow)
+        self.journal.begin(workflow.workflow_id, resume=self.resume,
+                           backend="remote", remote_workdir=self.remote_workdir)
 
         # Submit all modules upfront in topological order, using SLURM
         # --dependency=afterok to encode the DAG. Independent modules (same
-        # topological level) are submitted without waiting and run in parallel.
-        order = workflow.get_execution_order()
+        # topological level) are not held back and run in parallel.
+        order = index.order_ids
         submitted: Dict[str, str] = {}   # mod_id -> slurm_job_id
         submit_errors: Dict[str, str] = {}
+        staged: Dict[str, Tuple[float, float]] = {}  # mod_id -> (start, end) of its submission
 
-        print(f"[REMOTE] Submitting {len(order)} jobs …")
+        # Stage every job into a local bundle, ship it in one transfer and let
+        # submit_all.sh chain the job ids on the cluster (one ssh call in all).
+        bundle = self.workdir / "bundle"
+        shutil.rmtree(bundle, ignore_errors=True)
+        bundle.mkdir(parents=True)
+        live: Dict[str, str] = {}          # reattached mod_id (or pilot) -> unfinished job id
+        pilots: Dict[str, str] = {}        # mod_id -> name of the pilot job running it
+        ready: List[str] = []              # modules to submit, in topological order
+        scripts: Dict[str, Path] = {}
+        inputs: Dict[str, dict] = {}
+        params: Dict[str, dict] = {}
+
+        print(f"[REMOTE] Staging {len(order) - len(done) - len(reattach)} jobs …")
+        staging = time.time()
         for mod_id in order:
             module = workflow.module_map[mod_id]
-
-            inputs = {
-                conn["to"]["input"]: (
-                    f"{self.remote_workdir}/outputs/"
-                    f"{conn['from']['module']}/{conn['from']['output']}"
-                )
-                for conn in workflow.connections
-                if conn["to"]["module"] == mod_id
-            }
-
-            mod_params = dict(module.parameters)
-            if parameters:
-                for k, v in parameters.items():
-                    if k in mod_params:
-                        mod_params[k] = v
+            if mod_id in done:
+                continue
+            if mod_id in reattach:
+                job_id, job_state, pilot = reattach[mod_id]
+                submitted[mod_id] = job_id
+                if job_state != "COMPLETED":
+                    live[mod_id] = job_id
+                if pilot:
+                    pilots[mod_id] = pilot
+                    if job_state != "COMPLETED":
+                        live[pilot] = job_id   # dependency tokens name the pilot job
+                print(f"[REMOTE] {mod_id}: reattached to job {job_id} ({job_state})")
+                continue
 
             script_path = module.get_script_path()
             if script_path is None:
                 submit_errors[mod_id] = "No script defined"
                 continue
+            missing = [d for d in index.upstream_ids(mod_id) if d in submit_errors]
+            if missing:
+                submit_errors[mod_id] = f"Upstream modules not submitted: {missing}"
+                continue
 
-            # Translate upstream mod_ids to SLURM job ids for the dependency flag
-            dep_ids = [submitted[d] for d in dep_mods[mod_id] if d in submitted]
-
+            ready.append(mod_id)
+            scripts[mod_id] = script_path
+            inputs[mod_id] = {
+                port: f"{self.remote_workdir}/outputs/{src}/{output}"
+                for port, src, output in index.inputs(mod_id)
+            }
+            params[mod_id] = module.merged_parameters(parameters)
             self._emit("module_start", mod_id, {})
+
+        # One job per group: a single module or a job array. Dependencies name
+        # the upstream jobs, and the upstream task for modules run by an array.
+        jobs: List[Tuple[str, str, List[str]]] = []   # (job name, job script, dependency tokens)
+        members: Dict[str, List[str]] = {}            # job name -> its modules, in task order
+        job_of: Dict[str, str] = {}                   # mod_id -> job name
+        task_of: Dict[str, int] = {}                  # mod_id -> its task in a job array
+
+        # Pilot mode: short modules whose inputs already exist run in one
+        # allocation, submitted first and depending on nothing
+        pilot = []
+        if self._pilot:
+            settled = set(done) | {m for m, (_, state, _) in reattach.items()
+                                   if state == "COMPLETED"}
+            pilot = self._pilot_modules(workflow, ready, settled)
+        if pilot and not self._pilot_available():
+            pilot = []
+        if pilot:
+            name = f"pilot_{int(staging)}"
             try:
-                job_id = self._submit_module(
-                    module, str(script_path), inputs, mod_params, dep_ids
-                )
-                submitted[mod_id] = job_id
-            except Exception as exc:
-                submit_errors[mod_id] = str(exc)
-                print(f"[REMOTE] Error submitting {mod_id}: {exc}")
+                job_script = self._stage_pilot(bundle, name, workflow, pilot,
+                                               scripts, inputs, params)
+            except (OSError, ValueError) as exc:
+                print(f"[REMOTE] Error staging {name}: {exc}")
+                submit_errors.update((mod_id, str(exc)) for mod_id in pilot)
+            else:
+                jobs.append((name, job_script, []))
+                members[name] = pilot
+                job_of.update((mod_id, name) for mod_id in pilot)
+                pilots.update((mod_id, name) for mod_id in pilot)
+        rest = [mod_id for mod_id in ready if mod_id not in job_of and mod_id not in submit_errors]
 
-        # Poll all submitted jobs concurrently (one SSH loop, not one per module)
-        print(f"[REMOTE] All jobs submitted. Polling for completion …")
-        job_outcomes = self._poll_all(dict(submitted))  # mod_id -> bool
+        for candidates in self._array_groups(workflow, rest, scripts):
+            # upstream jobs that failed to stage (levels are staged in order)
+            for mod_id in candidates:
+                missing = [d for d in index.upstream_ids(mod_id) if d in submit_errors]
+                if missing:
+                    submit_errors[mod_id] = f"Upstream modules not submitted: {missing}"
+            candidates = [mod_id for mod_id in candidates if mod_id not in submit_errors]
+            if not candidates:
+                continue
+            deps = {mod_id: self._dependencies(mod_id, index, job_of, task_of, live, pilots)
+                    for mod_id in candidates}
+            for group, tokens in self._split_group(candidates, deps):
+                name = group[0] if len(group) == 1 else _array_name(len(members), group)
+                try:
+                    if len(group) == 1:
+                        job_script = self._stage_module(
+                            bundle, workflow.module_map[name], scripts[name], inputs[name],
+                            params[name], tokens,
+                        )
+                    else:
+                        job_script = self._stage_array(
+                            bundle, name, [workflow.module_map[m] for m in group],
+                            scripts[group[0]], inputs, params, tokens,
+                        )
+                except (OSError, ValueError) as exc:
+                    print(f"[REMOTE] Error staging {name}: {exc}")
+                    submit_errors.update((mod_id, str(exc)) for mod_id in group)
+                    continue
+                jobs.append((name, job_script, tokens))
+                members[name] = group
+                job_of.update((mod_id, name) for mod_id in group)
+                if len(group) > 1:
+                    task_of.update((mod_id, task) for task, mod_id in enumerate(group))
 
-        # Sync results + build WorkflowResult
-        print(f"[REMOTE] Syncing outputs from {self.remotehost} …")
-        module_results: Dict[str, ModuleResult] = {}
+        if jobs:
+            print(f"[REMOTE] Submitting {len(jobs)} jobs for {len(job_of)} modules …")
+            new_jobs, errors = self._submit_bundle(bundle, jobs, live)
+            window = (staging, time.time())
+            job_ids = {**live, **new_jobs}
+            for name, _, deps in jobs:
+                group = members[name]
+                if name in errors:
+                    print(f"[REMOTE] Error submitting {name}: {errors[name]}")
+                    submit_errors.update((mod_id, errors[name]) for mod_id in group)
+                    continue
+                module = workflow.module_map[group[0]]
+                partition, _, _, time_limit, mem = self._resources(module)
+                dep_str = (f" with --dependency={_dependency(deps, job_ids)}" if deps
+                           else " (no deps)")
+                if group is pilot:
+                    resources, cpus = self._pilot_resources(workflow, pilot)
+                    partition, _, _, time_limit, mem = resources
+                    print(f"[REMOTE] {name}: submitted pilot job {new_jobs[name]} for "
+                          f"{len(group)} modules (partition={partition}, cpus={cpus}, "
+                          f"mem={mem}, time={time_limit})")
+                elif len(group) == 1:
+                    print(f"[REMOTE] {name}: submitted job {new_jobs[name]}{dep_str} "
+                          f"(partition={partition}, mem={mem}, time={time_limit})")
+                else:
+                    print(f"[REMOTE] {name}: submitted array job {new_jobs[name]} with "
+                          f"{len(group)} tasks{dep_str} "
+                          f"(partition={partition}, mem={mem}, time={time_limit})")
+                for task, mod_id in enumerate(group):
+                    if group is pilot:
+                        job_id = new_jobs[name]
+                        self.journal.module_submitted(mod_id, job_id, pilot=name)
+                    else:
+                        job_id = new_jobs[name] if len(group) == 1 else f"{new_jobs[name]}_{task}"
+                        self.journal.module_submitted(mod_id, job_id)
+                    submitted[mod_id] = job_id
+                    staged[mod_id] = window
 
+        module_results: Dict[str, ModuleResult] = {}
         for mod_id in order:
-            if mod_id in submit_errors:
+            if mod_id in done:
+                module_results[mod_id] = ModuleResult(
+                    module_id=mod_id, status="success", returncode=0,
+                    outputs=done[mod_id], resumed=True,
+                )
+                self._emit("module_complete", mod_id, {"outputs": done[mod_id], "resumed": True})
+            elif mod_id in submit_errors:
                 module_results[mod_id] = ModuleResult(
                     module_id=mod_id, status="failed",
                     error=submit_errors[mod_id]
                 )
+                self.journal.module_failed(mod_id, submit_errors[mod_id])
                 self._emit("module_failed", mod_id, {"error": submit_errors[mod_id]})
-                continue
 
-            succeeded = job_outcomes.get(mod_id, False)
-            local_out = self.workdir / "outputs" / mod_id
+        # Poll all submitted jobs concurrently (one SSH loop, not one per module)
+        # and pull each job's outputs in the background as soon as it completes
+        print(f"[REMOTE] All jobs submitted. Polling for completion …")
+        syncs: Dict[str, Future] = {}
+        with ThreadPoolExecutor(max_workers=self._sync_workers,
+                                thread_name_prefix="nexa-sync") as pool:
+            def finished(mod_id: str, status: str, metrics: Optional[ModuleMetrics],
+                         error: str) -> None:
+                phases = {"staging": staged[mod_id]} if mod_id in staged else {}
+                if status == "success":
+                    syncs[mod_id] = pool.submit(
+                        self._collect, workflow, mod_id, submitted[mod_id], metrics, phases
+                    )
+                else:
+                    module_results[mod_id] = self._job_failed(
+                        mod_id, error, submitted[mod_id], metrics, phases,
+                        returncode=1 if status == "failed" else None, status=status,
+                    )
 
-            if succeeded:
-                self._rsync_from_remote(
-                    f"{self.remote_workdir}/outputs/{mod_id}", local_out
-                )
-                outputs = {
-                    port: str(local_out / port)
-                    for port in workflow.module_map[mod_id].output_ports
-                }
-                module_results[mod_id] = ModuleResult(
-                    module_id=mod_id, status="success",
-                    returncode=0, outputs=outputs,
-                )
-                self._emit("module_complete", mod_id, {"outputs": outputs})
-            else:
-                module_results[mod_id] = ModuleResult(
-                    module_id=mod_id, status="failed",
-                    returncode=1, error="SLURM job failed or timed out",
-                )
-                self._emit("module_failed", mod_id, {})
+            self._poll_all(dict(submitted), index, finished, pilots)
+            if any(not fut.done() for fut in syncs.values()):
+                print(f"[REMOTE] Waiting for output sync from {self.remotehost} …")
+        module_results.update((mod_id, fut.result()) for mod_id, fut in syncs.items())
+        module_results = {mod_id: module_results[mod_id] for mod_id in order}
 
         overall = "success" if all(r.status == "success" for r in module_results.values()) else "failed"
         failed  = [mid for mid, r in module_results.items() if r.status != "success"]
@@ -312,3 +1137,188 @@ class RemoteBackend(BaseBackend):
             outputs_dir=self.workdir / "outputs",
             error=f"Modules failed: {failed}" if failed else "",
         )
+
+
+def _measured(metrics: Optional[ModuleMetrics], phases: dict, job_id: Optional[str]) -> dict:
+    """Event payload fields describing a measured job."""
+    if not metrics:
+        return {}
+    return {"metrics": metrics.to_dict(), "phases": phases, "job_id": job_id}
+
+
+def _submit_all_script(live: Dict[str, str], install: str = "") -> str:
+    """Cluster-side submitter for a staged bundle.
+
+    Reads ``<job name> <job script> <dependency,tokens>`` lines from jobs.txt
+    and submits them in order with ``sbatch --parsable``, chaining the
+    returned job ids into ``--dependency`` (see ``_dependency``). ``live``
+    seeds the ids of upstream jobs submitted by an earlier (resumed) run.
+    ``install`` runs first (it moves the bundled store objects into place).
+    Prints ``<job name> <job_id>`` or ``<job name> ERROR <reason>`` per line.
+    """
+    seeded = " ".join(f"[{shlex.quote(mod_id)}]={job_id}" for mod_id, job_id in live.items())
+    return f"""#!/bin/bash
+cd "$(dirname "$0")"
+{install}declare -A JOBS=({seeded})
+while read -r mod script deps; do
+    ok=""; corr=""; any=""
+    for dep in ${{deps//,/ }}; do
+        kind=ok
+        case $dep in
+            "~"*) kind=corr; dep=${{dep:1}} ;;
+            "+"*) kind=any; dep=${{dep:1}}; dep=${{dep%%/*}} ;;
+        esac
+        job=${{dep%@*}}
+        if [ -z "${{JOBS[$job]}}" ]; then
+            echo "$mod ERROR upstream $job was not submitted"
+            continue 2
+        fi
+        id=${{JOBS[$job]}}
+        [ "$job" = "$dep" ] || id="${{id}}_${{dep##*@}}"
+        case $kind in
+            corr) corr="$corr:$id" ;;
+            any) [[ $any == *":$id" ]] || any="$any:$id" ;;
+            *) ok="$ok:$id" ;;
+        esac
+    done
+    dependency="${{ok:+,afterok$ok}}${{corr:+,aftercorr$corr}}${{any:+,afterany$any}}"
+    args=(--parsable)
+    [ -n "$dependency" ] && args+=(--dependency="${{dependency#,}}")
+    if out=$(sbatch "${{args[@]}}" "$script" 2>sbatch.err); then
+        id=${{out##*$'\\n'}}
+        JOBS[$mod]=${{id%%;*}}
+        echo "$mod ${{JOBS[$mod]}}"
+    else
+        echo "$mod ERROR $(tr '\\n' ' ' < sbatch.err)"
+    fi
+done < jobs.txt
+"""
+
+
+def _dependency(tokens: List[str], job_ids: Dict[str, str]) -> str:
+    """The ``--dependency`` value submit_all.sh builds from dependency tokens.
+
+    ``<job>`` becomes ``afterok:<id>``, ``<array>@<task>`` ``afterok:<id>_<task>``,
+    ``~<array>`` ``aftercorr:<id>`` and ``+<pilot>/<module>`` ``afterany:<id>``.
+    """
+    kinds: Dict[str, List[str]] = {"afterok": [], "aftercorr": [], "afterany": []}
+    for token in tokens:
+        if token.startswith("+"):
+            job_id = job_ids[token[1:].partition("/")[0]]
+            if job_id not in kinds["afterany"]:
+                kinds["afterany"].append(job_id)
+            continue
+        kind = "aftercorr" if token.startswith("~") else "afterok"
+        job, sep, task = token.lstrip("~").rpartition("@")
+        kinds[kind].append(f"{job_ids[job]}_{task}" if sep else job_ids[token.lstrip("~")])
+    return ",".join(f"{kind}:{':'.join(ids)}" for kind, ids in kinds.items() if ids)
+
+
+def _correlated(group: List[str],
+                deps: Dict[str, frozenset]) -> Optional[Tuple[List[str], List[str]]]:
+    """Order ``group`` as an ``aftercorr`` array, if its dependencies allow it.
+
+    Beyond the tokens all members share, each member must wait for exactly
+    one task of each of the same upstream arrays, and ordered by those tasks
+    the members must be tasks 0..n-1 of every one of them. Returns (members
+    in task order, dependency tokens), or None.
+    """
+    common = frozenset.intersection(*(deps[mod_id] for mod_id in group))
+    tasks: Dict[str, Dict[str, int]] = {}   # mod_id -> {upstream array: its task}
+    for mod_id in group:
+        own: Dict[str, int] = {}
+        for token in deps[mod_id] - common:
+            array, sep, task = token.rpartition("@")
+            if not sep or array in own:
+                return None
+            own[array] = int(task)
+        tasks[mod_id] = own
+    arrays = sorted(tasks[group[0]])
+    if not arrays or any(sorted(own) != arrays for own in tasks.values()):
+        return None
+    ordered = sorted(group, key=lambda mod_id: tasks[mod_id][arrays[0]])
+    if any([tasks[mod_id][array] for mod_id in ordered] != list(range(len(group)))
+           for array in arrays):
+        return None
+    return ordered, sorted(common) + [f"~{array}" for array in arrays]
+
+
+def _walltime_seconds(value: str) -> float:
+    """Seconds in an ``sbatch --time`` value (M, M:S, H:M:S, D-H, D-H:M or D-H:M:S)."""
+    days, _, clock = str(value).rpartition("-")
+    parts = [float(part) for part in clock.split(":")]
+    if days:
+        parts += [0.0] * (3 - len(parts))   # the clock of D-H[:M] starts at hours
+    elif len(parts) == 1:
+        parts.append(0.0)                   # a bare number is minutes
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + part
+    return seconds + (int(days) * 86400 if days else 0)
+
+
+def _slurm_walltime(seconds: float) -> str:
+    """``sbatch --time`` value ([D-]HH:MM:SS), rounded up to the minute."""
+    minutes = math.ceil(seconds / 60)
+    days, minutes = divmod(minutes, 24 * 60)
+    clock = f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+    return f"{days}-{clock}" if days else clock
+
+
+# ── sacct parsing ─────────────────────────────────────────────────────────────
+
+def _slurm_time(value: str) -> Optional[float]:
+    """Epoch seconds from an sacct timestamp (cluster local time)."""
+    try:
+        return time.mktime(time.strptime(value, "%Y-%m-%dT%H:%M:%S"))
+    except ValueError:
+        return None   # "Unknown", "None", empty
+
+
+def _slurm_duration(value: str) -> Optional[float]:
+    """Seconds from an sacct duration: [D-][HH:]MM:SS[.mmm]."""
+    if not value:
+        return None
+    days, _, clock = value.rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds + (int(days) * 86400 if days else 0)
+
+
+def _parse_sacct(out: str) -> Dict[str, Tuple[str, ModuleMetrics]]:
+    """Parse ``sacct -P`` rows for _SACCT_FIELDS into {job_id: (state, metrics)}.
+
+    Each job contributes its allocation row followed by its steps
+    (``<id>.batch``, ``<id>.0``, ...); peak RSS is the largest over the steps.
+    """
+    rows: Dict[str, List[List[str]]] = {}
+    for line in out.strip().splitlines():
+        if line.strip():
+            job_id, *fields = line.split("|")
+            rows.setdefault(job_id.strip().split(".")[0], []).append(fields)
+    return {job_id: _parse_sacct_job(job_rows) for job_id, job_rows in rows.items()}
+
+
+def _parse_sacct_job(rows: List[List[str]]) -> Tuple[str, ModuleMetrics]:
+    state, submit, start, end, user, system = (rows[0] + [""] * 6)[:6]
+    rss = [row[6].strip() for row in rows if len(row) > 6 and row[6].strip()]
+    max_rss = max(
+        (int(r) if r.isdigit() else parse_mem(r) for r in rss), default=None
+    )
+    metrics = ModuleMetrics.measured(
+        _slurm_time(start), _slurm_time(end), _slurm_time(submit),
+        user_cpu=_slurm_duration(user), sys_cpu=_slurm_duration(system), max_rss=max_rss,
+    )
+    return (state.split() or ["UNKNOWN"])[0], metrics
+
+
+def _array_name(number: int, mod_ids: List[str]) -> str:
+    """``array<number>``, plus the shared stem of its module ids (``md`` for md__0, md__1, ...)."""
+    stem = os.path.commonprefix(mod_ids).rstrip("_-.")
+    return f"array{number}_{stem}" if stem else f"array{number}"
+
+
+def _chunks(job_ids: List[str]) -> List[List[str]]:
+    """Split job ids into groups small enough for one squeue/sacct command line."""
+    return [job_ids[i:i + _QUERY_CHUNK] for i in range(0, len(job_ids), _QUERY_CHUNK)]
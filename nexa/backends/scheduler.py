@@ -0,0 +1,123 @@
+"""
+Ready-queue dispatch state shared by the local backends.
+
+ReadyQueue tracks which modules are waiting on upstream work, which are ready
+and which are running, and decides what may start next under the worker limit
+and the machine ResourceBudget. It does no execution itself: LocalBackend
+drives it from a thread pool, AsyncLocalBackend from an asyncio event loop.
+
+When more modules are ready than may start, the schedule policy decides who
+goes first:
+
+- critical-path  highest bottom level first: the module with the longest
+                 chain of (estimated) work still behind it, so the tail of
+                 the run is not stuck waiting on a module that started late
+- fifo           in the order the modules became ready
+
+Bottom levels are weighted by each module's estimated runtime where one is
+known (see critical_path_priorities); otherwise every module counts as one.
+"""
+import heapq
+import itertools
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.workflow import Workflow
+from ..utils.resources import ResourceBudget
+
+SCHEDULES = ("critical-path", "fifo")
+
+
+def critical_path_priorities(workflow: Workflow,
+                             durations: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Bottom level of every module, weighted by its estimated runtime in seconds.
+
+    Modules without an estimate are weighted with the mean of the known ones
+    (1.0 if nothing is known), so unseen modules neither dominate nor vanish.
+    """
+    durations = {mid: d for mid, d in (durations or {}).items() if d is not None and d >= 0}
+    default = sum(durations.values()) / len(durations) if durations else 1.0
+    return workflow.index.bottom_levels(durations, default=default or 1.0)
+
+
+class ReadyQueue:
+    """Dependency-driven dispatch of one workflow's modules.
+
+    A module becomes ready as soon as its last upstream module succeeds.
+    Ready modules are started highest ``priority`` first (ties, and all
+    modules when no priorities are given, in the order they became ready).
+    Ready modules that do not fit the remaining budget stay queued while
+    smaller ones behind them are allowed to start. After a failure nothing
+    new is started, unless ``keep_going`` is set: then only the modules
+    downstream of the failure (which never become ready) are left out.
+    """
+
+    def __init__(self, workflow: Workflow, budget: ResourceBudget, max_workers: int,
+                 done: Iterable[str] = (), priority: Optional[Dict[str, float]] = None,
+                 keep_going: bool = False):
+        index = workflow.index
+        self.order = index.order_ids
+        self.position = {mid: i for i, mid in enumerate(self.order)}
+        self.budget = budget
+        self.max_workers = max_workers
+        self.dependents: Dict[str, List[str]] = {
+            mid: index.downstream_ids(mid) for mid in self.order
+        }
+
+        done = set(done)
+        self.requests = {mid: budget.request(workflow.module_map[mid]) for mid in self.order}
+        self.waiting = {
+            mid: sum(dep not in done for dep in index.upstream_ids(mid)) for mid in self.order
+        }
+        self.priority = priority or {}
+        self._seq = itertools.count()
+        self.ready: List[Tuple[float, int, str]] = []   # heap of (-priority, seq, mid)
+        self.ready_since: Dict[str, float] = {}
+        for mid in self.order:
+            if not self.waiting[mid] and mid not in done:
+                self._push(mid)
+        self.running: set = set()
+        self.failed: List[str] = []
+        self.keep_going = keep_going
+
+    @property
+    def active(self) -> bool:
+        """True while something is running or could still be started."""
+        return bool(self.running) or (bool(self.ready) and not self._halted)
+
+    @property
+    def _halted(self) -> bool:
+        return bool(self.failed) and not self.keep_going
+
+    def startable(self) -> List[str]:
+        """Pop every ready module that may start now, reserving its resources."""
+        started: List[str] = []
+        skipped: List[str] = []
+        while self.ready and not self._halted and len(self.running) < self.max_workers:
+            entry = heapq.heappop(self.ready)
+            mid = entry[2]
+            if not self.budget.fits(self.requests[mid]):
+                skipped.append(entry)
+                continue
+            self.budget.acquire(self.requests[mid])
+            self.running.add(mid)
+            started.append(mid)
+        for entry in skipped:
+            heapq.heappush(self.ready, entry)
+        return started
+
+    def finish(self, mid: str, succeeded: bool) -> None:
+        """Release a finished module's resources and queue newly ready dependents."""
+        self.running.discard(mid)
+        self.budget.release(self.requests[mid])
+        if not succeeded:
+            self.failed.append(mid)
+            return
+        for child in self.dependents[mid]:
+            self.waiting[child] -= 1
+            if self.waiting[child] == 0:
+                self._push(child)
+
+    def _push(self, mid: str) -> None:
+        heapq.heappush(self.ready, (-self.priority.get(mid, 0.0), next(self._seq), mid))
+        self.ready_since[mid] = time.time()
@@ -0,0 +1,109 @@
+"""
+One multiplexed SSH connection per remote run.
+
+Starting a fresh ``ssh`` for every command costs a full handshake (key
+exchange and authentication) each time, and a remote run issues several
+commands per module. SSHSession instead starts a single OpenSSH
+ControlMaster when the run begins and sends every later ``ssh``, ``scp``
+and ``rsync`` through its control socket, so each one is a new channel on
+the existing connection rather than a new connection. The master is shut
+down when the run ends; ``ControlPersist`` bounds its lifetime in case
+NEXA itself dies first.
+
+Commands are passed to ``ssh`` as argument lists (no local shell); the
+command string is interpreted by the remote login shell as before.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+class SSHSession:
+    """A ControlMaster connection to one host, shared by ssh, scp and rsync."""
+
+    def __init__(self, host: str, username: str = "", private_key: Optional[str] = None,
+                 persist: int = 600):
+        self.host = host
+        self.username = username
+        self.private_key = private_key
+        self.persist = persist
+        self._control_dir: Optional[str] = None
+
+    @property
+    def control_path(self) -> Optional[str]:
+        return os.path.join(self._control_dir, "ctl") if self._control_dir else None
+
+    def _options(self) -> List[str]:
+        opts: List[str] = []
+        if self.username:
+            opts += ["-o", f"User={self.username}"]
+        if self.private_key:
+            opts += ["-i", os.path.expanduser(self.private_key)]
+        if self._control_dir:
+            opts += ["-o", f"ControlPath={self.control_path}", "-o", "ControlMaster=no"]
+        return opts
+
+    # ── connection ───────────────────────────────────────────────────────────
+
+    def open(self) -> None:
+        """Start the master connection; later commands reuse it."""
+        if self._control_dir:
+            return
+        # socket paths are limited to ~100 characters: keep it short
+        control_dir = tempfile.mkdtemp(prefix="nexa-ssh-")
+        master = self._options() + [
+            "-o", f"ControlPath={os.path.join(control_dir, 'ctl')}",
+            "-o", "ControlMaster=yes", "-o", f"ControlPersist={self.persist}",
+            "-N", "-f",
+        ]
+        result = subprocess.run(["ssh", *master, self.host], capture_output=True, text=True)
+        if result.returncode != 0:
+            shutil.rmtree(control_dir, ignore_errors=True)
+            raise RuntimeError(f"SSH connection to {self.host} failed: {result.stderr.strip()}")
+        self._control_dir = control_dir
+
+    def close(self) -> None:
+        """Stop the master connection."""
+        if not self._control_dir:
+            return
+        subprocess.run(
+            ["ssh", "-o", f"ControlPath={self.control_path}", "-O", "exit", self.host],
+            capture_output=True, text=True,
+        )
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+        self._control_dir = None
+
+    def __enter__(self) -> "SSHSession":
+        self.open()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── commands ─────────────────────────────────────────────────────────────
+
+    def run(self, cmd: str) -> Tuple[int, str, str]:
+        """Run a shell command on the host; returns (returncode, stdout, stderr)."""
+        result = subprocess.run(["ssh", *self._options(), self.host, cmd],
+                                capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+    def put(self, local: Path, remote_path: str) -> None:
+        """Copy a local file to ``remote_path`` on the host."""
+        result = subprocess.run(
+            ["scp", "-q", *self._options(), str(local), f"{self.host}:{remote_path}"],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"scp failed: {result.stderr}")
+
+    def get_dir(self, remote_dir: str, local_dir: Path) -> subprocess.CompletedProcess:
+        """Mirror ``remote_dir`` on the host into ``local_dir``."""
+        transport = " ".join(["ssh", *self._options()])
+        return subprocess.run(
+            ["rsync", "-az", "-e", transport, f"{self.host}:{remote_dir}/", f"{local_dir}/"],
+            capture_output=True, text=True,
+        )
@@ -0,0 +1,207 @@
+# nexa/backends/worker_pool.py
+"""
+Warm worker pool for Python modules.
+
+Starting ``python script.py`` for every module pays for interpreter start-up
+and for importing heavy libraries (numpy, rdkit, ...) each time. With a
+WarmWorkerPool, LocalBackend instead hands Python modules to pre-forked
+workers: a multiprocessing "forkserver" imports the configured ``preload``
+modules once, and every worker is forked from it with those imports already
+in memory.
+
+A worker runs the module script in-process as ``__main__`` (so its usual
+``if __name__ == "__main__": main()`` entry point fires) with the same
+``--input/--params/--output_dir`` argv a subprocess would get, and with its
+stdout/stderr file descriptors pointed at the module's log files. It reports
+the exit code together with the CPU time the script used and its peak RSS.
+Workers are recycled after ``recycle_after`` tasks (default: after every
+task), so state a script leaves behind never leaks into the next module.
+
+Each worker is the single process of its own ProcessPoolExecutor, so a worker
+that dies mid-task (``os._exit``, a segfault, the OOM killer) breaks only that
+executor: its module fails with a note in its stderr log, and the worker is
+replaced. Modules running in other workers are unaffected.
+"""
+import multiprocessing
+import os
+import re
+import resource
+import runpy
+import sys
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.resources import rusage_usage
+
+_PYTHON_EXE = re.compile(r"python(\d+(\.\d+)?)?")
+
+# Exit code reported for a module whose worker died before it returned
+WORKER_DIED = -1
+
+Task = Tuple[str, List[str], str, str]   # (script, argv, stdout log, stderr log)
+
+
+class _Worker:
+    """One worker process, as a single-process executor, and how many tasks it ran."""
+
+    def __init__(self):
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.tasks = 0
+
+
+class WarmWorkerPool:
+    """Pool of forkserver-backed Python workers with preloaded modules."""
+
+    def __init__(self, workers: Optional[int] = None, preload: Sequence[str] = (),
+                 recycle_after: int = 1):
+        self.preload = [m for m in preload if m]
+        self._ctx = multiprocessing.get_context("forkserver")
+        self._ctx.set_forkserver_preload([__name__, *self.preload])
+        self.workers = workers or os.cpu_count() or 1
+        self.recycle_after = max(recycle_after, 1)
+        self._all = [_Worker() for _ in range(self.workers)]
+        self._idle: List[_Worker] = list(self._all)
+        self._queue: Deque[Tuple[Task, Future]] = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def accepts(module) -> bool:
+        """True for modules whose executable is a Python interpreter."""
+        return bool(_PYTHON_EXE.fullmatch(Path(module.executable).name))
+
+    def run(self, script_path: str, argv: List[str], stdout_log: Path,
+            stderr_log: Path) -> Tuple[int, Dict[str, Any]]:
+        """Run a script in a warm worker; block until it returns ``(exit code, usage)``."""
+        return self._submit((str(script_path), argv, str(stdout_log), str(stderr_log))).result()
+
+    def submit(self, script_path: str, argv: List[str], stdout_log: Path, stderr_log: Path,
+               callback: Callable[[Tuple[int, Dict[str, Any]]], None],
+               error_callback: Callable[[BaseException], None]) -> None:
+        """Non-blocking run(); ``callback`` receives ``(exit code, usage)`` in a pool thread."""
+        future = self._submit((str(script_path), argv, str(stdout_log), str(stderr_log)))
+
+        def done(fut: Future) -> None:
+            if fut.exception() is not None:
+                error_callback(fut.exception())
+            else:
+                callback(fut.result())
+
+        future.add_done_callback(done)
+
+    def _submit(self, task: Task) -> Future:
+        future: Future = Future()
+        with self._lock:
+            self._queue.append((task, future))
+            self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        """Hand queued tasks to idle workers (called with the lock held)."""
+        while self._idle and self._queue:
+            worker = self._idle.pop()
+            task, future = self._queue.popleft()
+            if worker.executor is None or worker.tasks >= self.recycle_after:
+                if worker.executor is not None:
+                    worker.executor.shutdown(wait=False)
+                worker.executor = ProcessPoolExecutor(
+                    max_workers=1, mp_context=self._ctx,
+                    initializer=_preload, initargs=(self.preload,),
+                )
+                worker.tasks = 0
+            worker.tasks += 1
+            inner = worker.executor.submit(_run_script, *task)
+            inner.add_done_callback(
+                lambda fut, worker=worker, task=task, future=future:
+                    self._finished(worker, task, future, fut)
+            )
+
+    def _finished(self, worker: _Worker, task: Task, future: Future, inner: Future) -> None:
+        try:
+            outcome, error = inner.result(), None
+        except BrokenProcessPool:
+            outcome, error = _worker_died(task), None
+            worker.executor.shutdown(wait=False)
+            worker.executor = None
+        except BaseException as exc:
+            outcome, error = None, exc
+        with self._lock:
+            self._idle.append(worker)
+            self._dispatch()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(outcome)
+
+    def close(self) -> None:
+        for worker in self._all:
+            if worker.executor is not None:
+                worker.executor.shutdown(wait=True)
+                worker.executor = None
+
+    def __enter__(self) -> "WarmWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _worker_died(task: Task) -> Tuple[int, Dict[str, Any]]:
+    """Outcome of a task whose worker process died; notes it in the stderr log."""
+    with open(task[3], "a") as err:
+        err.write("\nwarm worker died before the module returned "
+                  "(os._exit, a fatal signal or the OOM killer)\n")
+    return WORKER_DIED, {}
+
+
+# ── worker side ───────────────────────────────────────────────────────────────
+
+def _preload(modules: Sequence[str]) -> None:
+    # Normally a no-op: the forkserver already imported these before forking.
+    for name in modules:
+        __import__(name)
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_script(script_path: str, argv: List[str], stdout_log: str,
+                stderr_log: str) -> Tuple[int, Dict[str, Any]]:
+    """Execute a module script as ``__main__`` with its output sent to the log files."""
+    before = resource.getrusage(resource.RUSAGE_SELF)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    with open(stdout_log, "wb") as out, open(stderr_log, "wb") as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        sys.argv = [script_path, *argv]
+        sys.path.insert(0, os.path.dirname(script_path))
+        try:
+            runpy.run_path(script_path, run_name="__main__")
+            returncode = 0
+        except SystemExit as exc:
+            returncode = _exit_code(exc.code)
+        except BaseException:
+            traceback.print_exc()
+            returncode = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+            sys.argv, sys.path[:] = saved_argv, saved_path
+    return returncode, rusage_usage(resource.getrusage(resource.RUSAGE_SELF), before)
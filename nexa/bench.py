@@ -0,0 +1,395 @@
+# nexa/bench.py
+"""
+Orchestration-overhead benchmarks (``nexa bench``).
+
+Synthetic workflows of a given shape and size are generated from a single
+no-op stub module (executable ``true``), so everything that is measured is
+NEXA's own overhead rather than module work:
+
+- chain    m0 -> m1 -> ... -> m(n-1)
+- fanout   one root feeding n-1 independent leaves
+- diamond  repeated split -> ``width`` branches -> join blocks
+- random   every module takes 1-3 inputs from randomly chosen earlier modules
+
+For each (shape, size, backend) case the suite records planning time (loading
+the workflow and building its index), per-module dispatch latency, peak
+orchestrator RSS and the makespan. Backends:
+
+- local     LocalBackend running the stub modules for real
+- nextflow  generation of the Nextflow script only (nothing is run)
+- remote    RemoteBackend against an in-process fake SLURM that stands in
+            for its SSH session: commands, uploads and downloads are
+            answered from memory, and a job completes the first time it is
+            polled after all its dependencies have, so only submission and
+            polling are timed (FakeSlurmBackend also serves the tests)
+
+Every case runs in a fresh interpreter so peak RSS is its own. Results are
+written as JSON for comparison between releases.
+"""
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import resource
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .backends.local import LocalBackend
+from .backends.nextflow import NextflowBackend
+from .backends.remote import RemoteBackend
+from .core.registry import ModuleRegistry
+from .core.workflow import Workflow
+
+SHAPES = ("chain", "fanout", "diamond", "random")
+BACKENDS = ("local", "nextflow", "remote")
+
+
+# ── workflow generation ───────────────────────────────────────────────────────
+
+def _edges(shape: str, n: int, rng: random.Random, width: int = 4) -> List[Tuple[int, int]]:
+    if shape == "chain":
+        return [(i - 1, i) for i in range(1, n)]
+    if shape == "fanout":
+        return [(0, i) for i in range(1, n)]
+    if shape == "diamond":
+        edges: List[Tuple[int, int]] = []
+        split = 0
+        nxt = 1
+        while nxt < n:
+            branches = list(range(nxt, min(nxt + width, n)))
+            edges.extend((split, b) for b in branches)
+            nxt += len(branches)
+            if nxt >= n:
+                break
+            edges.extend((b, nxt) for b in branches)
+            split, nxt = nxt, nxt + 1
+        return edges
+    if shape == "random":
+        return [
+            (src, i)
+            for i in range(1, n)
+            for src in rng.sample(range(i), min(i, rng.randint(1, 3)))
+        ]
+    raise ValueError(f"Unknown shape '{shape}'. Choose from: {list(SHAPES)}")
+
+
+def generate_workflow(shape: str, n: int, root: Path, seed: int = 0) -> Path:
+    """Write a synthetic ``shape`` workflow of ``n`` stub modules under ``root``."""
+    root.mkdir(parents=True, exist_ok=True)
+    edges = _edges(shape, n, random.Random(seed))
+
+    fan_in = [0] * n
+    connections = []
+    for src, dst in edges:
+        connections.append({
+            "from": {"module": f"m{src}", "output": "out"},
+            "to": {"module": f"m{dst}", "input": f"in{fan_in[dst]}"},
+        })
+        fan_in[dst] += 1
+
+    (root / "stub.sh").write_text("#!/bin/sh\n# no-op module: the benchmark runs it with `true`\n")
+    (root / "stub.json").write_text(json.dumps({
+        "id": "stub",
+        "executable": "true",
+        "script": "stub.sh",
+        "input_ports": [f"in{i}" for i in range(max(fan_in, default=0))],
+        "output_ports": ["out"],
+    }))
+    wf_path = root / f"{shape}_{n}.json"
+    wf_path.write_text(json.dumps({
+        "workflow_id": f"bench_{shape}_{n}",
+        "modules": [{"id": f"m{i}", "ref": "stub.json"} for i in range(n)],
+        "connections": connections,
+    }))
+    return wf_path
+
+
+# ── fake SLURM ────────────────────────────────────────────────────────────────
+
+class FakeSlurm:
+    """Just enough of sbatch/squeue/sacct/scancel for RemoteBackend, kept in memory.
+
+    Implements the SSHSession interface, so it replaces the backend's session.
+    The jobs of modules listed in ``fail`` end FAILED; jobs that depend on a
+    failed or cancelled job stay pending as DependencyNeverSatisfied.
+    """
+
+    def __init__(self, workdir: Path, fail: Sequence[str] = ()):
+        self.workdir = Path(workdir)
+        self.fail = set(fail)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.stored: set = set()             # objects in the remote store
+        self.calls: Dict[str, int] = {}
+        self._next_id = 1000
+
+    def _count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def open(self) -> None:
+        self._count("connect")
+
+    def close(self) -> None:
+        pass
+
+    def put(self, local: Path, remote_path: str) -> None:
+        self._count("scp")
+
+    def get_dir(self, remote_dir: str, local_dir: Path) -> subprocess.CompletedProcess:
+        self._count("rsync")
+        (Path(local_dir) / "out").touch()   # every stub module has one output port, "out"
+        return subprocess.CompletedProcess(["rsync"], 0, "", "")
+
+    def submit(self, modules: List[str], deps: List[str], corr: Sequence[str] = (),
+               array: bool = False, any_of: Sequence[str] = ()) -> str:
+        """Queue a job, or a job array with one task per module; returns its job id.
+
+        ``deps`` are ``afterok`` job ids (``<id>_<task>`` for one array task);
+        task N of an array also waits for task N of each ``aftercorr`` array
+        in ``corr``, and every job for the ``afterany`` jobs in ``any_of`` to end.
+        """
+        job_id = str(self._next_id)
+        self._next_id += 1
+        for task, module in enumerate(modules):
+            key = f"{job_id}_{task}" if array else job_id
+            self.jobs[key] = {"module": module, "state": "PENDING", "any": list(any_of),
+                              "deps": deps + [f"{c}_{task}" for c in corr]}
+        return job_id
+
+    def _keys(self, job_id: str) -> List[str]:
+        """Job ids behind a dependency: the job itself, or every task of an array."""
+        return [job_id] if job_id in self.jobs else [
+            key for key in self.jobs if key.startswith(f"{job_id}_")
+        ]
+
+    def submit_all(self) -> str:
+        """Run the staged bundle's submit_all.sh: one job per jobs.txt line."""
+        bundle = self.workdir / "bundle"
+        if (bundle / "cas").is_dir():
+            self.stored.update(p.name for p in (bundle / "cas").iterdir())
+        ids = dict(re.findall(r"\[(\S+?)\]=(\S+)", (bundle / "submit_all.sh").read_text()))
+        out = []
+        for line in (bundle / "jobs.txt").read_text().splitlines():
+            name, script, deps = (line.split(" ") + [""])[:3]
+            after, corr, any_of = [], [], []
+            for token in filter(None, deps.split(",")):
+                job, sep, task = token.lstrip("~").rpartition("@")
+                if token.startswith("+"):
+                    any_of.append(ids[token[1:].partition("/")[0]])
+                elif token.startswith("~"):
+                    corr.append(ids[task])
+                elif sep:
+                    after.append(f"{ids[job]}_{task}")
+                else:
+                    # afterok on an array waits for all of its tasks
+                    after.extend(self._keys(ids[task]))
+            tasks = bundle / f"{name}.tasks"
+            array = tasks.is_file()
+            modules = ([line.split("\t")[0] for line in tasks.read_text().splitlines()]
+                       if array else [name])
+            self._count("sbatch")
+            ids[name] = self.submit(modules, after, corr, array, any_of)
+            out.append(f"{name} {ids[name]}\n")
+        return "".join(out)
+
+    def state(self, job_id: str) -> str:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return "UNKNOWN"
+        if job["state"] == "PENDING":
+            deps = [self.jobs[d]["state"] for d in job["deps"] if d in self.jobs]
+            ended = all(self.state(d) != "PENDING" for d in job["any"] if d in self.jobs)
+            if ended and all(state == "COMPLETED" for state in deps):
+                job["state"] = "FAILED" if job["module"] in self.fail else "COMPLETED"
+        return job["state"]
+
+    def _reason(self, job_id: str) -> str:
+        if any(self.jobs[d]["state"] in ("FAILED", "CANCELLED")
+               for d in self.jobs[job_id]["deps"] if d in self.jobs):
+            return "DependencyNeverSatisfied"
+        return "None"
+
+    def run(self, cmd: str) -> Tuple[int, str, str]:
+        """Answer one shell command as the cluster's login node would."""
+        self._count("ssh")
+        argv = shlex.split(cmd.split("&&")[-1])
+        self._count(argv[0])
+        if argv[-1] == "submit_all.sh":
+            return 0, self.submit_all(), ""
+        if argv[0] == "ls":
+            return 0, "".join(f"{key}\n" for key in argv[2:] if key in self.stored), ""
+        if argv[0] == "scancel":
+            for job_id in argv[1:]:
+                for key in self._keys(job_id):
+                    if self.jobs[key]["state"] == "PENDING":
+                        self.jobs[key]["state"] = "CANCELLED"
+            return 0, "", ""
+        if argv[0] in ("squeue", "sacct"):
+            states = {job_id: self.state(job_id)
+                      for job_id in argv[argv.index("-j") + 1].split(",")}
+            if argv[0] == "squeue":
+                return 0, "".join(f"{job_id} {state} {self._reason(job_id)}\n"
+                                  for job_id, state in states.items() if state == "PENDING"), ""
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+            return 0, "".join(
+                f"{job_id}|{state}|{stamp}|{stamp}|{stamp}|00:00.000|00:00.000|\n"
+                for job_id, state in states.items() if state != "UNKNOWN"
+            ), ""
+        return 0, "", ""
+
+
+class FakeSlurmBackend(RemoteBackend):
+    """RemoteBackend whose SSH session is a FakeSlurm."""
+
+    def __init__(self, workdir: Path, on_event=None, fail: Sequence[str] = ()):
+        config = Path(workdir) / "fake_slurm_config.json"
+        Path(workdir).mkdir(parents=True, exist_ok=True)
+        config.write_text(json.dumps({
+            "remote": {"remote_workdir": "/fake/nexa_run"},
+            "execution": {"poll_interval": 0, "max_wait_time": 3600},
+        }))
+        super().__init__(workdir=workdir, remotehost="fake-slurm",
+                         config_file=str(config), on_event=on_event)
+        self.slurm = self.session = FakeSlurm(self.workdir, fail)
+
+
+# ── measurement ───────────────────────────────────────────────────────────────
+
+def _summary(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(shape: str, n: int, backend: str, root: str, seed: int = 0,
+             cpus: Optional[int] = None) -> Dict[str, Any]:
+    """Generate, plan and run one benchmark case; returns its measurements."""
+    root = Path(root)
+    wf_path = generate_workflow(shape, n, root / "workflow", seed)
+
+    t0 = time.perf_counter()
+    workflow = Workflow.from_file(wf_path, registry=ModuleRegistry(cache_file=None))
+    t1 = time.perf_counter()
+    levels = workflow.index.levels
+    t2 = time.perf_counter()
+
+    case: Dict[str, Any] = {
+        "shape": shape, "modules": n, "edges": len(workflow.connections),
+        "levels": len(levels), "backend": backend,
+        "load_s": t1 - t0, "index_s": t2 - t1, "plan_s": t2 - t0,
+    }
+
+    events: List[Tuple[float, str, str]] = []
+
+    def on_event(event: str, module_id: str, data: Dict[str, Any]) -> None:
+        events.append((time.perf_counter(), event, module_id))
+
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if backend == "nextflow":
+            script = NextflowBackend(root / "run")._generate_nextflow(workflow)
+            case["script_bytes"] = len(script)
+            result = None
+        elif backend == "local":
+            runner = LocalBackend(root / "run", on_event=on_event, cpus=cpus)
+            result = runner.execute(workflow)
+        elif backend == "remote":
+            runner = FakeSlurmBackend(root / "run", on_event=on_event)
+            result = runner.execute(workflow)
+            case["remote_calls"] = dict(runner.slurm.calls)
+        else:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from: {list(BACKENDS)}")
+        end = time.perf_counter()
+
+    case["makespan_s"] = end - start
+    if result is not None:
+        case["status"] = result.status
+    case["dispatch_latency_s"] = _summary(_dispatch_latencies(workflow, backend, start, events))
+    case["peak_rss_mb"] = _peak_rss_mb()
+    return case
+
+
+def _dispatch_latencies(workflow: Workflow, backend: str, start: float,
+                        events: List[Tuple[float, str, str]]) -> List[float]:
+    started = {mid: t for t, event, mid in events if event == "module_start"}
+    if backend == "remote":
+        # everything is submitted upfront: time spent submitting each job
+        times = [start] + sorted(started.values())
+        return [b - a for a, b in zip(times, times[1:])]
+    # local: from the moment the last upstream module finished to the start
+    completed = {mid: t for t, event, mid in events if event == "module_complete"}
+    latencies = []
+    for mid, t in started.items():
+        upstream = workflow.index.upstream_ids(mid)
+        ready = max((completed[u] for u in upstream), default=start)
+        latencies.append(t - ready)
+    return latencies
+
+
+def _run_case_isolated(args: Tuple) -> Dict[str, Any]:
+    return run_case(*args)
+
+
+def run_suite(shapes: Sequence[str] = SHAPES, sizes: Sequence[int] = (10, 100, 1000),
+              backends: Sequence[str] = BACKENDS, seed: int = 0,
+              cpus: Optional[int] = None, workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run every (shape, size, backend) case, each in a fresh interpreter."""
+    for shape in shapes:
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown shape '{shape}'. Choose from: {list(SHAPES)}")
+    for backend in backends:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}'. Choose from: {list(BACKENDS)}")
+
+    base = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="nexa_bench_"))
+    ctx = multiprocessing.get_context("spawn")
+    cases = []
+    for shape in shapes:
+        for n in sizes:
+            for backend in backends:
+                root = base / f"{shape}_{n}_{backend}"
+                with ctx.Pool(1) as pool:
+                    case = pool.apply(_run_case_isolated,
+                                      ((shape, n, backend, str(root), seed, cpus),))
+                print(f"{shape:>8} {n:>7} {backend:>8}: plan {case['plan_s']:.3f}s  "
+                      f"makespan {case['makespan_s']:.3f}s  rss {case['peak_rss_mb']:.0f}MB")
+                cases.append(case)
+
+    return {
+        "nexa_version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": seed,
+        "cases": cases,
+    }
+
+
+def _version() -> str:
+    try:
+        from importlib.metadata import version
+        return version("nexa")
+    except Exception:
+        return "unknown"
@@ -1,29 +1,192 @@
 # nexa/cli.py
 import argparse
+import json
+import sys
+import time
 from pathlib import Path
+from .core.plan import PLAN_SUFFIX, ExecutionPlan
 from .executor import UnifiedExecutor
 from .utils.banner import print_banner
 
+def compile_main(argv):
+    parser = argparse.ArgumentParser(
+        prog="nexa compile", description="Compile a workflow into a reusable execution plan")
+    parser.add_argument("workflow", help="Path to workflow JSON")
+    parser.add_argument("-o", "--output",
+                        help=f"Plan file to write (default: <workflow>{PLAN_SUFFIX})")
+    args = parser.parse_args(argv)
+
+    wf_path = Path(args.workflow).resolve()
+    out_path = Path(args.output) if args.output else wf_path.with_suffix(PLAN_SUFFIX)
+    plan = ExecutionPlan.compile(wf_path)
+    plan.save(out_path)
+    print(f"Compiled {len(plan.modules)} modules, {len(plan.index.levels)} levels -> {out_path}")
+
+def bench_main(argv):
+    from .bench import BACKENDS, SHAPES, run_suite
+
+    parser = argparse.ArgumentParser(
+        prog="nexa bench", description="Measure orchestration overhead on synthetic workflows")
+    parser.add_argument("--shapes", default=",".join(SHAPES),
+                        help=f"Comma-separated workflow shapes (default: {','.join(SHAPES)})")
+    parser.add_argument("--sizes", default="10,100,1000",
+                        help="Comma-separated module counts (default: 10,100,1000)")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help=f"Comma-separated backends (default: {','.join(BACKENDS)})")
+    parser.add_argument("--cpus", type=int,
+                        help="Cores for the local backend (default: auto-detect)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for random DAGs")
+    parser.add_argument("--workdir",
+                        help="Where to generate workflows and runs (default: a temp dir)")
+    parser.add_argument("-o", "--output", default="nexa_bench.json", help="Results JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        shapes=[s for s in args.shapes.split(",") if s],
+        sizes=[int(n) for n in args.sizes.split(",") if n],
+        backends=[b for b in args.backends.split(",") if b],
+        seed=args.seed, cpus=args.cpus, workdir=args.workdir,
+    )
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Results written to {args.output}")
+
+def history_main(argv):
+    from .core.history import DEFAULT_HISTORY_FILE, RunHistory
+
+    parser = argparse.ArgumentParser(prog="nexa history",
+                                     description="Show recorded module runs")
+    parser.add_argument("module", nargs="?", help="Only runs of this module id")
+    parser.add_argument("--workflow", help="Only runs of this workflow id")
+    parser.add_argument("--status", choices=["success", "failed"],
+                        help="Only runs with this status")
+    parser.add_argument("--backend", choices=["local", "nextflow", "remote"],
+                        help="Only runs on this backend")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Most recent runs to show (default: 20)")
+    parser.add_argument("--stats", action="store_true",
+                        help="Per-module aggregates instead of runs")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    parser.add_argument("--db", default=str(DEFAULT_HISTORY_FILE),
+                        help=f"History database (default: {DEFAULT_HISTORY_FILE})")
+    parser.add_argument("--clear", action="store_true", help="Delete every recorded run")
+    args = parser.parse_args(argv)
+
+    history = RunHistory(Path(args.db))
+    if args.clear:
+        history.clear()
+        print(f"Cleared {args.db}")
+        return
+    if args.stats:
+        rows = history.stats(module_id=args.module, workflow_id=args.workflow)
+        columns = [("module_id", "MODULE", str), ("runs", "RUNS", str),
+                   ("failures", "FAILED", str), ("mean_wall_time", "MEAN WALL", _seconds),
+                   ("max_wall_time", "MAX WALL", _seconds),
+                   ("mean_cpu_time", "MEAN CPU", _seconds), ("max_rss", "MAX RSS", _bytes)]
+    else:
+        rows = history.runs(module_id=args.module, workflow_id=args.workflow,
+                            status=args.status, backend=args.backend, limit=args.limit)
+        columns = [("recorded", "WHEN", _when), ("workflow_id", "WORKFLOW", str),
+                   ("module_id", "MODULE", str), ("backend", "BACKEND", str),
+                   ("status", "STATUS", str), ("wall_time", "WALL", _seconds),
+                   ("queue_time", "QUEUE", _seconds), ("user_cpu", "USER", _seconds),
+                   ("sys_cpu", "SYS", _seconds), ("max_rss", "MAX RSS", _bytes),
+                   ("input_bytes", "INPUTS", _bytes)]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print("No recorded runs.")
+        return
+    table = [[title for _, title, _ in columns]]
+    table += [[fmt(row[key]) if row[key] is not None else "-" for key, _, fmt in columns]
+              for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for line in table:
+        print("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip())
+
+def _seconds(value):
+    return f"{value:.2f}s"
+
+def _bytes(value):
+    for unit in ("B", "K", "M", "G"):
+        if value < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}T"
+
+def _when(value):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+
 def main():
     print_banner()
+    if sys.argv[1:2] == ["compile"]:
+        compile_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["bench"]:
+        bench_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["history"]:
+        history_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser()
-    parser.add_argument("workflow", help="Path to workflow or simulation JSON")
+    parser.add_argument("workflow", help=f"Path to workflow JSON or compiled plan ({PLAN_SUFFIX})")
     parser.add_argument("--simulation", help="Path to simulation JSON (optional)")
+    parser.add_argument("--sweep",
+                        help="Path to a sweep JSON (parameter grid or list of parameter sets)")
     parser.add_argument("--backend", choices=["local", "nextflow", "remote"], default="local")
     parser.add_argument("--workdir", default="nexa_run")
     parser.add_argument("--remotehost", help="Remote host for SLURM execution (e.g., ariadne)")
     parser.add_argument("--config", help="Path to nexa_config.json for remote/advanced settings")
+    parser.add_argument("--cpus", type=int,
+                        help="Cores available to local modules (default: auto-detect)")
+    parser.add_argument("--mem",
+                        help="Memory available to local modules, e.g. 64G (default: auto-detect)")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse outputs of unchanged module runs (local backend)")
+    parser.add_argument("--cache-dir", help="Output cache directory (default: ~/.nexa/cache)")
+    parser.add_argument("--cache-size", default="10G",
+                        help="Maximum output cache size (default: 10G)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run in --workdir using its journal")
+    parser.add_argument("--warm-workers", type=int,
+                        help="Run Python modules in N pre-forked warm workers (local backend)")
+    parser.add_argument("--preload", default="",
+                        help="Comma-separated modules to import once into warm workers, "
+                             "e.g. numpy,rdkit")
+    parser.add_argument("--schedule", choices=["critical-path", "fifo"], default="critical-path",
+                        help="Order in which ready modules get free slots (local backend)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Do not record this run in or predict from ~/.nexa/history.db")
+    parser.add_argument("--no-fail-fast", action="store_true",
+                        help="After a failure, let running modules finish "
+                             "instead of terminating them (local backend)")
+    parser.add_argument("--trace", metavar="OUT.json",
+                        help="Write a Chrome/Perfetto trace of the run's timeline")
     args = parser.parse_args()
 
     wf_path = Path(args.workflow).resolve()
     sim_path = Path(args.simulation).resolve() if args.simulation else None
 
-    executor = UnifiedExecutor(str(wf_path), str(sim_path) if sim_path else None)
+    executor = UnifiedExecutor(str(wf_path), str(sim_path) if sim_path else None,
+                               sweep=args.sweep)
     executor.run(
         backend=args.backend,
         workdir=args.workdir,
         remotehost=args.remotehost,
-        config_file=args.config
+        config_file=args.config,
+        cpus=args.cpus,
+        mem=args.mem,
+        cache=args.cache,
+        cache_dir=args.cache_dir,
+        cache_size=args.cache_size,
+        resume=args.resume,
+        warm_workers=args.warm_workers,
+        preload=[m.strip() for m in args.preload.split(",") if m.strip()],
+        schedule=args.schedule,
+        trace=args.trace,
+        history=not args.no_history,
+        fail_fast=not args.no_fail_fast,
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+Content-addressed module output cache.
+
+A module run is keyed on everything that can change its outputs: the script
+contents, the executable, the merged parameters and the content of every
+input port file. On a hit the cached output directory is copied back into
+``outputs/<module_id>/`` and no subprocess is started.
+
+Entries live under ``<root>/<key>/`` next to an ``index.json`` recording each
+entry's size and last use; once the store grows past ``max_size`` the least
+recently used entries are evicted.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..utils.hashing import hash_file, hash_port
+from ..utils.resources import parse_mem
+
+
+class OutputCache:
+    """Size-bounded, LRU-evicted store of module output directories."""
+
+    def __init__(self, root: Path = None, max_size="10G"):
+        self.root = Path(root) if root else Path.home() / ".nexa" / "cache"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_size = parse_mem(max_size)
+        self._index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._script_hashes: Dict[Path, str] = {}
+
+    # ── keys ─────────────────────────────────────────────────────────────────
+
+    def preload_script_hashes(self, hashes: Dict[Path, str]) -> None:
+        """Reuse script hashes computed ahead of time (e.g. by a compiled plan)."""
+        self._script_hashes.update(hashes)
+
+    def key(self, module, params: dict, inputs: Dict[str, Path]) -> Optional[str]:
+        """Cache key for one module run, or None if the module has no script."""
+        script_path = module.get_script_path()
+        if script_path is None:
+            return None
+        if script_path not in self._script_hashes:
+            self._script_hashes[script_path] = hash_file(script_path)
+
+        h = hashlib.sha256()
+        h.update(self._script_hashes[script_path].encode())
+        h.update(b"\0" + module.executable.encode())
+        h.update(b"\0" + json.dumps(params, sort_keys=True, default=str).encode())
+        for port in sorted(inputs):
+            h.update(f"\0{port}={hash_port(inputs[port])}".encode())
+        return h.hexdigest()
+
+    # ── index ────────────────────────────────────────────────────────────────
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self, index: Dict[str, dict]) -> None:
+        tmp = self._index_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self._index_path)
+
+    # ── lookup / store ───────────────────────────────────────────────────────
+
+    def restore(self, key: str, out_dir: Path) -> bool:
+        """Copy a cached entry into ``out_dir``. Returns False on a miss."""
+        entry = self.root / key
+        with self._lock:
+            index = self._read_index()
+            if key not in index or not entry.is_dir():
+                return False
+            index[key]["atime"] = time.time()
+            self._write_index(index)
+
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        shutil.copytree(entry, out_dir)
+        return True
+
+    def store(self, key: str, out_dir: Path) -> None:
+        """Add a module's output directory to the cache and evict if over size."""
+        entry = self.root / key
+        if entry.exists() or not out_dir.is_dir():
+            return
+        tmp = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        shutil.copytree(out_dir, tmp)
+        size = sum(p.stat().st_size for p in tmp.rglob("*") if p.is_file())
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Another run stored the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        with self._lock:
+            index = self._read_index()
+            index[key] = {"size": size, "atime": time.time()}
+            self._evict(index)
+            self._write_index(index)
+
+    def _evict(self, index: Dict[str, dict]) -> None:
+        total = sum(e["size"] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]["atime"]):
+            if total <= self.max_size:
+                break
+            total -= index.pop(key)["size"]
+            shutil.rmtree(self.root / key, ignore_errors=True)
@@ -0,0 +1,127 @@
+"""
+Precomputed adjacency index of a workflow's module graph.
+
+Workflow JSON stores its edges as a flat ``connections`` list, so answering
+"what feeds module X" by scanning it is O(connections) per module and
+quadratic over a whole run. WorkflowIndex walks the list once: modules get
+dense integer ids, port names are interned, incoming/outgoing edges and
+de-duplicated upstream/downstream neighbours are stored per module, and the
+topological order and parallel levels are computed up front. Lookups by module
+id are then O(degree).
+
+Build it through ``Workflow.index``, which does so lazily and caches it.
+"""
+import sys
+from collections import deque
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+
+class Edge(NamedTuple):
+    """One connection, with module ids as integer indices into WorkflowIndex.ids."""
+    src: int
+    output: str
+    dst: int
+    input: str
+
+
+class WorkflowIndex:
+    """Adjacency lists, topological order and levels of one workflow."""
+
+    def __init__(self, module_ids: Sequence[str], connections: Sequence[Dict]):
+        self.ids: List[str] = [sys.intern(mid) for mid in module_ids]
+        self.id_of: Dict[str, int] = {mid: i for i, mid in enumerate(self.ids)}
+
+        n = len(self.ids)
+        incoming: List[List[Edge]] = [[] for _ in range(n)]
+        outgoing: List[List[Edge]] = [[] for _ in range(n)]
+        for conn in connections:
+            edge = Edge(
+                self._lookup(conn["from"]["module"]),
+                sys.intern(conn["from"]["output"]),
+                self._lookup(conn["to"]["module"]),
+                sys.intern(conn["to"]["input"]),
+            )
+            incoming[edge.dst].append(edge)
+            outgoing[edge.src].append(edge)
+        self.incoming: List[Tuple[Edge, ...]] = [tuple(e) for e in incoming]
+        self.outgoing: List[Tuple[Edge, ...]] = [tuple(e) for e in outgoing]
+        self.upstream: List[Tuple[int, ...]] = [
+            tuple(dict.fromkeys(e.src for e in edges)) for edges in self.incoming
+        ]
+        self.downstream: List[Tuple[int, ...]] = [
+            tuple(dict.fromkeys(e.dst for e in edges)) for edges in self.outgoing
+        ]
+
+        self.order: Tuple[int, ...] = self._topological_order()
+        self.level: List[int] = [0] * n
+        for i in self.order:
+            if self.upstream[i]:
+                self.level[i] = 1 + max(self.level[u] for u in self.upstream[i])
+        levels: List[List[str]] = [[] for _ in range(max(self.level, default=-1) + 1)]
+        for i in self.order:
+            levels[self.level[i]].append(self.ids[i])
+        self.levels: List[List[str]] = levels
+        self.order_ids: List[str] = [self.ids[i] for i in self.order]
+
+    def _lookup(self, mod_id: str) -> int:
+        try:
+            return self.id_of[mod_id]
+        except KeyError:
+            raise ValueError(f"Connection references unknown module '{mod_id}'") from None
+
+    def _topological_order(self) -> Tuple[int, ...]:
+        # Kahn's algorithm over edges in declaration order
+        in_degree = [len(edges) for edges in self.incoming]
+        queue = deque(i for i, deg in enumerate(in_degree) if deg == 0)
+        order: List[int] = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for edge in self.outgoing[node]:
+                in_degree[edge.dst] -= 1
+                if in_degree[edge.dst] == 0:
+                    queue.append(edge.dst)
+        if len(order) != len(self.ids):
+            raise ValueError("Workflow contains a cycle!")
+        return tuple(order)
+
+    # ── lookups by module id ──────────────────────────────────────────────────
+
+    def inputs(self, mod_id: str) -> List[Tuple[str, str, str]]:
+        """``(input_port, src_module, src_output)`` for every edge into a module."""
+        ids = self.ids
+        return [(e.input, ids[e.src], e.output) for e in self.incoming[self.id_of[mod_id]]]
+
+    def upstream_ids(self, mod_id: str) -> List[str]:
+        """Distinct modules a module depends on."""
+        return [self.ids[u] for u in self.upstream[self.id_of[mod_id]]]
+
+    def downstream_ids(self, mod_id: str) -> List[str]:
+        """Distinct modules that depend on a module."""
+        return [self.ids[d] for d in self.downstream[self.id_of[mod_id]]]
+
+    def descendant_ids(self, mod_id: str) -> List[str]:
+        """Every module downstream of a module, directly or transitively, in topological order."""
+        seen = set()
+        stack = list(self.downstream[self.id_of[mod_id]])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(self.downstream[node])
+        return [self.ids[i] for i in self.order if i in seen]
+
+    # ── path lengths ──────────────────────────────────────────────────────────
+
+    def bottom_levels(self, weights: Dict[str, float], default: float = 1.0) -> Dict[str, float]:
+        """Longest weighted path from each module to a sink, the module included.
+
+        ``weights`` maps module ids to their (estimated) cost; modules missing
+        from it cost ``default``. The module with the largest bottom level heads
+        the critical path.
+        """
+        cost = [weights.get(mid, default) for mid in self.ids]
+        bottom = [0.0] * len(self.ids)
+        for i in reversed(self.order):
+            bottom[i] = cost[i] + max((bottom[d] for d in self.downstream[i]), default=0.0)
+        return {mid: bottom[i] for i, mid in enumerate(self.ids)}
@@ -0,0 +1,248 @@
+"""
+Run history: what every module run cost, kept across runs.
+
+After each workflow run the executor appends one row per executed module to
+an embedded SQLite database (``~/.nexa/history.db`` by default): module and
+workflow id, script and parameter hashes, total size of its input files,
+backend, exit status, wall and queue time, user/system CPU time and peak RSS.
+Cached, resumed and skipped modules are not recorded; they did no work.
+
+The history is what later runs learn from. ``estimate`` summarises the past
+runs of a module (preferring runs of the same script) into a mean runtime and
+a peak memory, which the local scheduler uses for critical-path priorities
+and RemoteBackend can turn into SLURM ``--time`` / ``--mem`` requests.
+``nexa history`` queries it from the command line.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.hashing import hash_file, port_files
+
+DEFAULT_HISTORY_FILE = Path.home() / ".nexa" / "history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS module_runs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id       TEXT NOT NULL,
+    recorded     REAL NOT NULL,
+    workflow_id  TEXT NOT NULL,
+    module_id    TEXT NOT NULL,
+    script_hash  TEXT,
+    params_hash  TEXT,
+    input_bytes  INTEGER,
+    backend      TEXT,
+    status       TEXT NOT NULL,
+    returncode   INTEGER,
+    start_time   REAL,
+    end_time     REAL,
+    wall_time    REAL,
+    queue_time   REAL,
+    user_cpu     REAL,
+    sys_cpu      REAL,
+    max_rss      INTEGER
+);
+CREATE INDEX IF NOT EXISTS module_runs_module ON module_runs (module_id, script_hash);
+CREATE INDEX IF NOT EXISTS module_runs_workflow ON module_runs (workflow_id);
+"""
+
+_COLUMNS = ("run_id", "recorded", "workflow_id", "module_id", "script_hash", "params_hash",
+            "input_bytes", "backend", "status", "returncode", "start_time", "end_time",
+            "wall_time", "queue_time", "user_cpu", "sys_cpu", "max_rss")
+
+
+@dataclass
+class Estimate:
+    """What past successful runs of a module cost."""
+    runs: int
+    wall_time: Optional[float]   # mean seconds
+    max_wall_time: Optional[float]
+    max_rss: Optional[int]       # largest peak RSS seen, bytes
+
+
+class RunHistory:
+    """SQLite store of per-module run records."""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_HISTORY_FILE):
+        self.path = Path(path) if path else DEFAULT_HISTORY_FILE
+        self._initialised = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialised:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialised:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialised = True
+        return conn
+
+    # ── writing ──────────────────────────────────────────────────────────────
+
+    def record(self, workflow, result, backend: str, parameters: dict = None,
+               script_hashes: Dict[Path, str] = None) -> int:
+        """Append one row per executed module of a finished run; returns the row count.
+
+        ``script_hashes`` may supply hashes computed ahead of time (e.g. by a
+        compiled plan).
+        """
+        run_id = uuid.uuid4().hex
+        now = time.time()
+        hashes = dict(script_hashes or {})
+        rows = []
+        for mid, res in result.modules.items():
+            if (res.metrics is None or res.cached or res.resumed or res.status == "skipped"
+                    or mid not in workflow.module_map):
+                continue
+            module = workflow.module_map[mid]
+            script = module.get_script_path()
+            if script is not None and script not in hashes:
+                hashes[script] = hash_file(script) if script.exists() else None
+            metrics = res.metrics
+            rows.append((
+                run_id, now, workflow.workflow_id, mid,
+                hashes.get(script) if script is not None else None,
+                params_hash(module.merged_parameters(parameters)),
+                _input_bytes(workflow, mid, result),
+                backend, res.status, res.returncode,
+                metrics.start_time, metrics.end_time, metrics.wall_time, metrics.queue_time,
+                metrics.user_cpu, metrics.sys_cpu, metrics.max_rss,
+            ))
+        if rows:
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    f"INSERT INTO module_runs ({', '.join(_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    rows,
+                )
+        return len(rows)
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def runs(self, module_id: str = None, workflow_id: str = None, status: str = None,
+             backend: str = None, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """Most recent run records first, optionally filtered."""
+        where, args = _filters(module_id=module_id, workflow_id=workflow_id,
+                               status=status, backend=backend)
+        sql = f"SELECT * FROM module_runs{where} ORDER BY id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, args)]
+
+    def stats(self, module_id: str = None, workflow_id: str = None) -> List[Dict[str, Any]]:
+        """Per-module aggregates: run and failure counts, mean/max wall time, peak RSS."""
+        where, args = _filters(module_id=module_id, workflow_id=workflow_id)
+        sql = (
+            "SELECT module_id, COUNT(*) AS runs, "
+            "SUM(status != 'success') AS failures, "
+            "AVG(wall_time) AS mean_wall_time, MAX(wall_time) AS max_wall_time, "
+            "AVG(user_cpu + sys_cpu) AS mean_cpu_time, MAX(max_rss) AS max_rss, "
+            "MAX(recorded) AS last_run "
+            f"FROM module_runs{where} GROUP BY module_id ORDER BY module_id"
+        )
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, args)]
+
+    def estimate(self, module_id: str, script_hash: str = None) -> Optional[Estimate]:
+        """Cost of a module from its past successful runs, None if it never ran.
+
+        Runs of the same script are preferred; if the script changed since,
+        all runs of the module id are used.
+        """
+        return _pick(self._groups(module_id).get(module_id, {}), script_hash)
+
+    def estimates(self, workflow) -> Dict[str, Estimate]:
+        """Estimates for every module of a workflow that has run before.
+
+        An unreadable history yields no estimates (with a warning) rather
+        than failing the run that asked.
+        """
+        try:
+            groups = self._groups()
+        except (OSError, sqlite3.Error) as exc:
+            # e.g. a read-only or missing home directory on a compute node
+            print(f"Warning: run history {self.path} unavailable: {exc}")
+            return {}
+        found: Dict[str, Estimate] = {}
+        hashes: Dict[Path, Optional[str]] = {}
+        for module in workflow.modules:
+            if module.id not in groups:
+                continue
+            script = module.get_script_path()
+            if script is not None and script not in hashes:
+                hashes[script] = hash_file(script) if script.exists() else None
+            found[module.id] = _pick(groups[module.id], hashes.get(script))
+        return found
+
+    def _groups(self, module_id: str = None) -> Dict[str, Dict[Optional[str], tuple]]:
+        """{module_id: {script_hash: (runs, total wall, max wall, max rss)}} of successful runs."""
+        where, args = _filters(module_id=module_id, status="success")
+        sql = (
+            "SELECT module_id, script_hash, COUNT(wall_time), SUM(wall_time), "
+            f"MAX(wall_time), MAX(max_rss) FROM module_runs{where} "
+            "GROUP BY module_id, script_hash"
+        )
+        groups: Dict[str, Dict[Optional[str], tuple]] = {}
+        with closing(self._connect()) as conn:
+            for mid, script_hash, *agg in conn.execute(sql, args):
+                groups.setdefault(mid, {})[script_hash] = tuple(agg)
+        return groups
+
+    def clear(self) -> None:
+        """Delete every record."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM module_runs")
+
+
+def params_hash(params: dict) -> str:
+    """Stable hash of a module's merged parameters."""
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _filters(**equal) -> tuple:
+    clauses = [f"{column} = ?" for column, value in equal.items() if value is not None]
+    args = [value for value in equal.values() if value is not None]
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+
+def _pick(groups: Dict[Optional[str], tuple], script_hash: Optional[str]) -> Optional[Estimate]:
+    """Estimate from the runs of ``script_hash`` if there are any, else from all runs."""
+    chosen = [groups[script_hash]] if script_hash in groups else list(groups.values())
+    if not chosen:
+        return None
+    runs = sum(g[0] for g in chosen)
+    walls = [g[2] for g in chosen if g[2] is not None]
+    rss = [g[3] for g in chosen if g[3] is not None]
+    return Estimate(
+        runs=runs,
+        wall_time=sum(g[1] for g in chosen if g[1] is not None) / runs if runs else None,
+        max_wall_time=max(walls, default=None),
+        max_rss=max(rss, default=None),
+    )
+
+
+def _input_bytes(workflow, mid: str, result) -> Optional[int]:
+    """Total size of the files a module read on its input ports."""
+    total = 0
+    for _, src, output in workflow.index.inputs(mid):
+        src_result = result.modules.get(src)
+        path = src_result.outputs.get(output) if src_result else None
+        if path is None:
+            return None
+        total += sum(_size(f) for f in port_files(Path(path)))
+    return total
+
+
+def _size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
@@ -0,0 +1,132 @@
+"""
+Append-only run journal for crash recovery.
+
+Backends append one JSON line per state change to ``<workdir>/journal.jsonl``:
+the run header, module start, SLURM submission, completion (with output content
+hashes) and failure. Every line is flushed and fsync'ed, so whatever was written
+before a node reboot, Ctrl-C or walltime kill survives it. ``--resume`` replays
+the journal to find the modules whose outputs are still intact.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.hashing import hash_port
+
+
+class RunJournal:
+    """Append-only JSON-lines record of a workflow run."""
+
+    FILENAME = "journal.jsonl"
+
+    def __init__(self, workdir: Path):
+        self.path = Path(workdir) / self.FILENAME
+        self._lock = threading.Lock()
+
+    # ── writing ──────────────────────────────────────────────────────────────
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        record["ts"] = time.time()
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self.path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def begin(self, workflow_id: str, resume: bool = False, **data) -> None:
+        """Start a fresh journal (or continue the existing one when resuming)."""
+        if not resume and self.path.exists():
+            self.path.unlink()
+        self._append({"event": "run", "workflow_id": workflow_id, "resume": resume, **data})
+
+    def module_start(self, module_id: str) -> None:
+        self._append({"event": "start", "module": module_id})
+
+    def module_submitted(self, module_id: str, job_id: str, **data) -> None:
+        self._append({"event": "submitted", "module": module_id, "job_id": job_id, **data})
+
+    def module_complete(self, module_id: str, outputs: Dict[str, str]) -> None:
+        hashes = {port: hash_port(Path(path)) for port, path in outputs.items()}
+        self._append({"event": "complete", "module": module_id,
+                      "outputs": outputs, "hashes": hashes})
+
+    def module_failed(self, module_id: str, error: str = "") -> None:
+        self._append({"event": "failed", "module": module_id, "error": error})
+
+    # ── reading ──────────────────────────────────────────────────────────────
+
+    def load(self) -> Dict[str, Any]:
+        """Replay the journal.
+
+        Returns ``{"run": <first run header>, "modules": {module_id: record}}``
+        where each module maps to its most recent record. A truncated final
+        line (crash mid-write) is ignored.
+        """
+        state: Dict[str, Any] = {"run": None, "modules": {}}
+        if not self.path.exists():
+            return state
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if rec.get("event") == "run":
+                    state["run"] = state["run"] or rec
+                elif "module" in rec:
+                    prev = state["modules"].get(rec["module"], {})
+                    # keep the job id of a submission across later records
+                    if "job_id" in prev and "job_id" not in rec:
+                        rec["job_id"] = prev["job_id"]
+                    state["modules"][rec["module"]] = rec
+        return state
+
+    def module_durations(self) -> Dict[str, float]:
+        """Seconds from start to completion of each module that completed.
+
+        Read it before ``begin`` starts a fresh journal to learn how long the
+        modules of the previous run in this workdir took.
+        """
+        started: Dict[str, float] = {}
+        durations: Dict[str, float] = {}
+        if not self.path.exists():
+            return durations
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if rec.get("event") == "start":
+                    started[rec["module"]] = rec["ts"]
+                elif rec.get("event") == "complete" and rec["module"] in started:
+                    durations[rec["module"]] = rec["ts"] - started.pop(rec["module"])
+        return durations
+
+    def completed_modules(self, workflow, state: Optional[Dict[str, Any]] = None
+                          ) -> Dict[str, Dict[str, str]]:
+        """Modules that can be reused on resume: {module_id: outputs}.
+
+        A module qualifies if its last record is a completion, its output files
+        still hash to the journaled values, and every upstream module qualifies
+        as well (otherwise its inputs are about to change).
+        """
+        state = state if state is not None else self.load()
+        index = workflow.index
+        reusable: Dict[str, Dict[str, str]] = {}
+        for mid in index.order_ids:
+            rec = state["modules"].get(mid)
+            if not rec or rec["event"] != "complete":
+                continue
+            if not all(dep in reusable for dep in index.upstream_ids(mid)):
+                continue
+            intact = all(
+                hash_port(Path(path)) == rec["hashes"].get(port)
+                for port, path in rec["outputs"].items()
+            )
+            if intact:
+                reusable[mid] = rec["outputs"]
+        return reusable
@@ -25,6 +25,8 @@ class Module:
         parameters: Dict[str, Any] = None,
         base_path: Path = None,
         resources: Dict[str, Any] = None,
+        mode: str = "process",
+        data_files: List[str] = None,
     ):
         """
         Initialize a module.
@@ -51,6 +53,14 @@ class Module:
             Per-module SLURM resource requirements, e.g.
             {"cpus": 4, "mem": "16G", "time": "02:00:00", "partition": "gpu"}.
             Overrides the global SLURM config in RemoteBackend for this module.
+        mode : str
+            "process" (default): one process per invocation.
+            "server": started once with ``--serve`` and sent invocations as
+            line-delimited JSON on stdin (local execution only).
+        data_files : list of str, optional
+            Files the script reads from next to itself, relative to base_path
+            and below the script's directory. RemoteBackend stages them with
+            the script.
         """
         self.id = id
         self.executable = executable
@@ -61,6 +71,10 @@ class Module:
         self.parameters = parameters or {}
         self.base_path = base_path or Path(".")
         self.resources: Dict[str, Any] = resources or {}
+        if mode not in ("process", "server"):
+            raise ValueError(f"Module '{id}': unknown mode '{mode}'")
+        self.mode = mode
+        self.data_files: List[str] = data_files or []
 
     @classmethod
     def load(cls, filepath: Path) -> "Module":
@@ -72,16 +86,60 @@ class Module:
         """
         with open(filepath) as f:
             data = json.load(f)
+        return cls.from_dict(data, base_path=filepath.parent)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base_path: Path = None,
+                  id: str = None) -> "Module":
+        """
+        Build a module from a parsed JSON definition.
+
+        ``id`` overrides the definition's own id, so one definition can back
+        several workflow entries. Mutable fields are copied, so the parsed
+        definition can be shared.
+        """
         return cls(
-            id=data["id"],
+            id=id or data["id"],
             executable=data.get("executable", "python"),
             script=data.get("script"),
             container=data.get("container"),
-            input_ports=data.get("input_ports", []),
-            output_ports=data.get("output_ports", []),
-            parameters=data.get("parameters", {}),
-            base_path=filepath.parent,
-            resources=data.get("resources", {}),
+            input_ports=list(data.get("input_ports", [])),
+            output_ports=list(data.get("output_ports", [])),
+            parameters=dict(data.get("parameters", {})),
+            base_path=base_path,
+            resources=dict(data.get("resources", {})),
+            mode=data.get("mode", "process"),
+            data_files=list(data.get("data_files", [])),
+        )
+
+    def merged_parameters(self, overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return this module's parameters with simulation-level overrides applied.
+
+        An override is applied only if the module already declares that
+        parameter, so a global parameter set can be shared by all modules.
+        """
+        params = dict(self.parameters)
+        if overrides:
+            for k, v in overrides.items():
+                if k in params:
+                    params[k] = v
+        return params
+
+    def clone(self, id: str = None, parameters: Dict[str, Any] = None) -> "Module":
+        """Return a copy of this module, optionally renamed and re-parameterised."""
+        return Module(
+            id=id or self.id,
+            executable=self.executable,
+            script=self.script,
+            container=self.container,
+            input_ports=list(self.input_ports),
+            output_ports=list(self.output_ports),
+            parameters=dict(self.parameters if parameters is None else parameters),
+            base_path=self.base_path,
+            resources=dict(self.resources),
+            mode=self.mode,
+            data_files=list(self.data_files),
         )
 
     def get_script_path(self) -> Optional[Path]:
@@ -111,4 +169,6 @@ class Module:
             "output_ports": self.output_ports,
             "parameters": self.parameters,
             "resources": self.resources,
+            "mode": self.mode,
+            "data_files": self.data_files,
         }
@@ -0,0 +1,126 @@
+"""
+Compiled execution plans.
+
+``nexa compile workflow.json -o plan.nxp`` does the work every launch would
+otherwise repeat before the first module starts: it loads the module
+definitions, resolves script paths to absolute paths, hashes the scripts and
+builds the graph index (topological order, levels and port bindings). The
+result is pickled, zlib-compressed and written behind a short magic header.
+
+A plan records the modification time and size of every file it was built
+from: the workflow JSON, each module definition, each script and each
+module's ``data_files``. Loading a plan whose sources have changed since it
+was compiled falls back to the source workflow with a warning, so a stale
+plan is slow but never wrong.
+"""
+import os
+import pickle
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .graph import WorkflowIndex
+from .module import Module
+from .workflow import Workflow
+from ..utils.hashing import hash_file
+
+PLAN_SUFFIX = ".nxp"
+_MAGIC = b"NXPLAN"
+_VERSION = 2   # 2: Module.data_files
+
+# (st_mtime_ns, st_size), or None for a file that did not exist
+Stamp = Optional[Tuple[int, int]]
+
+
+def _stamp(path: Path) -> Stamp:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class ExecutionPlan:
+    """A workflow with its modules, script hashes and index resolved ahead of time."""
+
+    def __init__(self, workflow_file: Path, data: dict, base_dir: Path, modules: List[Module],
+                 index: WorkflowIndex, script_hashes: Dict[Path, str],
+                 sources: Dict[str, Stamp], created: float = None):
+        self.workflow_file = workflow_file
+        self.data = data
+        self.base_dir = base_dir
+        self.modules = modules
+        self.index = index
+        self.script_hashes = script_hashes
+        self.sources = sources
+        self.created = created or time.time()
+
+    @classmethod
+    def compile(cls, workflow_file: Path) -> "ExecutionPlan":
+        """Resolve everything a launch of ``workflow_file`` needs."""
+        workflow_file = Path(workflow_file).resolve()
+        sources: Dict[str, Stamp] = {str(workflow_file): _stamp(workflow_file)}
+        workflow = Workflow.from_file(workflow_file)
+
+        for entry in workflow.data.get("modules", []):
+            ref = (workflow.base_dir / entry["ref"]).resolve()
+            sources.setdefault(str(ref), _stamp(ref))
+
+        modules: List[Module] = []
+        script_hashes: Dict[Path, str] = {}
+        for module in workflow.modules:
+            module = module.clone()
+            script_path = module.get_script_path()
+            if script_path is not None:
+                module.script = str(script_path)
+                if script_path not in script_hashes:
+                    sources[str(script_path)] = _stamp(script_path)
+                    script_hashes[script_path] = hash_file(script_path)
+            for name in module.data_files:
+                data_file = (module.base_path / name).resolve()
+                sources.setdefault(str(data_file), _stamp(data_file))
+            modules.append(module)
+
+        return cls(workflow_file, workflow.data, workflow.base_dir, modules,
+                   workflow.index, script_hashes, sources)
+
+    def save(self, path: Path) -> None:
+        payload = zlib.compress(pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp = Path(f"{path}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC + bytes([_VERSION]) + payload)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ExecutionPlan":
+        with open(path, "rb") as f:
+            raw = f.read()
+        header = raw[:len(_MAGIC) + 1]
+        if header[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a compiled nexa plan")
+        if header[-1] != _VERSION:
+            raise ValueError(
+                f"{path} was compiled by a different nexa version (plan format "
+                f"{header[-1]}, expected {_VERSION}); recompile it with 'nexa compile'"
+            )
+        plan = cls.__new__(cls)
+        plan.__dict__.update(pickle.loads(zlib.decompress(raw[len(header):])))
+        return plan
+
+    def stale_sources(self) -> List[str]:
+        """Source files changed, created or removed since the plan was compiled."""
+        return [path for path, stamp in self.sources.items() if _stamp(Path(path)) != stamp]
+
+    def is_current(self) -> bool:
+        """True if no source changed since compilation; warns otherwise."""
+        stale = self.stale_sources()
+        if stale:
+            print(f"Warning: compiled plan is out of date ({len(stale)} source files changed, "
+                  f"e.g. {stale[0]}); loading {self.workflow_file} instead. "
+                  f"Re-run 'nexa compile' to refresh it.")
+        return not stale
+
+    def workflow(self) -> Workflow:
+        return Workflow(self.data, base_dir=self.base_dir, modules=self.modules,
+                        index=self.index)
@@ -0,0 +1,167 @@
+"""
+Registry of parsed module definitions.
+
+Generated workflows reference the same few module JSON files thousands of
+times. ModuleRegistry parses each definition file once: parsed definitions
+are keyed on the file's resolved path and validated against its modification
+time and size, so an edited file is picked up while an unchanged one is never
+re-read. Definitions are kept in memory for the life of the process and in an
+on-disk pickle (``~/.nexa/module_defs.pickle`` by default) for the next one.
+The pickle keeps at most ``max_entries`` definitions, the most recently used,
+and drops those whose file no longer exists (temporary workdirs, bench runs).
+When a workflow is loaded, repeated refs are resolved once and the definitions
+missing from both caches are parsed in parallel.
+"""
+import json
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .module import Module
+
+DEFAULT_CACHE_FILE = Path.home() / ".nexa" / "module_defs.pickle"
+
+# (st_mtime_ns, st_size) of a definition file when it was parsed
+Stamp = Tuple[int, int]
+
+# Definitions kept in the disk cache
+MAX_ENTRIES = 2000
+
+
+class ModuleRegistry:
+    """Process- and disk-cached parsed module definitions."""
+
+    def __init__(self, cache_file: Optional[Path] = DEFAULT_CACHE_FILE, max_workers: int = 8,
+                 max_entries: int = MAX_ENTRIES):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.max_workers = max_workers
+        self.max_entries = max_entries
+        # least recently used first
+        self._defs: Dict[str, Tuple[Stamp, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._disk_loaded = False
+        self._dirty = False
+
+    def load(self, path: Path, id: str = None) -> Module:
+        """Load one module definition; ``id`` overrides the definition's id."""
+        return self.load_many([(path, id)])[0]
+
+    def load_many(self, refs: Sequence[Tuple[Union[str, Path], Optional[str]]],
+                  base_dir: Path = None) -> List[Module]:
+        """Build one Module per ``(definition path, id override)``, in order.
+
+        Relative paths are taken relative to ``base_dir``. Each distinct path
+        is resolved and parsed once, however often it is referenced.
+        """
+        base_dir = Path(base_dir or ".")
+        resolved: Dict[Union[str, Path], Tuple[str, Path]] = {}
+        for ref, _ in refs:
+            if ref not in resolved:
+                path = (base_dir / ref).resolve()
+                resolved[ref] = (str(path), path.parent)
+        defs = self.definitions(list(dict.fromkeys(key for key, _ in resolved.values())))
+        modules = []
+        for ref, mid in refs:
+            key, parent = resolved[ref]
+            modules.append(Module.from_dict(defs[key], base_path=parent, id=mid))
+        return modules
+
+    def definitions(self, paths: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Parsed definitions for resolved paths, reading only stale or unseen files."""
+        self._load_disk_cache()
+        result: Dict[str, Dict[str, Any]] = {}
+        cold: List[Tuple[str, Stamp]] = []
+        for path in paths:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._defs.get(path)
+            if cached and cached[0] == stamp:
+                result[path] = cached[1]
+                with self._lock:
+                    self._defs[path] = self._defs.pop(path, cached)   # most recently used
+            else:
+                cold.append((path, stamp))
+
+        if cold:
+            workers = min(self.max_workers, len(cold))
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    parsed = list(pool.map(_parse, (path for path, _ in cold)))
+            else:
+                parsed = [_parse(path) for path, _ in cold]
+            with self._lock:
+                for (path, stamp), data in zip(cold, parsed):
+                    self._defs.pop(path, None)
+                    self._defs[path] = (stamp, data)
+                    result[path] = data
+                self._dirty = True
+            self.save()
+        return result
+
+    def _load_disk_cache(self) -> None:
+        with self._lock:
+            if self._disk_loaded:
+                return
+            self._disk_loaded = True
+            if not self.cache_file or not self.cache_file.exists():
+                return
+            try:
+                with open(self.cache_file, "rb") as f:
+                    stored = pickle.load(f)
+            except Exception:
+                # unreadable or from an incompatible version: start afresh
+                return
+            if isinstance(stored, dict):
+                # stored least recently used first, ahead of anything parsed meanwhile
+                self._defs = {**stored, **self._defs}
+
+    def save(self) -> None:
+        """Write the definitions to the disk cache if anything new was parsed.
+
+        Only the ``max_entries`` most recently used definitions whose files
+        still exist are written.
+        """
+        if not self.cache_file:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            recent = list(self._defs.items())[-self.max_entries:] if self.max_entries > 0 else []
+            self._dirty = False
+        snapshot = {path: entry for path, entry in recent if os.path.exists(path)}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            # the disk cache is an optimisation; a read-only home is fine
+            pass
+
+    def clear(self) -> None:
+        """Forget every cached definition, in memory and on disk."""
+        with self._lock:
+            self._defs.clear()
+            self._dirty = False
+        if self.cache_file and self.cache_file.exists():
+            self.cache_file.unlink()
+
+
+def _parse(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+_default: Optional[ModuleRegistry] = None
+
+
+def default_registry() -> ModuleRegistry:
+    """The process-wide registry used by Workflow unless one is passed in."""
+    global _default
+    if _default is None:
+        _default = ModuleRegistry()
+    return _default
@@ -0,0 +1,122 @@
+"""
+Parameter sweeps: expand one workflow over many parameter sets into a single
+execution graph.
+
+A sweep is given either as a grid (the cartesian product of per-parameter value
+lists) or as an explicit list of parameter sets:
+
+    {"grid": {"temperature": [298.15, 323.15], "solvent_type": ["water", "ethanol"]}}
+    {"points": [{"temperature": 298.15}, {"temperature": 350.0, "pressure": 2.0}]}
+
+Each sweep point is overlaid on the simulation parameters. A module instance is
+identified by its module id, its effective (merged) parameters and the
+instances feeding its inputs, so modules that see the same parameters and the
+same inputs at several sweep points become one shared node in the expanded
+graph and are computed once.
+"""
+import hashlib
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from .workflow import Workflow
+
+
+def load_sweep_points(spec: Union[str, Path, dict, list]) -> List[Dict[str, Any]]:
+    """Turn a sweep specification (or a JSON file containing one) into a list of points."""
+    if isinstance(spec, (str, Path)):
+        with open(spec) as f:
+            spec = json.load(f)
+        if isinstance(spec, dict) and "sweep" in spec:
+            spec = spec["sweep"]
+
+    if isinstance(spec, list):
+        points = spec
+    elif "grid" in spec:
+        grid = spec["grid"]
+        names = list(grid)
+        points = [dict(zip(names, values))
+                  for values in itertools.product(*(grid[n] for n in names))]
+    elif "points" in spec:
+        points = spec["points"]
+    else:
+        raise ValueError(
+            "Sweep must be a list of parameter sets, or a dict with 'grid' or 'points'"
+        )
+
+    if not points:
+        raise ValueError("Sweep contains no points")
+    return [dict(p) for p in points]
+
+
+def expand_sweep(workflow: Workflow, parameters: Dict[str, Any],
+                 points: List[Dict[str, Any]]) -> Tuple[Workflow, List[Dict[str, Any]]]:
+    """Expand ``workflow`` over sweep ``points``.
+
+    Returns the expanded workflow and one manifest entry per point:
+    ``{"index", "parameters", "modules": {module_id: instance_id}}``.
+    Effective parameters are baked into each instance, so the expanded
+    workflow is executed with no further parameter overrides. A module with a
+    single distinct instance keeps its id; otherwise instances are named
+    ``<module_id>__<n>``.
+    """
+    index = workflow.index
+    order = index.order_ids
+    incoming = {mid: index.inputs(mid) for mid in order}
+
+    # Pass 1: content key of every (module, point)
+    keys: List[Dict[str, str]] = []
+    effective: Dict[str, Dict[str, Any]] = {}       # key -> merged parameters
+    instance_keys: Dict[str, List[str]] = {mid: [] for mid in order}
+    for point in points:
+        overrides = {**(parameters or {}), **point}
+        point_keys: Dict[str, str] = {}
+        for mid in order:
+            params = workflow.module_map[mid].merged_parameters(overrides)
+            upstream = sorted(
+                (port, point_keys[src], output) for port, src, output in incoming[mid]
+            )
+            key = hashlib.sha256(json.dumps(
+                [mid, params, upstream], sort_keys=True, default=str
+            ).encode()).hexdigest()
+            point_keys[mid] = key
+            if key not in effective:
+                effective[key] = params
+                instance_keys[mid].append(key)
+        keys.append(point_keys)
+
+    # Pass 2: name instances and build the expanded graph
+    names: Dict[str, str] = {}
+    modules = []
+    for mid in order:
+        shared = len(instance_keys[mid]) == 1
+        for n, key in enumerate(instance_keys[mid]):
+            names[key] = mid if shared else f"{mid}__{n}"
+            modules.append(workflow.module_map[mid].clone(names[key], effective[key]))
+
+    connections: List[Dict] = []
+    seen = set()
+    for point_keys in keys:
+        for mid in order:
+            for port, src_mod, output in incoming[mid]:
+                src = names[point_keys[src_mod]]
+                dst = names[point_keys[mid]]
+                edge = (src, output, dst, port)
+                if edge not in seen:
+                    seen.add(edge)
+                    connections.append({
+                        "from": {"module": src, "output": output},
+                        "to": {"module": dst, "input": port},
+                    })
+
+    data = dict(workflow.data, connections=connections,
+                modules=[{"id": m.id} for m in modules])
+    expanded = Workflow(data, base_dir=workflow.base_dir, modules=modules)
+
+    manifest = [
+        {"index": i, "parameters": point,
+         "modules": {mid: names[point_keys[mid]] for mid in order}}
+        for i, (point, point_keys) in enumerate(zip(points, keys))
+    ]
+    return expanded, manifest
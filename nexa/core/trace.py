@@ -0,0 +1,238 @@
+"""
+Chrome Trace Event export of a workflow run (``nexa --trace out.json``).
+
+TraceRecorder is an ``on_module_event`` callback: it collects the metrics and
+phase timestamps backends attach to "module_complete" / "module_failed"
+events and, once the run is over, writes them as a Chrome Trace Event file
+that opens in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Each module contributes up to four spans:
+
+- queue    ready (or submitted to SLURM) until staging or execution begins
+- staging  local: cache lookup, params file and command line;
+           remote: params upload and sbatch
+- exec     the module process itself
+- sync     local: storing outputs in the output cache;
+           remote: rsync of the module's outputs
+
+SLURM jobs get one track each, named after the job id. Local runs get one
+track per worker slot: spans are packed onto the lowest slot that is free at
+the time, so the number of tracks is the run's peak concurrency, and time
+spent in the ready queue is drawn on a separate "ready queue" track. A flow
+arrow follows every workflow connection from the end of the producing module
+to the start of the consuming one. Cached and resumed modules appear as
+instant markers on the orchestrator track.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .workflow import Workflow
+
+# pid of each group of tracks in the trace file
+_PID_ORCHESTRATOR = 0
+_PID_WORKERS = 1
+_PID_QUEUE = 2
+
+_PHASES = ("queue", "staging", "exec", "sync")
+
+
+class TraceRecorder:
+    """Collects module events and writes them as a Chrome Trace Event file."""
+
+    def __init__(self, workflow: Workflow, on_event=None):
+        self.workflow = workflow
+        self._forward = on_event
+        self._lock = threading.Lock()
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self._marks: List[Tuple[float, str, str]] = []  # (time, module_id, label)
+
+    def __call__(self, event: str, module_id: str, data: Dict[str, Any]) -> None:
+        if event in ("module_complete", "module_failed"):
+            with self._lock:
+                if data.get("cached") or data.get("resumed"):
+                    label = "cached" if data.get("cached") else "resumed"
+                    self._marks.append((time.time(), module_id, label))
+                elif data.get("metrics"):
+                    self._modules[module_id] = {
+                        "status": "success" if event == "module_complete" else "failed",
+                        "metrics": data["metrics"],
+                        "phases": data.get("phases", {}),
+                        "job_id": data.get("job_id"),
+                    }
+        if self._forward:
+            self._forward(event, module_id, data)
+
+    def add_result(self, result) -> None:
+        """Take metrics from a WorkflowResult for modules no event reported.
+
+        Backends that fire no per-module events (nextflow) still get a trace.
+        """
+        with self._lock:
+            for mid, res in result.modules.items():
+                if mid not in self._modules and res.metrics is not None:
+                    self._modules[mid] = {
+                        "status": res.status, "metrics": res.metrics.to_dict(),
+                        "phases": {}, "job_id": None,
+                    }
+
+    # ── spans ────────────────────────────────────────────────────────────────
+
+    def _spans(self, mid: str) -> Dict[str, Tuple[float, float]]:
+        """Phase -> (start, end) in epoch seconds for one recorded module."""
+        rec = self._modules[mid]
+        metrics, phases = rec["metrics"], rec["phases"]
+        spans: Dict[str, Tuple[float, float]] = {}
+        start, end = metrics.get("start_time"), metrics.get("end_time")
+        if start and end:
+            spans["exec"] = (start, end)
+        for name in ("staging", "sync"):
+            if phases.get(name):
+                spans[name] = tuple(phases[name])
+        submit = metrics.get("submit_time")
+        if submit:
+            # locally, staging follows the queue; on SLURM it precedes submission
+            queue_end = spans["staging"][0] if "staging" in spans and not rec["job_id"] else start
+            if queue_end and queue_end >= submit:
+                spans["queue"] = (submit, queue_end)
+        return spans
+
+    def _worker_slots(self, spans: Dict[str, Dict[str, Tuple[float, float]]]) -> Dict[str, int]:
+        """Pack local modules onto the lowest free slot (queue time excluded)."""
+        busy: List[float] = []   # slot -> time it becomes free
+        slots: Dict[str, int] = {}
+        windows = []
+        for mid, phases in spans.items():
+            worked = [s for name, s in phases.items() if name != "queue"]
+            if worked and not self._modules[mid]["job_id"]:
+                windows.append((min(s[0] for s in worked), max(s[1] for s in worked), mid))
+        for begin, finish, mid in sorted(windows):
+            slot = next((i for i, free in enumerate(busy) if free <= begin), len(busy))
+            if slot == len(busy):
+                busy.append(finish)
+            else:
+                busy[slot] = finish
+            slots[mid] = slot
+        return slots
+
+    # ── output ───────────────────────────────────────────────────────────────
+
+    def events(self) -> List[Dict[str, Any]]:
+        """The trace as a list of Chrome Trace Event dicts."""
+        with self._lock:
+            spans = {mid: self._spans(mid) for mid in self._modules}
+            marks = list(self._marks)
+        slots = self._worker_slots(spans)
+        times = [t for phases in spans.values() for s in phases.values() for t in s]
+        times += [t for t, _, _ in marks]
+        origin = min(times, default=0.0)
+
+        def us(t: float) -> float:
+            return round((t - origin) * 1e6, 3)
+
+        events: List[Dict[str, Any]] = [
+            _meta("process_name", _PID_ORCHESTRATOR, 0, name=f"nexa {self.workflow.workflow_id}"),
+            _meta("process_name", _PID_WORKERS, 0, name="workers"),
+            _meta("thread_name", _PID_ORCHESTRATOR, 0, name="orchestrator"),
+        ]
+        if slots:
+            events.append(_meta("process_name", _PID_QUEUE, 0, name="ready queue"))
+
+        tracks: Dict[str, int] = {}   # module_id -> tid on _PID_WORKERS
+        job_tids: Dict[str, int] = {}
+        named = set()
+        for mid, phases in spans.items():
+            job_id = self._modules[mid]["job_id"]
+            if not phases:
+                continue   # nothing measured, e.g. a job cancelled before it started
+            if job_id:
+                tid = job_tids.setdefault(job_id, 1000 + len(job_tids))
+                name = f"job {job_id} ({mid})"
+            elif mid in slots:
+                tid = slots[mid] + 1
+                name = f"slot {slots[mid]}"
+            else:
+                continue
+            if tid not in named:
+                named.add(tid)
+                events.append(_meta("thread_name", _PID_WORKERS, tid, name=name))
+                events.append(_meta("thread_sort_index", _PID_WORKERS, tid, sort_index=tid))
+            tracks[mid] = tid
+
+        for mid, phases in spans.items():
+            rec = self._modules[mid]
+            args = {"status": rec["status"], **{k: v for k, v in rec["metrics"].items()
+                                                 if v is not None}}
+            if rec["job_id"]:
+                args["job_id"] = rec["job_id"]
+            for name in _PHASES:
+                if name not in phases:
+                    continue
+                begin, finish = phases[name]
+                if name == "queue" and not rec["job_id"]:
+                    # local ready-queue wait: async span, laid out by the viewer
+                    events.append({"name": mid, "cat": "queue", "ph": "b", "id": mid,
+                                   "pid": _PID_QUEUE, "tid": 0, "ts": us(begin)})
+                    events.append({"name": mid, "cat": "queue", "ph": "e", "id": mid,
+                                   "pid": _PID_QUEUE, "tid": 0, "ts": us(finish)})
+                    continue
+                if mid not in tracks:
+                    continue
+                events.append({
+                    "name": mid if name == "exec" else f"{mid} [{name}]", "cat": name,
+                    "ph": "X", "pid": _PID_WORKERS, "tid": tracks[mid],
+                    "ts": us(begin), "dur": round(us(finish) - us(begin), 3),
+                    "args": args if name == "exec" else {},
+                })
+
+        for t, mid, label in marks:
+            events.append({"name": f"{mid} ({label})", "cat": label, "ph": "i", "s": "t",
+                           "pid": _PID_ORCHESTRATOR, "tid": 0, "ts": us(t)})
+
+        events.extend(self._flows(spans, tracks, us))
+        return events
+
+    def _flows(self, spans, tracks: Dict[str, int], us) -> List[Dict[str, Any]]:
+        """One arrow per connected (producer, consumer) pair of recorded modules."""
+        flows: List[Dict[str, Any]] = []
+        pairs = dict.fromkeys(
+            (c["from"]["module"], c["to"]["module"]) for c in self.workflow.connections
+        )
+        for n, (src, dst) in enumerate(pairs):
+            if src not in tracks or dst not in tracks:
+                continue
+            produced = _flow_slice(spans[src], last=True)
+            if self._modules[dst]["job_id"] and "exec" in spans[dst]:
+                # a SLURM job is released by its dependencies after it was staged
+                consumed = spans[dst]["exec"]
+            else:
+                consumed = _flow_slice(spans[dst], last=False)
+            if produced is None or consumed is None:
+                continue
+            common = {"name": "data", "cat": "flow", "id": n, "pid": _PID_WORKERS}
+            flows.append({**common, "ph": "s", "tid": tracks[src], "ts": us(produced[0])})
+            flows.append({**common, "ph": "f", "bp": "e", "tid": tracks[dst],
+                          "ts": us(consumed[0])})
+        return flows
+
+    def write(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(
+            {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+        ))
+
+
+def _flow_slice(phases: Dict[str, Tuple[float, float]],
+                last: bool) -> Optional[Tuple[float, float]]:
+    """Execution span of a module, else its last (or first) non-queue span; None if none."""
+    if last and "exec" in phases:
+        return phases["exec"]
+    worked = [s for name, s in phases.items() if name != "queue"]
+    if not worked:
+        return None
+    return max(worked, key=lambda s: s[1]) if last else min(worked, key=lambda s: s[0])
+
+
+def _meta(kind: str, pid: int, tid: int, **args) -> Dict[str, Any]:
+    return {"name": kind, "ph": "M", "pid": pid, "tid": tid, "args": args}
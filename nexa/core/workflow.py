@@ -5,7 +5,9 @@ Workflow model: loads and validates concrete workflow JSON.
 import json
 from pathlib import Path
 from typing import List, Dict, Any
+from .graph import WorkflowIndex
 from .module import Module
+from .registry import ModuleRegistry, default_registry
 
 
 class Workflow:
@@ -14,7 +16,20 @@ class Workflow:
     Contains modules and connections.
     """
 
-    def __init__(self, data: Dict[str, Any], base_dir: Path = None):
+    def __init__(self, data: Dict[str, Any], base_dir: Path = None,
+                 modules: List[Module] = None, registry: ModuleRegistry = None,
+                 index: WorkflowIndex = None):
+        """
+        Build a workflow from its JSON data.
+
+        ``modules`` may be given to use already-constructed Module objects
+        (e.g. the expanded instances of a parameter sweep) instead of loading
+        each ``ref`` in ``data["modules"]``. Refs are loaded through
+        ``registry`` (the process-wide default if not given), which parses
+        each distinct definition file once. An entry's ``id`` names the
+        module in the workflow, so several entries may share one ``ref``.
+        A precomputed ``index`` (from a compiled plan) is used as is.
+        """
         self.data = data
         self.base_dir = base_dir or Path(".")
 
@@ -23,51 +38,47 @@ class Workflow:
         self.indicator: str = data.get("indicator", "")
         self.accuracy: str = data.get("accuracy", "")
 
-        self.modules: List[Module] = []
-        for mod in data.get("modules", []):
-            mod_path = self.base_dir / mod["ref"]
-            self.modules.append(Module.load(mod_path))
+        if modules is not None:
+            self.modules: List[Module] = list(modules)
+        else:
+            registry = registry or default_registry()
+            self.modules = registry.load_many(
+                [(mod["ref"], mod.get("id")) for mod in data.get("modules", [])],
+                base_dir=self.base_dir,
+            )
 
         self.connections: List[Dict] = data.get("connections", [])
 
         # Build module map for fast lookup
         self.module_map = {m.id: m for m in self.modules}
+        if len(self.module_map) != len(self.modules):
+            seen = set()
+            dup = next(m.id for m in self.modules if m.id in seen or seen.add(m.id))
+            raise ValueError(f"Duplicate module id '{dup}' in workflow")
+        self._index: WorkflowIndex = index
 
     @classmethod
-    def from_file(cls, filepath: Path) -> "Workflow":
+    def from_file(cls, filepath: Path, registry: ModuleRegistry = None) -> "Workflow":
         """Load workflow from JSON file."""
         with open(filepath) as f:
             data = json.load(f)
-        return cls(data, base_dir=filepath.parent)
+        return cls(data, base_dir=filepath.parent, registry=registry)
+
+    @property
+    def index(self) -> WorkflowIndex:
+        """
+        Adjacency index of the module graph, built on first use.
+
+        The workflow's modules and connections are treated as fixed once the
+        index exists.
+        """
+        if self._index is None:
+            self._index = WorkflowIndex([m.id for m in self.modules], self.connections)
+        return self._index
 
     def get_execution_order(self) -> List[str]:
         """
         Return module IDs in topological order using Kahn's algorithm.
-        Assumes DAG.
+        Raises ValueError if the workflow contains a cycle.
         """
-        from collections import defaultdict, deque
-
-        in_degree = {m.id: 0 for m in self.modules}
-        graph = defaultdict(list)
-
-        for conn in self.connections:
-            src = conn["from"]["module"]
-            dst = conn["to"]["module"]
-            graph[src].append(dst)
-            in_degree[dst] += 1
-
-        queue = deque([mod_id for mod_id, deg in in_degree.items() if deg == 0])
-        order = []
-
-        while queue:
-            node = queue.popleft()
-            order.append(node)
-            for neighbor in graph[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
-
-        if len(order) != len(self.modules):
-            raise ValueError("Workflow contains a cycle!")
-
-        return order
+        return list(self.index.order_ids)
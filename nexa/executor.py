@@ -3,16 +3,32 @@
 Unified workflow executor: routes to the appropriate backend and returns a
 structured WorkflowResult. Callers can optionally register a per-module event
 callback to receive real-time status updates without parsing stdout.
+
+A parameter sweep (``sweep`` argument, or a "sweep" block in the simulation
+file) is expanded into one combined execution graph before it reaches the
+backend; see nexa.core.sweep.
+
+``workflow_file`` may also be a plan compiled with ``nexa compile``
+(``.nxp``); see nexa.core.plan.
 """
+import asyncio
 import json
+import sqlite3
 from pathlib import Path
-from typing import Callable, Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Union
 
+from .core.cache import OutputCache
+from .core.history import RunHistory
+from .core.plan import PLAN_SUFFIX, ExecutionPlan
+from .core.sweep import expand_sweep, load_sweep_points
+from .core.trace import TraceRecorder
 from .core.workflow import Workflow
+from .backends.async_local import AsyncLocalBackend
 from .backends.local import LocalBackend
 from .backends.nextflow import NextflowBackend
 from .backends.remote import RemoteBackend
-from .backends.base import WorkflowResult
+from .backends.worker_pool import WarmWorkerPool
+from .backends.base import BaseBackend, WorkflowResult
 
 
 class UnifiedExecutor:
@@ -24,18 +40,45 @@ class UnifiedExecutor:
         "remote": RemoteBackend,
     }
 
-    def __init__(self, workflow_file: str, simulation_file: str = None):
+    def __init__(self, workflow_file: str, simulation_file: str = None,
+                 sweep: Union[str, dict, list] = None):
         self.workflow_file = Path(workflow_file)
         self.simulation_file = Path(simulation_file) if simulation_file else None
-        self.workflow = Workflow.from_file(self.workflow_file)
+        self.plan: Optional[ExecutionPlan] = None
+        if self.workflow_file.suffix == PLAN_SUFFIX:
+            # a stale plan falls back to its source workflow
+            plan = ExecutionPlan.load(self.workflow_file)
+            self.workflow_file = plan.workflow_file
+            if plan.is_current():
+                self.plan = plan
+                self.workflow = plan.workflow()
+            else:
+                self.workflow = Workflow.from_file(self.workflow_file)
+        else:
+            self.workflow = Workflow.from_file(self.workflow_file)
         self.parameters = self._load_parameters()
 
-    def _load_parameters(self) -> Dict[str, Any]:
+        # Sweep manifest: one {"index", "parameters", "modules"} entry per point,
+        # mapping each original module id to the instance that serves it.
+        self.sweep_points: Optional[List[Dict[str, Any]]] = None
+        sweep = sweep if sweep is not None else self._load_simulation().get("sweep")
+        if sweep is not None:
+            points = load_sweep_points(sweep)
+            self.workflow, self.sweep_points = expand_sweep(
+                self.workflow, self.parameters, points
+            )
+            # effective parameters are baked into the expanded module instances
+            self.parameters = {}
+            print(f"Sweep: {len(points)} points -> {len(self.workflow.modules)} module instances")
+
+    def _load_simulation(self) -> Dict[str, Any]:
         if not self.simulation_file or not self.simulation_file.exists():
             return {}
         with open(self.simulation_file) as f:
-            sim = json.load(f)
-        return sim.get("parameters", {})
+            return json.load(f)
+
+    def _load_parameters(self) -> Dict[str, Any]:
+        return self._load_simulation().get("parameters", {})
 
     def run(
         self,
@@ -44,6 +87,18 @@ class UnifiedExecutor:
         remotehost: str = None,
         config_file: str = None,
         on_module_event: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+        cpus: Optional[int] = None,
+        mem: Optional[str] = None,
+        cache: bool = False,
+        cache_dir: str = None,
+        cache_size: str = "10G",
+        resume: bool = False,
+        warm_workers: Optional[int] = None,
+        preload: Optional[List[str]] = None,
+        schedule: str = "critical-path",
+        trace: Optional[str] = None,
+        history: bool = True,
+        fail_fast: bool = True,
     ) -> WorkflowResult:
         """Execute the workflow and return a WorkflowResult.
 
@@ -59,34 +114,180 @@ class UnifiedExecutor:
             Path to nexa_config.json with SLURM / remote parameters.
         on_module_event : callable, optional
             Callback ``fn(event_type, module_id, data)`` fired at:
-            - "module_start"    when a module begins execution
+            - "module_start"    when a module begins execution (remote: is submitted)
+            - "module_running"  when a submitted SLURM job starts running (remote only)
             - "module_complete" when a module finishes successfully
-            - "module_failed"   when a module fails
+            - "module_failed"   when a module fails, or is cancelled after
+                                another module failed (``"skipped": True``)
+            - "module_output"   for each stdout/stderr line (run_async only)
+        cpus : int, optional
+            Local backend only: total cores modules may use at once
+            (default: auto-detected).
+        mem : str, optional
+            Local backend only: total memory modules may use at once,
+            e.g. "64G" (default: auto-detected physical memory).
+        cache : bool
+            Local backend only: reuse outputs of module runs whose script,
+            executable, parameters and inputs are unchanged.
+        cache_dir : str, optional
+            Output cache location (default: ~/.nexa/cache).
+        cache_size : str
+            Maximum cache size before least recently used entries are evicted.
+        resume : bool
+            Continue an interrupted run in the same workdir: modules recorded
+            as complete in its journal (with intact outputs) are not re-run,
+            and on the remote backend live SLURM jobs are reattached.
+        warm_workers : int, optional
+            Local backend only: run Python modules in this many pre-forked
+            warm workers instead of a fresh interpreter per module.
+        preload : list of str, optional
+            Modules imported once into the warm workers (e.g. ["numpy", "rdkit"]).
+        schedule : str
+            Local backend only: order in which ready modules get free slots,
+            "critical-path" (longest estimated remaining path first) or "fifo".
+        trace : str, optional
+            Write a Chrome Trace Event file of the run's timeline here
+            (open it in Perfetto); see nexa.core.trace.
+        history : bool
+            Record every executed module in the run history
+            (``~/.nexa/history.db``) and use past runs to estimate runtimes
+            and memory; see nexa.core.history.
+        fail_fast : bool
+            Local backend only: when a module fails, terminate the modules
+            still running instead of waiting for them. (The remote backend
+            always cancels just the jobs downstream of a failure, which can
+            never run.)
+        """
+        recorder = TraceRecorder(self.workflow, on_module_event) if trace else None
+        run_history = RunHistory() if history else None
+        runner = self._make_runner(
+            backend, workdir=workdir, remotehost=remotehost, config_file=config_file,
+            on_module_event=recorder or on_module_event, cpus=cpus, mem=mem, cache=cache,
+            cache_dir=cache_dir, cache_size=cache_size, resume=resume,
+            warm_workers=warm_workers, preload=preload, schedule=schedule,
+            history=run_history, fail_fast=fail_fast,
+        )
+        try:
+            result = runner.execute(self.workflow, self.parameters)
+        finally:
+            self._close_runner(runner)
+        return self._finish_run(runner, result, backend, run_history, recorder, trace)
+
+    async def run_async(self, backend: str = "local", **kwargs) -> WorkflowResult:
+        """Execute the workflow from inside a running asyncio event loop.
+
+        Takes the same arguments as run(). The local backend runs on
+        AsyncLocalBackend (asyncio subprocesses, no thread per module) and
+        additionally streams every stdout/stderr line as a "module_output"
+        event with ``{"stream": "stdout" | "stderr", "line": str}``. Other
+        backends run in the loop's default executor so the loop stays free.
         """
+        trace = kwargs.pop("trace", None)
+        recorder = TraceRecorder(self.workflow, kwargs.get("on_module_event")) if trace else None
+        if recorder:
+            kwargs["on_module_event"] = recorder
+        run_history = RunHistory() if kwargs.pop("history", True) else None
+        runner = self._make_runner(backend, asynchronous=True, history=run_history, **kwargs)
+        try:
+            if isinstance(runner, AsyncLocalBackend):
+                result = await runner.execute_async(self.workflow, self.parameters)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    None, runner.execute, self.workflow, self.parameters
+                )
+        finally:
+            self._close_runner(runner)
+        return self._finish_run(runner, result, backend, run_history, recorder, trace)
+
+    def _make_runner(
+        self,
+        backend: str,
+        workdir: str = None,
+        remotehost: str = None,
+        config_file: str = None,
+        on_module_event: Optional[Callable[[str, str, Dict[str, Any]], None]] = None,
+        cpus: Optional[int] = None,
+        mem: Optional[str] = None,
+        cache: bool = False,
+        cache_dir: str = None,
+        cache_size: str = "10G",
+        resume: bool = False,
+        warm_workers: Optional[int] = None,
+        preload: Optional[List[str]] = None,
+        schedule: str = "critical-path",
+        history: Optional[RunHistory] = None,
+        fail_fast: bool = True,
+        asynchronous: bool = False,
+    ) -> BaseBackend:
         if backend not in self.BACKENDS:
             raise ValueError(
                 f"Unsupported backend '{backend}'. "
                 f"Choose from: {list(self.BACKENDS)}"
             )
 
+        if self.sweep_points is not None and backend == "nextflow":
+            raise ValueError("Parameter sweeps are not supported by the nextflow backend")
+
         backend_cls = self.BACKENDS[backend]
         workdir_path = Path(workdir) if workdir else None
 
         if backend == "remote":
             if not remotehost:
                 raise ValueError("--remotehost is required for remote backend")
-            runner = backend_cls(
+            return backend_cls(
                 workdir=workdir_path,
                 remotehost=remotehost,
                 config_file=config_file,
                 on_event=on_module_event,
+                resume=resume,
+                history=history,
             )
-        elif backend == "local":
-            runner = backend_cls(workdir=workdir_path, on_event=on_module_event)
-        else:
-            runner = backend_cls(workdir=workdir_path)
+        if backend == "local":
+            if asynchronous:
+                backend_cls = AsyncLocalBackend
+            output_cache = OutputCache(cache_dir, cache_size) if cache else None
+            if output_cache and self.plan:
+                output_cache.preload_script_hashes(self.plan.script_hashes)
+            return backend_cls(
+                workdir=workdir_path, on_event=on_module_event, cpus=cpus, mem=mem,
+                cache=output_cache,
+                resume=resume,
+                warm_pool=WarmWorkerPool(warm_workers, preload or []) if warm_workers else None,
+                schedule=schedule,
+                history=history,
+                fail_fast=fail_fast,
+            )
+        return backend_cls(workdir=workdir_path, resume=resume)
+
+    @staticmethod
+    def _close_runner(runner: BaseBackend) -> None:
+        # the executor created the warm pool for this run, so it shuts it down
+        warm_pool = getattr(runner, "warm_pool", None)
+        if warm_pool is not None:
+            warm_pool.close()
+
+    def _finish_run(self, runner: BaseBackend, result: WorkflowResult, backend: str,
+                    history: Optional[RunHistory] = None,
+                    recorder: Optional[TraceRecorder] = None,
+                    trace: Optional[str] = None) -> WorkflowResult:
+        if history is not None:
+            try:
+                history.record(self.workflow, result, backend, self.parameters,
+                               self.plan.script_hashes if self.plan else None)
+            except (OSError, sqlite3.Error) as exc:
+                # the history only informs later runs; never fail this one over it
+                print(f"Warning: could not record run history: {exc}")
+
+        if recorder is not None:
+            recorder.add_result(result)
+            recorder.write(Path(trace))
+            print(f"Trace written to {trace} (open it in https://ui.perfetto.dev)")
 
-        result = runner.execute(self.workflow, self.parameters)
+        if self.sweep_points is not None:
+            manifest = runner.workdir / "sweep.json"
+            manifest.write_text(json.dumps(self.sweep_points, indent=2))
+            print(f"Sweep manifest written to {manifest}")
 
         if self.workflow_file:
             abs_workflow = Path(self.workflow_file).resolve()
@@ -0,0 +1,54 @@
+"""
+Content hashing helpers shared by the output cache and the run journal.
+
+Output ports are addressed as ``<output_dir>/<port>`` while module scripts
+conventionally write ``<output_dir>/<port>.json``; `port_files` resolves a
+port path to whatever files actually back it.
+"""
+import hashlib
+from pathlib import Path
+from typing import List
+
+_CHUNK = 1 << 20
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_tree(root: Path) -> str:
+    """SHA-256 over every file below ``root`` (relative names + contents)."""
+    h = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file()):
+        h.update(path.relative_to(root).as_posix().encode())
+        h.update(b"\0")
+        h.update(hash_file(path).encode())
+    return h.hexdigest()
+
+
+def port_files(path: Path) -> List[Path]:
+    """Files backing an output port path: the path itself or ``<port>.*`` siblings."""
+    path = Path(path)
+    if path.exists():
+        return [path]
+    if not path.parent.is_dir():
+        return []
+    return sorted(p for p in path.parent.glob(f"{path.name}.*") if p.is_file())
+
+
+def hash_port(path: Path) -> str:
+    """Content hash of an output port; empty string if nothing backs it yet."""
+    files = port_files(path)
+    if not files:
+        return ""
+    h = hashlib.sha256()
+    for f in files:
+        h.update(f.name.encode())
+        h.update(b"\0")
+        h.update((hash_tree(f) if f.is_dir() else hash_file(f)).encode())
+    return h.hexdigest()
@@ -0,0 +1,63 @@
+"""
+Server side of the module-server protocol for Python module scripts.
+
+A module declared with ``"mode": "server"`` is started with ``--serve``. The
+script does its expensive setup once and then hands a per-invocation function
+to `serve`::
+
+    def run(inputs, params, output_dir):
+        ...write <output_dir>/<port>.json...
+
+    if __name__ == "__main__":
+        if "--serve" in sys.argv:
+            load_tables()
+            serve(run)
+        else:
+            main()
+
+See nexa.backends.module_server for the wire format.
+"""
+import io
+import json
+import os
+import resource
+import sys
+import traceback
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict
+
+from .resources import rusage_usage
+
+Handler = Callable[[Dict[str, str], Dict[str, Any], str], None]
+
+
+def serve(handler: Handler) -> None:
+    """Answer invocations from stdin until it is closed.
+
+    Anything the handler prints to stdout is captured and returned as the
+    invocation's log, so it cannot corrupt the reply stream; an exception is
+    reported as an error reply and the server keeps serving. Each reply also
+    carries the CPU time the invocation used and the server's peak RSS.
+    """
+    replies = sys.stdout
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        captured = io.StringIO()
+        reply: Dict[str, Any] = {"id": request["id"], "status": "ok"}
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        try:
+            params: Dict[str, Any] = {}
+            if request.get("params"):
+                with open(request["params"]) as f:
+                    params = json.load(f)
+            os.makedirs(request["output_dir"], exist_ok=True)
+            with redirect_stdout(captured):
+                handler(request["inputs"], params, request["output_dir"])
+        except Exception:
+            reply = {"id": request["id"], "status": "error", "error": traceback.format_exc()}
+        reply["log"] = captured.getvalue()
+        reply["usage"] = rusage_usage(resource.getrusage(resource.RUSAGE_SELF), before)
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
@@ -0,0 +1,115 @@
+"""
+Machine resource budget for local admission control.
+
+Modules declare what they need in the ``resources`` block of their module.json
+(the same block RemoteBackend turns into ``#SBATCH`` lines). Locally we only
+look at ``cpus`` (or ``ntasks``) and ``mem`` (or ``memory``); a module is
+started only while the sum of what running modules hold still fits the budget.
+"""
+import os
+import re
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+_MEM_UNITS = {"": 1024 ** 2, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+
+
+def parse_mem(value: Any) -> int:
+    """Convert a SLURM-style memory spec ("16G", "512M", 4096) to bytes.
+
+    Bare numbers are megabytes, as in ``sbatch --mem``.
+    """
+    if value is None or value == "":
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value * _MEM_UNITS[""])
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid memory specification: {value!r}")
+    return int(float(match.group(1)) * _MEM_UNITS[match.group(2)])
+
+
+def format_mem(nbytes: int) -> str:
+    for unit in ("T", "G", "M"):
+        if nbytes >= _MEM_UNITS[unit]:
+            return f"{nbytes / _MEM_UNITS[unit]:.1f}{unit}"
+    return f"{nbytes}B"
+
+
+def detect_cpus() -> int:
+    """Number of cores this process may run on (honours taskset/cgroups affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def detect_memory() -> int:
+    """Total physical memory in bytes, or 0 if it cannot be determined."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+class ResourceBudget:
+    """Cores and memory available to concurrently running modules.
+
+    A memory total of 0 means "unknown" and disables the memory check.
+    Requests larger than the whole budget are clamped to it, so an oversized
+    module still runs — alone — instead of blocking the workflow forever.
+    """
+
+    def __init__(self, cpus: Optional[int] = None, mem: Any = None):
+        self.total_cpus = int(cpus) if cpus else detect_cpus()
+        self.total_mem = parse_mem(mem) if mem else detect_memory()
+        self.free_cpus = self.total_cpus
+        self.free_mem = self.total_mem
+        self._lock = threading.Lock()
+
+    def request(self, module) -> Tuple[int, int]:
+        """Return the (cpus, mem_bytes) a module asks for, clamped to the budget."""
+        res = module.resources
+        cpus = int(res.get("cpus", res.get("ntasks", 1)))
+        mem = parse_mem(res.get("mem", res.get("memory")))
+        cpus = min(max(cpus, 1), self.total_cpus)
+        if self.total_mem:
+            mem = min(mem, self.total_mem)
+        return cpus, mem
+
+    def fits(self, req: Tuple[int, int]) -> bool:
+        cpus, mem = req
+        with self._lock:
+            if cpus > self.free_cpus:
+                return False
+            return not self.total_mem or mem <= self.free_mem
+
+    def acquire(self, req: Tuple[int, int]) -> None:
+        with self._lock:
+            self.free_cpus -= req[0]
+            if self.total_mem:
+                self.free_mem -= req[1]
+
+    def release(self, req: Tuple[int, int]) -> None:
+        with self._lock:
+            self.free_cpus += req[0]
+            if self.total_mem:
+                self.free_mem += req[1]
+
+    def __str__(self) -> str:
+        mem = format_mem(self.total_mem) if self.total_mem else "unlimited"
+        return f"{self.total_cpus} cpus, {mem} memory"
+
+
+def rusage_usage(ru, before=None) -> Dict[str, Any]:
+    """CPU seconds and peak RSS (bytes) from a ``resource.struct_rusage``.
+
+    With ``before``, CPU times are the difference between the two readings.
+    """
+    user, system = ru.ru_utime, ru.ru_stime
+    if before is not None:
+        user, system = user - before.ru_utime, system - before.ru_stime
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {"user_cpu": user, "sys_cpu": system, "max_rss": ru.ru_maxrss * scale}
@@ -0,0 +1,79 @@
+"""Shared fixtures: small workflows of one configurable Python step module."""
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import pytest
+
+from nexa.core.registry import ModuleRegistry
+from nexa.core.workflow import Workflow
+
+# Writes its "out" port after optional sleep / output / failure, driven by params
+STEP = '''\
+import argparse, json, os, sys, time
+p = argparse.ArgumentParser()
+p.add_argument("--input", nargs=2, action="append", default=[])
+p.add_argument("--params")
+p.add_argument("--output_dir", required=True)
+a = p.parse_args()
+params = json.load(open(a.params)) if a.params else {}
+time.sleep(params.get("sleep", 0))
+if params.get("line"):
+    sys.stdout.write("x" * params["line"] + "\\n")
+    sys.stdout.write("after\\n")
+    sys.stdout.flush()
+if params.get("crash"):
+    os._exit(3)
+if params.get("fail"):
+    print("boom", file=sys.stderr)
+    sys.exit(2)
+with open(os.path.join(a.output_dir, "out"), "w") as f:
+    f.write(json.dumps({"inputs": sorted(p for p, _ in a.input), "params": params}))
+'''
+
+
+def write_workflow(root: Path, edges: Iterable[Tuple[str, str]],
+                   modules: Optional[Dict[str, dict]] = None) -> Path:
+    """Write a workflow of step modules connected by (upstream, downstream) edges.
+
+    ``modules`` adds or overrides module.json fields per module id (e.g.
+    ``parameters``, ``resources``); modules without edges may be listed there.
+    """
+    edges = list(edges)
+    modules = modules or {}
+    ids = list(dict.fromkeys([m for edge in edges for m in edge] + list(modules)))
+    (root / "mods").mkdir(parents=True, exist_ok=True)
+    (root / "mods" / "step.py").write_text(STEP)
+    fan_in: Dict[str, int] = {}
+    connections = []
+    for src, dst in edges:
+        port = f"in{fan_in.get(dst, 0)}"
+        fan_in[dst] = fan_in.get(dst, 0) + 1
+        connections.append({"from": {"module": src, "output": "out"},
+                            "to": {"module": dst, "input": port}})
+    for mod_id in ids:
+        (root / "mods" / f"{mod_id}.json").write_text(json.dumps({
+            "id": mod_id, "executable": "python3", "script": "step.py",
+            "input_ports": [f"in{i}" for i in range(fan_in.get(mod_id, 0))],
+            "output_ports": ["out"],
+            **modules.get(mod_id, {}),
+        }))
+    path = root / "wf.json"
+    path.write_text(json.dumps({
+        "workflow_id": root.name,
+        "modules": [{"id": m, "ref": f"mods/{m}.json"} for m in ids],
+        "connections": connections,
+    }))
+    return path
+
+
+def load_workflow(path: Path) -> Workflow:
+    return Workflow.from_file(path, registry=ModuleRegistry(cache_file=None))
+
+
+@pytest.fixture
+def make_workflow(tmp_path):
+    """``make_workflow(edges, modules=None)`` -> a loaded Workflow in tmp_path/wf."""
+    def make(edges=(), modules=None, name="wf") -> Workflow:
+        return load_workflow(write_workflow(tmp_path / name, edges, modules))
+    return make
@@ -0,0 +1,82 @@
+"""Pilot agent: status log, completion markers, and the guard of jobs outside the pilot."""
+import json
+import subprocess
+
+from nexa.agent import StatusLog, run_pilot
+from nexa.bench import FakeSlurmBackend
+from conftest import load_workflow, write_workflow
+
+
+def _manifest(tmp_path, edges, modules):
+    """A pilot manifest for the workflow, as RemoteBackend would stage it."""
+    wf = load_workflow(write_workflow(tmp_path / "wf", edges, modules))
+    run = tmp_path / "run"
+    run.mkdir()
+    path = run / "pilot_1.json"
+    path.write_text(json.dumps({
+        "workflow_id": wf.workflow_id,
+        "modules": [{**m.to_dict(), "script": str(m.get_script_path())} for m in wf.modules],
+        "connections": wf.connections,
+        "inputs": {m.id: {port: str(run / "outputs" / src / out)
+                          for port, src, out in wf.index.inputs(m.id)}
+                   for m in wf.modules},
+    }))
+    return path
+
+
+def _events(path):
+    return [(rec["event"], rec["module"]) for rec in map(json.loads, path.open())]
+
+
+def test_pilot_reports_every_module_and_marks_completed_ones(tmp_path):
+    manifest = _manifest(tmp_path, [("a", "b"), ("x", "y")],
+                         {"x": {"parameters": {"sleep": 0.2, "fail": True}}})
+    assert run_pilot(manifest, cpus=1) == 1
+
+    events = _events(manifest.with_suffix(".status.jsonl"))
+    final = {mid: event for event, mid in events if event != "module_start"}
+    assert final == {"a": "module_complete", "b": "module_complete",
+                     "x": "module_failed", "y": "module_failed"}
+    assert ("module_start", "y") not in events
+    # independent branches carry on after x failed
+    assert ("module_start", "b") in events
+    assert sorted(p.name for p in manifest.with_suffix(".done").iterdir()) == ["a", "b"]
+    assert json.loads((manifest.parent / "outputs" / "b" / "out").read_text())["inputs"] == ["in0"]
+
+
+def test_status_log_keeps_whole_lines_of_final_events(tmp_path):
+    log = StatusLog(tmp_path / "p.status.jsonl", tmp_path / "p.done")
+    log("module_start", "a", {})
+    log("module_output", "a", {"stream": "stdout", "line": "noise"})
+    log("module_complete", "a", {"outputs": {"out": "/x"}, "cached": False})
+    log("module_failed", "b", {"error": "boom", "returncode": 2, "skipped": False})
+
+    records = [json.loads(line) for line in log.path.read_text().splitlines()]
+    assert [(r["event"], r["module"]) for r in records] == [
+        ("module_start", "a"), ("module_complete", "a"), ("module_failed", "b"),
+    ]
+    assert "outputs" not in records[1]
+    assert records[2]["error"] == "boom" and records[2]["returncode"] == 2
+    assert log.reported == {"a", "b"}
+    assert [p.name for p in (tmp_path / "p.done").iterdir()] == ["a"]
+
+
+def test_guard_fails_a_job_whose_pilot_module_did_not_complete(tmp_path):
+    backend = FakeSlurmBackend(tmp_path / "local")
+    backend.remote_workdir = str(tmp_path)
+    guard = backend._pilot_guard(["job1", "+pilot_1/a", "+pilot_1/b"])
+    (tmp_path / "pilot_1.done").mkdir()
+    (tmp_path / "pilot_1.done" / "a").touch()
+
+    def run():
+        return subprocess.run(["bash", "-c", guard + "echo ran\n"],
+                              capture_output=True, text=True)
+
+    failed = run()
+    assert failed.returncode == 1
+    assert failed.stdout == ""
+    assert "upstream module b did not complete" in failed.stderr
+
+    (tmp_path / "pilot_1.done" / "b").touch()
+    assert run().stdout == "ran\n"
+    assert backend._pilot_guard(["job1", "array1@0"]) == ""
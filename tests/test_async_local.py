@@ -0,0 +1,27 @@
+"""AsyncLocalBackend: output streaming."""
+from nexa.backends.async_local import _LINE_LIMIT, AsyncLocalBackend
+
+
+def test_overlong_line_is_logged_whole_and_streamed_in_pieces(tmp_path, make_workflow):
+    size = 2 * _LINE_LIMIT + 123
+    wf = make_workflow(modules={"a": {"parameters": {"line": size}}})
+    output = []
+
+    def on_event(event, module_id, data):
+        if event == "module_output" and data["stream"] == "stdout":
+            output.append(data["line"])
+
+    result = AsyncLocalBackend(tmp_path / "run", on_event=on_event).execute(wf)
+
+    assert result.status == "success"
+    assert result.modules["a"].read_log("stdout") == "x" * size + "\nafter\n"
+    assert [len(line) for line in output] == [_LINE_LIMIT, _LINE_LIMIT, 123, 5]
+    assert output[-1] == "after"
+
+
+def test_lines_are_streamed_as_events(tmp_path, make_workflow):
+    wf = make_workflow(modules={"a": {"parameters": {"line": 3}}})
+    output = []
+    AsyncLocalBackend(tmp_path / "run", on_event=lambda e, m, d: e == "module_output"
+                      and output.append((d["stream"], d["line"]))).execute(wf)
+    assert output == [("stdout", "xxx"), ("stdout", "after")]
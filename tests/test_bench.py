@@ -0,0 +1,57 @@
+"""Synthetic benchmark workflows and the cases run on them."""
+import pytest
+
+from nexa.bench import SHAPES, generate_workflow, run_case, run_suite
+from nexa.core.registry import ModuleRegistry
+from nexa.core.workflow import Workflow
+
+
+def _load(path):
+    return Workflow.from_file(path, registry=ModuleRegistry(cache_file=None))
+
+
+@pytest.mark.parametrize("shape, edges, levels", [
+    ("chain", 9, 10), ("fanout", 9, 2), ("diamond", 12, 4),
+])
+def test_shapes(tmp_path, shape, edges, levels):
+    wf = _load(generate_workflow(shape, 10, tmp_path))
+
+    assert len(wf.modules) == 10
+    assert len(wf.connections) == edges
+    assert len(wf.index.levels) == levels
+
+
+def test_random_shape_is_seeded(tmp_path):
+    one = _load(generate_workflow("random", 50, tmp_path / "one", seed=7))
+    two = _load(generate_workflow("random", 50, tmp_path / "two", seed=7))
+    other = _load(generate_workflow("random", 50, tmp_path / "other", seed=8))
+
+    assert one.connections == two.connections
+    assert one.connections != other.connections
+    # every module but the first has one to three inputs, all from earlier modules
+    assert all(1 <= len(one.index.upstream_ids(f"m{i}")) <= 3 for i in range(1, 50))
+    assert all(int(c["from"]["module"][1:]) < int(c["to"]["module"][1:])
+               for c in one.connections)
+
+
+@pytest.mark.parametrize("backend", ["local", "remote", "nextflow"])
+def test_case_measurements(tmp_path, backend):
+    case = run_case("diamond", 12, backend, str(tmp_path), cpus=2)
+
+    assert case["modules"] == 12 and case["backend"] == backend
+    assert case["plan_s"] >= case["index_s"] >= 0
+    assert case["peak_rss_mb"] > 0
+    if backend == "nextflow":
+        assert case["script_bytes"] > 0
+    else:
+        assert case["status"] == "success"
+        assert set(case["dispatch_latency_s"]) == {"mean", "p50", "p95", "max"}
+    if backend == "remote":
+        assert case["remote_calls"]["squeue"] >= 1
+
+
+def test_suite_rejects_unknown_shapes_and_backends(tmp_path):
+    with pytest.raises(ValueError, match="Unknown shape"):
+        run_suite(shapes=["ring"], workdir=tmp_path)
+    with pytest.raises(ValueError, match="Unknown backend"):
+        run_suite(shapes=SHAPES, backends=["cloud"], workdir=tmp_path)
@@ -0,0 +1,64 @@
+"""Bulk staging: one bundle, one transfer, one submission call per run."""
+import os
+import subprocess
+import tarfile
+
+from nexa.backends.remote import _dependency, _submit_all_script
+from nexa.bench import FakeSlurmBackend
+
+# Prints a new job id (";cluster" as with federation) and logs its arguments
+FAKE_SBATCH = """\
+#!/bin/bash
+echo "$@" >> sbatch.log
+[ "${@: -1}" = fail.sh ] && { echo "sbatch: error: invalid partition" >&2; exit 1; }
+n=$(( $(wc -l < sbatch.log) + 100 ))
+echo "$n;cluster"
+"""
+
+JOBS = [
+    ("a", "submit_a.sh", []),
+    ("arr", "submit_arr.sh", ["a"]),
+    ("b", "submit_b.sh", ["arr@1", "old"]),
+    ("arr2", "submit_arr2.sh", ["~arr"]),
+    ("c", "submit_c.sh", ["+pilot/x", "+pilot/y", "a"]),
+    ("bad", "fail.sh", []),
+    ("d", "submit_d.sh", ["bad"]),
+]
+
+
+def test_submit_all_chains_job_ids(tmp_path, monkeypatch):
+    (tmp_path / "sbatch").write_text(FAKE_SBATCH)
+    (tmp_path / "sbatch").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    (tmp_path / "jobs.txt").write_text(
+        "".join(f"{name} {script} {','.join(deps)}\n" for name, script, deps in JOBS))
+    (tmp_path / "submit_all.sh").write_text(_submit_all_script({"old": "7", "pilot": "99"}))
+
+    out = subprocess.run(["bash", "submit_all.sh"], cwd=tmp_path, capture_output=True,
+                         text=True, check=True).stdout.splitlines()
+
+    assert out[:5] == ["a 101", "arr 102", "b 103", "arr2 104", "c 105"]
+    assert out[5] == "bad ERROR sbatch: error: invalid partition "
+    assert out[6] == "d ERROR upstream bad was not submitted"
+    ids = {"a": "101", "arr": "102", "old": "7", "pilot": "99"}
+    calls = (tmp_path / "sbatch.log").read_text().splitlines()
+    assert calls[:5] == [
+        "--parsable submit_a.sh",
+        f"--parsable --dependency={_dependency(['a'], ids)} submit_arr.sh",
+        "--parsable --dependency=afterok:102_1:7 submit_b.sh",
+        "--parsable --dependency=aftercorr:102 submit_arr2.sh",
+        "--parsable --dependency=afterok:101,afterany:99 submit_c.sh",
+    ]
+
+
+def test_run_is_shipped_and_submitted_in_one_call_each(tmp_path, make_workflow):
+    edges = [("r", f"m{i}") for i in range(10)] + [(f"m{i}", "join") for i in range(10)]
+    backend = FakeSlurmBackend(tmp_path / "run")
+    result = backend.execute(make_workflow(edges))
+
+    assert result.status == "success"
+    calls = backend.slurm.calls
+    assert (calls["scp"], calls["bash"]) == (1, 1)
+    with tarfile.open(tmp_path / "run" / "bundle.tar.gz") as tar:
+        names = set(tar.getnames())
+    assert {"jobs.txt", "submit_all.sh", "submit_r.sh", "submit_join.sh"} <= names
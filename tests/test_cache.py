@@ -0,0 +1,63 @@
+"""OutputCache: hits on unchanged runs, misses on changes, LRU eviction."""
+import json
+
+from nexa.backends.local import LocalBackend
+from nexa.core.cache import OutputCache
+from conftest import load_workflow, write_workflow
+
+
+def _cached(result):
+    return {mid: res.cached for mid, res in result.modules.items()}
+
+
+def test_unchanged_run_is_restored_from_the_cache(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b")])
+    cache = OutputCache(tmp_path / "cache")
+    first = LocalBackend(tmp_path / "run1", cache=cache).execute(wf)
+    second = LocalBackend(tmp_path / "run2", cache=cache).execute(wf)
+
+    assert _cached(first) == {"a": False, "b": False}
+    assert _cached(second) == {"a": True, "b": True}
+    assert second.status == "success"
+    out = tmp_path / "run2" / "outputs" / "b" / "out"
+    assert json.loads(out.read_text()) == {"inputs": ["in0"], "params": {}}
+
+
+def test_changed_parameters_miss_for_the_module_and_its_dependents(tmp_path):
+    cache = OutputCache(tmp_path / "cache")
+    path = write_workflow(tmp_path / "wf", [("a", "b")], modules={"c": {}})
+    LocalBackend(tmp_path / "run1", cache=cache).execute(load_workflow(path))
+    path = write_workflow(tmp_path / "wf", [("a", "b")],
+                          modules={"a": {"parameters": {"n": 2}}, "c": {}})
+    result = LocalBackend(tmp_path / "run2", cache=cache).execute(load_workflow(path))
+
+    # b's input changed with a's output
+    assert _cached(result) == {"a": False, "b": False, "c": True}
+
+
+def test_failed_runs_are_not_cached(tmp_path, make_workflow):
+    wf = make_workflow(modules={"a": {"parameters": {"fail": True}}})
+    cache = OutputCache(tmp_path / "cache")
+    LocalBackend(tmp_path / "run1", cache=cache).execute(wf)
+    result = LocalBackend(tmp_path / "run2", cache=cache).execute(wf)
+
+    assert result.modules["a"].status == "failed"
+    assert not result.modules["a"].cached
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = OutputCache(tmp_path / "cache", max_size="1K")
+    for key in ("k1", "k2", "k3"):
+        out = tmp_path / key
+        out.mkdir()
+        (out / "data").write_bytes(b"x" * 400)
+        cache.store(key, out)
+        # k1 is used again before k3 is stored: k2 is the least recently used
+        if key == "k2":
+            assert cache.restore("k1", tmp_path / "restored")
+
+    assert (cache.root / "k1").is_dir()
+    assert not (cache.root / "k2").exists()
+    assert (cache.root / "k3").is_dir()
+    assert not cache.restore("k2", tmp_path / "restored")
+    assert sorted(json.loads((cache.root / "index.json").read_text())) == ["k1", "k3"]
@@ -0,0 +1,66 @@
+"""RemoteStore: content addressing, what gets uploaded, and installing objects."""
+import subprocess
+
+from nexa.backends.cas import RemoteStore
+from nexa.bench import FakeSlurmBackend
+
+
+def test_objects_are_addressed_by_names_and_contents(tmp_path):
+    store = RemoteStore("/cas/")
+    one, two = tmp_path / "one.py", tmp_path / "two.py"
+    one.write_text("print(1)\n")
+    two.write_text("print(1)\n")
+
+    path = store.add({"step.py": one})
+    assert path.startswith("/cas/") and len(path) == len("/cas/") + 64
+    assert store.add({"step.py": two}) == path
+    assert store.add({"step.py": b"print(1)\n"}) == path
+    assert store.add({"other.py": one}) != path
+    assert store.add({"step.py": b"print(2)\n"}) != path
+    assert len(store.objects) == 3
+
+
+def test_missing_objects():
+    store = RemoteStore("/cas")
+    keys = sorted(store.add({"p.json": bytes([i])}).rsplit("/", 1)[1] for i in range(3))
+    commands = []
+
+    def run(cmd):
+        commands.append(cmd)
+        return 0, f"{keys[1]}\n", ""
+
+    assert store.missing(run) == [keys[0], keys[2]]
+    assert len(commands) == 1 and all(key in commands[0] for key in keys)
+    # an unanswered query uploads everything
+    assert store.missing(lambda cmd: (255, "", "ssh: connect failed")) == keys
+
+
+def test_install_keeps_objects_already_in_the_store(tmp_path):
+    store = RemoteStore(str(tmp_path / "cas"))
+    new = store.add({"a.txt": b"new"}).rsplit("/", 1)[1]
+    old = store.add({"a.txt": b"old"}).rsplit("/", 1)[1]
+    (tmp_path / "cas" / old).mkdir(parents=True)
+    (tmp_path / "cas" / old / "a.txt").write_text("installed")
+
+    assert store.write(tmp_path / "upload", [new, old]) == 6
+    subprocess.run(["bash", "-c", store.install_script(str(tmp_path / "upload"))], check=True)
+
+    assert (tmp_path / "cas" / new / "a.txt").read_text() == "new"
+    assert (tmp_path / "cas" / old / "a.txt").read_text() == "installed"
+    assert not (tmp_path / "upload").exists()
+
+
+def test_repeat_run_uploads_nothing(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b"), ("a", "c")], {"b": {"parameters": {"n": 1}}})
+    first = FakeSlurmBackend(tmp_path / "run1")
+    assert first.execute(wf).status == "success"
+
+    # one copy of the script shared by every module, plus b's parameters
+    assert len(first.slurm.stored) == 2
+    assert len(list((tmp_path / "run1" / "bundle" / "cas").iterdir())) == 2
+    assert "/fake/.nexa_cas/" in (tmp_path / "run1" / "bundle" / "submit_a.sh").read_text()
+
+    second = FakeSlurmBackend(tmp_path / "run2")
+    second.slurm.stored = set(first.slurm.stored)
+    assert second.execute(wf).status == "success"
+    assert not (tmp_path / "run2" / "bundle" / "cas").exists()
@@ -0,0 +1,47 @@
+"""Cancellation after a failure: running local modules, downstream SLURM jobs."""
+import time
+
+import pytest
+
+from nexa.backends.async_local import AsyncLocalBackend
+from nexa.backends.local import LocalBackend
+from nexa.bench import FakeSlurmBackend
+
+BAD = {"parameters": {"sleep": 0.2, "fail": True}}
+
+
+@pytest.mark.parametrize("backend", [LocalBackend, AsyncLocalBackend])
+def test_failure_terminates_running_modules(tmp_path, make_workflow, backend):
+    wf = make_workflow([("slow", "after")], {"bad": BAD, "slow": {"parameters": {"sleep": 30}}})
+    started = time.time()
+    result = backend(tmp_path / "run", cpus=4).execute(wf)
+
+    assert time.time() - started < 15
+    assert result.status == "failed"
+    assert result.modules["bad"].status == "failed"
+    assert result.modules["slow"].status == "skipped"
+    assert result.modules["slow"].error == "Cancelled: module bad failed"
+    assert result.modules["after"].status == "skipped"
+
+
+@pytest.mark.parametrize("backend", [LocalBackend, AsyncLocalBackend])
+def test_without_fail_fast_running_modules_finish(tmp_path, make_workflow, backend):
+    wf = make_workflow(modules={"bad": BAD, "slow": {"parameters": {"sleep": 1}}})
+    result = backend(tmp_path / "run", cpus=4, fail_fast=False).execute(wf)
+
+    assert result.status == "failed"
+    assert result.modules["slow"].status == "success"
+
+
+def test_downstream_jobs_are_cancelled_in_one_call(tmp_path, make_workflow):
+    edges = [("a", "b"), ("b", "c"), ("b", "d"), ("x", "y")]
+    backend = FakeSlurmBackend(tmp_path / "run", fail=["b"])
+    result = backend.execute(make_workflow(edges))
+
+    status = {mid: res.status for mid, res in result.modules.items()}
+    assert status == {"a": "success", "b": "failed", "c": "skipped", "d": "skipped",
+                      "x": "success", "y": "success"}
+    assert backend.slurm.calls["scancel"] == 1
+    cancelled = {job["module"] for job in backend.slurm.jobs.values()
+                 if job["state"] == "CANCELLED"}
+    assert cancelled == {"c", "d"}
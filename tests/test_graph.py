@@ -0,0 +1,48 @@
+"""WorkflowIndex: adjacency, order and levels computed once from the connections."""
+import pytest
+
+from nexa.core.graph import WorkflowIndex
+
+
+def _conn(src, dst, output="out", port="in0"):
+    return {"from": {"module": src, "output": output}, "to": {"module": dst, "input": port}}
+
+
+def test_adjacency_order_and_levels():
+    # d declared first, but runs last; b feeds c on two ports
+    index = WorkflowIndex(["d", "c", "b", "a"], [
+        _conn("c", "d"), _conn("b", "c", "x", "in0"), _conn("b", "c", "y", "in1"),
+        _conn("a", "b"), _conn("a", "d", port="in1"),
+    ])
+
+    assert index.order_ids == ["a", "b", "c", "d"]
+    assert index.levels == [["a"], ["b"], ["c"], ["d"]]
+    assert index.inputs("c") == [("in0", "b", "x"), ("in1", "b", "y")]
+    assert index.upstream_ids("c") == ["b"]
+    assert index.upstream_ids("d") == ["c", "a"]
+    assert index.downstream_ids("a") == ["b", "d"]
+    assert index.descendant_ids("b") == ["c", "d"]
+    assert index.descendant_ids("d") == []
+
+
+def test_parallel_levels():
+    index = WorkflowIndex(["a", "b", "c", "d"], [_conn("a", "c"), _conn("b", "c")])
+
+    assert index.levels == [["a", "b", "d"], ["c"]]
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        WorkflowIndex(["a", "b"], [_conn("a", "b"), _conn("b", "a")])
+
+
+def test_unknown_module_is_rejected():
+    with pytest.raises(ValueError, match="unknown module 'z'"):
+        WorkflowIndex(["a"], [_conn("a", "z")])
+
+
+def test_workflow_builds_its_index_once(make_workflow):
+    wf = make_workflow([("a", "b")])
+
+    assert wf.index is wf.index
+    assert wf.index.order_ids == ["a", "b"]
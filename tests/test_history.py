@@ -0,0 +1,57 @@
+"""RunHistory: what gets recorded, estimates, and a history that cannot be opened."""
+from nexa.backends.base import ModuleMetrics, ModuleResult, WorkflowResult
+from nexa.backends.local import LocalBackend
+from nexa.core.history import RunHistory
+
+
+def _result(workflow, **modules):
+    return WorkflowResult(workflow_id=workflow.workflow_id, status="success", modules=modules)
+
+
+def _metrics(wall, rss=1 << 20):
+    return ModuleMetrics.measured(100.0, 100.0 + wall, 99.0, user_cpu=wall, sys_cpu=0.0,
+                                  max_rss=rss)
+
+
+def test_records_only_modules_that_did_work(tmp_path, make_workflow):
+    wf = make_workflow(modules={m: {} for m in ("ran", "cached", "resumed", "skipped", "failed")})
+    history = RunHistory(tmp_path / "history.db")
+    recorded = history.record(wf, _result(
+        wf,
+        ran=ModuleResult("ran", "success", metrics=_metrics(2.0)),
+        cached=ModuleResult("cached", "success", cached=True, metrics=_metrics(0.1)),
+        resumed=ModuleResult("resumed", "success", resumed=True, metrics=_metrics(0.1)),
+        # cancelled by fail-fast part-way through: its run time means nothing
+        skipped=ModuleResult("skipped", "skipped", metrics=_metrics(0.5)),
+        failed=ModuleResult("failed", "failed", returncode=2, metrics=_metrics(1.0)),
+    ), "local")
+
+    assert recorded == 2
+    assert sorted(row["module_id"] for row in history.runs()) == ["failed", "ran"]
+
+
+def test_estimates_from_successful_runs(tmp_path, make_workflow):
+    wf = make_workflow(modules={"a": {}})
+    history = RunHistory(tmp_path / "history.db")
+    for wall in (1.0, 3.0):
+        history.record(wf, _result(wf, a=ModuleResult("a", "success", metrics=_metrics(wall))),
+                       "local")
+    history.record(wf, _result(wf, a=ModuleResult("a", "failed", metrics=_metrics(50.0))),
+                   "local")
+
+    estimate = history.estimates(wf)["a"]
+    assert estimate.runs == 2
+    assert estimate.wall_time == 2.0
+    assert estimate.max_wall_time == 3.0
+
+
+def test_unusable_history_does_not_fail_the_run(tmp_path, make_workflow, capsys):
+    # the history's directory cannot be created: its parent is a file
+    (tmp_path / "home").write_text("")
+    history = RunHistory(tmp_path / "home" / ".nexa" / "history.db")
+    wf = make_workflow([("a", "b")])
+
+    assert history.estimates(wf) == {}
+    result = LocalBackend(tmp_path / "run", history=history).execute(wf)
+    assert result.status == "success"
+    assert "run history" in capsys.readouterr().out
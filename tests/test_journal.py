@@ -0,0 +1,65 @@
+"""RunJournal replay and LocalBackend --resume."""
+import pytest
+
+from nexa.backends.local import LocalBackend
+from nexa.core.journal import RunJournal
+from conftest import load_workflow, write_workflow
+
+
+def _resumed(result):
+    return {mid: res.resumed for mid, res in result.modules.items()}
+
+
+def test_resume_skips_completed_modules(tmp_path):
+    path = write_workflow(tmp_path / "wf", [("a", "b"), ("b", "c")],
+                          modules={"b": {"parameters": {"fail": True}}})
+    first = LocalBackend(tmp_path / "run").execute(load_workflow(path))
+    assert first.modules["b"].status == "failed"
+
+    path = write_workflow(tmp_path / "wf", [("a", "b"), ("b", "c")])
+    result = LocalBackend(tmp_path / "run", resume=True).execute(load_workflow(path))
+
+    assert result.status == "success"
+    assert _resumed(result) == {"a": True, "b": False, "c": False}
+
+
+def test_changed_output_is_rerun_with_its_dependents(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b"), ("b", "c")])
+    LocalBackend(tmp_path / "run").execute(wf)
+    (tmp_path / "run" / "outputs" / "b" / "out").write_text("tampered")
+    result = LocalBackend(tmp_path / "run", resume=True).execute(wf)
+
+    assert _resumed(result) == {"a": True, "b": False, "c": False}
+
+
+def test_without_resume_the_journal_starts_afresh(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b")])
+    LocalBackend(tmp_path / "run").execute(wf)
+    result = LocalBackend(tmp_path / "run").execute(wf)
+
+    assert _resumed(result) == {"a": False, "b": False}
+    runs = [rec for rec in (tmp_path / "run" / "journal.jsonl").read_text().splitlines()
+            if '"event": "run"' in rec]
+    assert len(runs) == 1
+
+
+def test_resume_refuses_another_workflows_journal(tmp_path, make_workflow):
+    LocalBackend(tmp_path / "run").execute(make_workflow(modules={"a": {}}, name="one"))
+
+    with pytest.raises(ValueError, match="belongs to workflow 'one'"):
+        LocalBackend(tmp_path / "run", resume=True).execute(
+            make_workflow(modules={"a": {}}, name="two"))
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    journal = RunJournal(tmp_path)
+    journal.begin("wf")
+    journal.module_start("a")
+    journal.module_submitted("a", "1234")
+    with open(journal.path, "a") as f:
+        f.write('{"event": "complete", "mod')
+
+    state = journal.load()
+    assert state["run"]["workflow_id"] == "wf"
+    assert state["modules"]["a"]["event"] == "submitted"
+    assert state["modules"]["a"]["job_id"] == "1234"
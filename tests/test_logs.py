@@ -0,0 +1,38 @@
+"""Module output goes to per-module log files; results keep only a tail."""
+import pytest
+
+from nexa.backends.async_local import AsyncLocalBackend
+from nexa.backends.base import LOG_TAIL_BYTES, ModuleResult
+from nexa.backends.local import LocalBackend
+
+BACKENDS = [LocalBackend, AsyncLocalBackend]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_full_output_is_in_the_log_and_a_tail_in_memory(tmp_path, make_workflow, backend):
+    wf = make_workflow(modules={"a": {"parameters": {"line": 3 * LOG_TAIL_BYTES}}})
+    res = backend(tmp_path / "run").execute(wf).modules["a"]
+
+    assert res.stdout_log == str(tmp_path / "run" / "logs" / "a.out")
+    assert res.read_log() == "x" * 3 * LOG_TAIL_BYTES + "\nafter\n"
+    assert len(res.stdout) == LOG_TAIL_BYTES
+    assert res.stdout.endswith("x\nafter\n")
+    assert res.to_dict()["stdout_log"] == res.stdout_log
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_failure_reports_its_stderr(tmp_path, make_workflow, backend):
+    wf = make_workflow(modules={"a": {"parameters": {"fail": True}}})
+    res = backend(tmp_path / "run").execute(wf).modules["a"]
+
+    assert res.status == "failed"
+    assert res.returncode == 2
+    assert res.error == "boom"
+    assert res.read_log("stderr") == "boom\n"
+
+
+def test_read_log_without_log_files():
+    res = ModuleResult("a", "success", stdout="kept in memory")
+    assert res.read_log() == "kept in memory"
+    with pytest.raises(ValueError):
+        res.read_log("stdin")
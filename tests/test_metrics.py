@@ -0,0 +1,48 @@
+"""Per-module timing and resource usage on ModuleResult and in events."""
+import pytest
+
+from nexa.backends.async_local import AsyncLocalBackend
+from nexa.backends.base import ModuleMetrics
+from nexa.backends.local import LocalBackend
+from nexa.backends.worker_pool import WarmWorkerPool
+
+
+def test_measured_derives_wall_and_queue_time():
+    metrics = ModuleMetrics.measured(100.0, 102.5, 99.0, user_cpu=1.0)
+
+    assert metrics.wall_time == 2.5
+    assert metrics.queue_time == 1.0
+    assert metrics.to_dict()["user_cpu"] == 1.0
+    # unknown or inconsistent timestamps give no derived times
+    assert ModuleMetrics.measured(None, 102.5).wall_time is None
+    assert ModuleMetrics.measured(100.0, 102.5, 101.0).queue_time is None
+
+
+@pytest.mark.parametrize("backend", [LocalBackend, AsyncLocalBackend])
+def test_every_run_is_measured(tmp_path, make_workflow, backend):
+    events = {}
+
+    def on_event(event, mid, data):
+        events[event, mid] = data
+
+    wf = make_workflow([("a", "b")], {"a": {"parameters": {"sleep": 0.3}}})
+    result = backend(tmp_path / "run", on_event=on_event).execute(wf)
+
+    a = result.modules["a"].metrics
+    assert a.wall_time >= 0.3
+    assert a.start_time >= a.submit_time
+    # sleeping is not CPU time
+    assert a.user_cpu + a.sys_cpu < a.wall_time
+    assert a.max_rss > 1 << 20
+    assert result.modules["b"].metrics.start_time >= a.end_time
+    assert events[("module_complete", "a")]["metrics"] == a.to_dict()
+
+
+def test_warm_worker_runs_are_measured(tmp_path, make_workflow):
+    wf = make_workflow(modules={"a": {"parameters": {"sleep": 0.2}}})
+    with WarmWorkerPool(workers=1) as pool:
+        result = LocalBackend(tmp_path / "run", warm_pool=pool).execute(wf)
+
+    metrics = result.modules["a"].metrics
+    assert metrics.wall_time >= 0.2
+    assert metrics.user_cpu is not None and metrics.max_rss > 0
@@ -0,0 +1,91 @@
+"""Module servers: one process serves many runs; errors and crashes fail only their run."""
+import json
+from pathlib import Path
+
+import pytest
+
+from nexa.backends.local import LocalBackend
+from nexa.backends.module_server import ModuleServerPool
+from nexa.core.registry import ModuleRegistry
+from nexa.core.sweep import expand_sweep
+from nexa.core.workflow import Workflow
+
+SERVER = '''\
+import json, os
+from nexa.utils.module_server import serve
+
+def run(inputs, params, output_dir):
+    print("invoked", params["n"])
+    if params["n"] == "error":
+        raise RuntimeError("bad n")
+    if params["n"] == "exit":
+        os._exit(4)
+    with open(os.path.join(output_dir, "out"), "w") as f:
+        f.write(json.dumps({"pid": os.getpid(), "n": params["n"]}))
+
+if __name__ == "__main__":
+    serve(run)
+'''
+
+
+@pytest.fixture(autouse=True)
+def importable_nexa(monkeypatch):
+    # the server scripts import nexa.utils.module_server
+    monkeypatch.setenv("PYTHONPATH", str(Path(__file__).resolve().parents[1]))
+
+
+def _sweep(tmp_path, values):
+    root = tmp_path / "wf"
+    root.mkdir()
+    (root / "server.py").write_text(SERVER)
+    (root / "s.json").write_text(json.dumps({
+        "id": "s", "executable": "python3", "script": "server.py", "mode": "server",
+        "input_ports": [], "output_ports": ["out"], "parameters": {"n": 0},
+    }))
+    (root / "wf.json").write_text(json.dumps({
+        "workflow_id": "servers", "modules": [{"id": "s", "ref": "s.json"}], "connections": [],
+    }))
+    wf = Workflow.from_file(root / "wf.json", registry=ModuleRegistry(cache_file=None))
+    return expand_sweep(wf, {}, [{"n": n} for n in values])[0]
+
+
+def _out(result, mid):
+    return json.loads(Path(result.modules[mid].outputs["out"]).read_text())
+
+
+def test_sweep_instances_share_one_server(tmp_path):
+    result = LocalBackend(tmp_path / "run", cpus=2).execute(_sweep(tmp_path, [1, 2, 3]))
+
+    assert result.status == "success"
+    assert len({_out(result, f"s__{i}")["pid"] for i in range(3)}) == 1
+    assert _out(result, "s__2")["n"] == 3
+    assert result.modules["s__1"].read_log() == "invoked 2\n"
+
+
+def test_error_or_crash_fails_only_its_invocation(tmp_path):
+    module = _sweep(tmp_path, [0]).modules[0]
+    script = module.get_script_path()
+    pool = ModuleServerPool(tmp_path)
+
+    def invoke(n):
+        params = tmp_path / f"{n}.json"
+        params.write_text(json.dumps({"n": n}))
+        return pool.get(module, script).invoke("s", {}, params, tmp_path / "out" / str(n))
+
+    try:
+        server = pool.get(module, script)
+        rc, log, error, usage = invoke("error")
+        assert rc == 1 and "RuntimeError: bad n" in error
+        assert log == "invoked error\n"
+        assert usage["max_rss"] > 0
+        assert invoke(1)[0] == 0
+        assert pool.get(module, script) is server
+
+        rc, _, error, _ = invoke("exit")
+        assert rc == 4 and "exited (rc=4)" in error
+        # a new server takes over
+        assert invoke(2)[0] == 0
+        assert pool.get(module, script) is not server
+    finally:
+        pool.close()
+    assert not server.alive
@@ -0,0 +1,49 @@
+"""Outputs are pulled per module as its job completes, and verified."""
+import subprocess
+from pathlib import Path
+
+from nexa.bench import FakeSlurm, FakeSlurmBackend
+from nexa.core.journal import RunJournal
+
+
+class _LosingSlurm(FakeSlurm):
+    """Loses the outputs of module ``b`` on the way back."""
+
+    def get_dir(self, remote_dir, local_dir):
+        if remote_dir.endswith("/outputs/b"):
+            self._count("rsync")
+            return subprocess.CompletedProcess(["rsync"], 0, "", "")
+        return super().get_dir(remote_dir, local_dir)
+
+
+def test_each_completed_module_is_synced_once(tmp_path, make_workflow):
+    events = []
+
+    def on_event(event, mid, data):
+        events.append((event, mid, data))
+
+    backend = FakeSlurmBackend(tmp_path / "run", on_event=on_event)
+    result = backend.execute(make_workflow([("a", "b"), ("a", "c")]))
+
+    assert result.status == "success"
+    assert backend.slurm.calls["rsync"] == 3
+    completed = {mid: data for event, mid, data in events if event == "module_complete"}
+    assert sorted(completed) == ["a", "b", "c"]
+    start, end = completed["b"]["phases"]["sync"]
+    assert start <= end
+    assert Path(result.modules["b"].outputs["out"]).exists()
+    journal = RunJournal(tmp_path / "run").load()
+    assert {mid: rec["event"] for mid, rec in journal["modules"].items()} == {
+        "a": "complete", "b": "complete", "c": "complete",
+    }
+
+
+def test_missing_outputs_fail_the_module(tmp_path, make_workflow):
+    backend = FakeSlurmBackend(tmp_path / "run")
+    backend.slurm = backend.session = _LosingSlurm(backend.workdir)
+    result = backend.execute(make_workflow([("a", "b"), ("a", "c")]))
+
+    b = result.modules["b"]
+    assert b.status == "failed"
+    assert b.error == "Output sync failed: outputs missing after sync: ['out']"
+    assert result.modules["c"].status == "success"
@@ -0,0 +1,77 @@
+"""Compiled execution plans: round trip and staleness."""
+import pytest
+
+from nexa.core import registry
+from nexa.core.plan import ExecutionPlan
+from nexa.core.registry import ModuleRegistry
+from nexa.executor import UnifiedExecutor
+from conftest import write_workflow
+
+
+@pytest.fixture
+def compiled(tmp_path, monkeypatch):
+    """(workflow dir, saved plan path) for a -> b, with a reading ``a.dat``."""
+    monkeypatch.setattr(registry, "_default", ModuleRegistry(cache_file=None))
+    root = tmp_path / "wf"
+    write_workflow(root, [("a", "b")], modules={"a": {"data_files": ["a.dat"]}})
+    (root / "mods" / "a.dat").write_text("1\n")
+    path = tmp_path / "wf.nxp"
+    ExecutionPlan.compile(root / "wf.json").save(path)
+    return root, path
+
+
+def test_loaded_plan_is_current(compiled):
+    root, path = compiled
+    plan = ExecutionPlan.load(path)
+
+    assert plan.is_current()
+    wf = plan.workflow()
+    assert wf.index.order_ids == ["a", "b"]
+    assert wf.module_map["a"].script == str((root / "mods" / "step.py").resolve())
+    assert list(plan.script_hashes) == [(root / "mods" / "step.py").resolve()]
+
+
+@pytest.mark.parametrize("edit", ["wf.json", "mods/a.json", "mods/step.py", "mods/a.dat"])
+def test_changed_source_makes_the_plan_stale(compiled, edit):
+    root, path = compiled
+    with open(root / edit, "a") as f:
+        f.write("\n")
+    plan = ExecutionPlan.load(path)
+
+    assert plan.stale_sources() == [str((root / edit).resolve())]
+    assert not plan.is_current()
+
+
+def test_removed_data_file_makes_the_plan_stale(compiled):
+    root, path = compiled
+    (root / "mods" / "a.dat").unlink()
+
+    assert not ExecutionPlan.load(path).is_current()
+
+
+def test_executor_falls_back_to_the_workflow_of_a_stale_plan(compiled):
+    root, path = compiled
+    assert UnifiedExecutor(str(path)).plan is not None
+
+    (root / "mods" / "step.py").write_text("# edited\n")
+    executor = UnifiedExecutor(str(path))
+    assert executor.plan is None
+    assert executor.workflow_file == (root / "wf.json").resolve()
+
+
+def test_not_a_plan(tmp_path):
+    path = tmp_path / "wf.nxp"
+    path.write_bytes(b"{}")
+
+    with pytest.raises(ValueError, match="not a compiled nexa plan"):
+        ExecutionPlan.load(path)
+
+
+def test_plan_from_another_version(compiled):
+    _, path = compiled
+    raw = bytearray(path.read_bytes())
+    raw[len(b"NXPLAN")] = 1
+    path.write_bytes(bytes(raw))
+
+    with pytest.raises(ValueError, match="different nexa version"):
+        ExecutionPlan.load(path)
@@ -0,0 +1,46 @@
+"""ModuleRegistry: parsed definitions cached in memory and on disk."""
+import json
+import pickle
+
+from nexa.core.registry import ModuleRegistry
+
+
+def _definition(path, **fields):
+    path.write_text(json.dumps({"id": path.stem, "executable": "python3", **fields}))
+    return str(path.resolve())
+
+
+def _stored(cache):
+    with open(cache, "rb") as f:
+        return pickle.load(f)
+
+
+def test_disk_cache_serves_next_registry_and_notices_edits(tmp_path):
+    cache = tmp_path / "defs.pickle"
+    a = _definition(tmp_path / "a.json", script="a.py")
+    assert ModuleRegistry(cache).definitions([a])[a]["script"] == "a.py"
+    assert a in _stored(cache)
+
+    _definition(tmp_path / "a.json", script="a_longer.py")
+    assert ModuleRegistry(cache).definitions([a])[a]["script"] == "a_longer.py"
+
+
+def test_save_drops_definitions_whose_file_is_gone(tmp_path):
+    cache = tmp_path / "defs.pickle"
+    gone = _definition(tmp_path / "gone.json")
+    ModuleRegistry(cache).definitions([gone])
+    (tmp_path / "gone.json").unlink()
+
+    kept = _definition(tmp_path / "kept.json")
+    ModuleRegistry(cache).definitions([kept])
+    assert list(_stored(cache)) == [kept]
+
+
+def test_disk_cache_keeps_most_recently_used(tmp_path):
+    cache = tmp_path / "defs.pickle"
+    paths = [_definition(tmp_path / f"m{i}.json") for i in range(5)]
+    registry = ModuleRegistry(cache, max_entries=3)
+    registry.definitions(paths[:3])
+    registry.definitions(paths[:1])          # m0 used again
+    registry.definitions(paths[3:])          # m3, m4 parsed: the cache is saved
+    assert sorted(_stored(cache)) == sorted([paths[0], paths[3], paths[4]])
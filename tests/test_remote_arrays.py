@@ -0,0 +1,81 @@
+"""Job arrays on RemoteBackend, against the in-memory fake SLURM of nexa.bench."""
+import json
+from pathlib import Path
+
+from nexa.bench import FakeSlurmBackend
+from nexa.core.registry import ModuleRegistry
+from nexa.core.workflow import Workflow
+
+
+def _workflow(root: Path, edges) -> Workflow:
+    """A workflow of no-op stub modules connected by (upstream, downstream) edges."""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "stub.sh").write_text("#!/bin/sh\n")
+    (root / "stub.json").write_text(json.dumps({
+        "id": "stub", "executable": "true", "script": "stub.sh",
+        "input_ports": ["in0"], "output_ports": ["out"],
+    }))
+    names = list(dict.fromkeys(m for edge in edges for m in edge))
+    (root / "wf.json").write_text(json.dumps({
+        "workflow_id": "arrays",
+        "modules": [{"id": m, "ref": "stub.json"} for m in names],
+        "connections": [{"from": {"module": src, "output": "out"},
+                         "to": {"module": dst, "input": "in0"}} for src, dst in edges],
+    }))
+    return Workflow.from_file(root / "wf.json", registry=ModuleRegistry(cache_file=None))
+
+
+def _fanout(root: Path) -> Workflow:
+    """r -> a0..a3, each a<i> -> b<i>."""
+    return _workflow(root, [("r", f"a{i}") for i in range(4)]
+                     + [(f"a{i}", f"b{i}") for i in range(4)])
+
+
+def test_branches_become_correlated_arrays(tmp_path):
+    backend = FakeSlurmBackend(tmp_path / "run")
+    result = backend.execute(_fanout(tmp_path / "wf"))
+
+    assert result.status == "success"
+    jobs = [line.split(" ") for line in
+            (tmp_path / "run" / "bundle" / "jobs.txt").read_text().splitlines()]
+    assert [name for name, _, _ in jobs] == ["r", "array1_a", "array2_b"]
+    # task i of the second array waits for task i of the first only
+    assert jobs[2][2] == "~array1_a"
+
+
+def test_failed_array_task_only_skips_its_own_branch(tmp_path):
+    backend = FakeSlurmBackend(tmp_path / "run", fail=["a1"])
+    result = backend.execute(_fanout(tmp_path / "wf"))
+
+    status = {mod_id: res.status for mod_id, res in result.modules.items()}
+    assert status == {
+        "r": "success",
+        "a0": "success", "a1": "failed", "a2": "success", "a3": "success",
+        "b0": "success", "b1": "skipped", "b2": "success", "b3": "success",
+    }
+
+
+def test_join_waits_on_single_tasks(tmp_path):
+    # c waits for a1 and a2 only: a failure of a0 must not hold it back
+    edges = [("r", f"a{i}") for i in range(4)] + [("a1", "c"), ("a2", "c")]
+    backend = FakeSlurmBackend(tmp_path / "run", fail=["a0"])
+    result = backend.execute(_workflow(tmp_path / "wf", edges))
+
+    assert result.modules["a0"].status == "failed"
+    assert result.modules["c"].status == "success"
+    jobs = dict(line.split(" ")[::2] for line in
+                (tmp_path / "run" / "bundle" / "jobs.txt").read_text().splitlines())
+    assert jobs["c"] == "array1_a@1,array1_a@2"
+
+
+def test_failed_staging_holds_back_downstream_jobs(tmp_path):
+    # a's data file is missing: b must not be submitted without its dependency
+    wf = _workflow(tmp_path / "wf", [("a", "b")])
+    wf.module_map["a"].data_files = ["missing.dat"]
+    backend = FakeSlurmBackend(tmp_path / "run")
+    result = backend.execute(wf)
+
+    assert "data file not found" in result.modules["a"].error
+    assert result.modules["b"].status == "failed"
+    assert "not submitted" in result.modules["b"].error
+    assert not (tmp_path / "run" / "bundle" / "jobs.txt").exists()
@@ -0,0 +1,159 @@
+"""ReadyQueue dispatch and the LocalBackend runs it drives."""
+import json
+from pathlib import Path
+
+from nexa.backends.base import ModuleMetrics, ModuleResult, WorkflowResult
+from nexa.backends.local import LocalBackend
+from nexa.backends.scheduler import ReadyQueue, critical_path_priorities
+from nexa.core.history import RunHistory
+from nexa.utils.resources import ResourceBudget
+
+
+def _queue(workflow, cpus=8, max_workers=8, **kwargs) -> ReadyQueue:
+    return ReadyQueue(workflow, ResourceBudget(cpus=cpus, mem="64G"), max_workers, **kwargs)
+
+
+def test_module_becomes_ready_when_its_last_upstream_succeeds(make_workflow):
+    queue = _queue(make_workflow([("a", "c"), ("b", "c")]))
+
+    assert sorted(queue.startable()) == ["a", "b"]
+    queue.finish("a", True)
+    assert queue.startable() == []
+    queue.finish("b", True)
+    assert queue.startable() == ["c"]
+    queue.finish("c", True)
+    assert not queue.active
+
+
+def test_completed_modules_are_not_queued_again(make_workflow):
+    queue = _queue(make_workflow([("a", "b")]), done=["a"])
+
+    assert queue.startable() == ["b"]
+
+
+def test_failure_stops_new_starts(make_workflow):
+    queue = _queue(make_workflow([("a", "b")], modules={"c": {}}), max_workers=1)
+
+    assert queue.startable() == ["a"]
+    queue.finish("a", False)
+    assert queue.startable() == []
+    assert not queue.active
+
+
+def test_keep_going_runs_independent_branches_after_a_failure(make_workflow):
+    queue = _queue(make_workflow([("a", "b")], modules={"c": {}}), max_workers=1,
+                   keep_going=True)
+
+    assert queue.startable() == ["a"]
+    queue.finish("a", False)
+    assert queue.startable() == ["c"]
+    queue.finish("c", True)
+    # b is downstream of the failure and never becomes ready
+    assert not queue.active
+
+
+def test_branch_does_not_wait_for_a_slow_module_on_another_branch(tmp_path, make_workflow):
+    # with level barriers d would not start before slow a, on level 0, finished
+    wf = make_workflow([("a", "b"), ("c", "d")], modules={"a": {"parameters": {"sleep": 1.0}}})
+    result = LocalBackend(tmp_path / "run", cpus=4).execute(wf)
+
+    assert result.status == "success"
+    modules = result.modules
+    assert modules["d"].metrics.end_time < modules["a"].metrics.end_time
+    inputs = json.loads(Path(modules["b"].outputs["out"]).read_text())["inputs"]
+    assert inputs == ["in0"]
+
+
+# ── resource budget (user-002) ────────────────────────────────────────────────
+
+def test_module_too_big_for_the_remaining_cores_waits_while_smaller_ones_start(make_workflow):
+    wf = make_workflow(modules={"big": {"resources": {"cpus": 3}},
+                                "mid": {"resources": {"cpus": 2}},
+                                "small": {"resources": {"cpus": 1}}})
+    queue = _queue(wf, cpus=4)
+
+    assert queue.startable() == ["big", "small"]
+    assert queue.budget.free_cpus == 0
+    queue.finish("big", True)
+    assert queue.startable() == ["mid"]
+    assert queue.budget.free_cpus == 1
+
+
+def test_memory_is_admitted_like_cores(make_workflow):
+    wf = make_workflow(modules={"a": {"resources": {"mem": "6G"}},
+                                "b": {"resources": {"mem": "4G"}},
+                                "c": {"resources": {"mem": "2G"}}})
+    queue = ReadyQueue(wf, ResourceBudget(cpus=8, mem="8G"), 8)
+
+    assert queue.startable() == ["a", "c"]
+    queue.finish("a", True)
+    assert queue.startable() == ["b"]
+
+
+def test_oversized_module_runs_alone(make_workflow):
+    wf = make_workflow(modules={"huge": {"resources": {"cpus": 64}}, "small": {}})
+    queue = _queue(wf, cpus=4)
+
+    assert queue.requests["huge"] == (4, 0)
+    assert queue.startable() == ["huge"]
+    queue.finish("huge", True)
+    assert queue.startable() == ["small"]
+
+
+def test_local_run_never_exceeds_the_core_budget(tmp_path, make_workflow):
+    modules = {f"m{i}": {"resources": {"cpus": 2}, "parameters": {"sleep": 0.3}}
+               for i in range(4)}
+    result = LocalBackend(tmp_path / "run", cpus=4).execute(make_workflow(modules=modules))
+
+    assert result.status == "success"
+    spans = [(r.metrics.start_time, r.metrics.end_time) for r in result.modules.values()]
+    overlapping = max(sum(start <= t < end for start, end in spans) for t, _ in spans)
+    assert overlapping == 2
+
+
+# ── critical-path priority ────────────────────────────────────────────────────
+
+def test_bottom_levels_weighted_by_estimates(make_workflow):
+    wf = make_workflow([("a", "b"), ("b", "c")], modules={"x": {}})
+
+    assert critical_path_priorities(wf) == {"a": 3.0, "b": 2.0, "c": 1.0, "x": 1.0}
+    # x has no estimate and is weighted with the mean of the known ones
+    assert critical_path_priorities(wf, {"a": 1.0, "b": 1.0, "c": 7.0}) == {
+        "a": 9.0, "b": 8.0, "c": 7.0, "x": 3.0,
+    }
+
+
+def test_longest_remaining_path_starts_first(make_workflow):
+    wf = make_workflow([("x", "y")] + [(f"a{i}", f"a{i + 1}") for i in range(3)])
+    queue = _queue(wf, max_workers=1, priority=critical_path_priorities(wf))
+
+    assert queue.startable() == ["a0"]
+    queue.finish("a0", True)
+    assert queue.startable() == ["a1"]
+    queue.finish("a1", True)
+    # x and a2 both have two modules left to run; the tie goes to x, ready first
+    assert queue.startable() == ["x"]
+
+
+def test_fifo_starts_in_ready_order(make_workflow):
+    wf = make_workflow([("x", "y")] + [(f"a{i}", f"a{i + 1}") for i in range(3)])
+    queue = _queue(wf, max_workers=1)
+
+    assert queue.startable() == ["x"]
+
+
+def test_history_estimates_reorder_a_local_run(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b")], modules={"x": {}})
+    history = RunHistory(tmp_path / "history.db")
+    history.record(wf, WorkflowResult(wf.workflow_id, "success", {
+        mid: ModuleResult(mid, "success", metrics=ModuleMetrics.measured(100.0, 100.0 + wall))
+        for mid, wall in (("a", 1.0), ("b", 1.0), ("x", 10.0))
+    }), "local")
+
+    def first(**kwargs):
+        result = LocalBackend(tmp_path / "run", max_workers=1, **kwargs).execute(wf)
+        return min(result.modules, key=lambda mid: result.modules[mid].metrics.start_time)
+
+    assert first() == "a"
+    assert first(history=history) == "x"
+    assert first(history=history, schedule="fifo") == "a"
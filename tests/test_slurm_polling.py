@@ -0,0 +1,74 @@
+"""sacct/walltime parsing and batched polling of RemoteBackend."""
+import pytest
+
+from nexa.backends.remote import (
+    _parse_sacct, _slurm_duration, _slurm_walltime, _walltime_seconds,
+)
+from nexa.bench import FakeSlurmBackend
+from conftest import load_workflow, write_workflow
+
+SACCT = """\
+1001|COMPLETED|2026-01-01T10:00:00|2026-01-01T10:00:05|2026-01-01T10:01:05|01:02.500|00:01.000|
+1001.batch|COMPLETED||||||2048K
+1001.0|COMPLETED||||||512M
+1002_3|CANCELLED by 1234|2026-01-01T10:00:00|Unknown|2026-01-01T10:00:09|00:00:00|00:00:00|
+
+"""
+
+
+def test_parse_sacct_folds_steps_into_their_job():
+    jobs = _parse_sacct(SACCT)
+
+    assert sorted(jobs) == ["1001", "1002_3"]
+    state, metrics = jobs["1001"]
+    assert state == "COMPLETED"
+    assert metrics.wall_time == 60.0
+    assert metrics.queue_time == 5.0
+    assert metrics.user_cpu == 62.5
+    assert metrics.sys_cpu == 1.0
+    assert metrics.max_rss == 512 * 1024 * 1024
+
+
+def test_parse_sacct_job_that_never_started():
+    state, metrics = _parse_sacct(SACCT)["1002_3"]
+
+    assert state == "CANCELLED"
+    assert metrics.start_time is None
+    assert metrics.wall_time is None
+    assert metrics.max_rss is None
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("00:01.500", 1.5), ("12:34", 754.0), ("01:00:00", 3600.0), ("2-01:00:30", 176430.0),
+    ("", None),
+])
+def test_slurm_duration(value, seconds):
+    assert _slurm_duration(value) == seconds
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("30", 1800), ("30:15", 1815), ("02:00:00", 7200),
+    ("1-2", 93600), ("1-02:30", 95400), ("1-02:30:15", 95415),
+])
+def test_walltime_seconds(value, seconds):
+    assert _walltime_seconds(value) == seconds
+
+
+@pytest.mark.parametrize("seconds, value", [
+    (1, "00:01:00"), (3600, "01:00:00"), (3601, "01:01:00"), (90000, "1-01:00:00"),
+])
+def test_slurm_walltime_rounds_up_to_the_minute(seconds, value):
+    assert _slurm_walltime(seconds) == value
+    assert _walltime_seconds(value) >= seconds
+
+
+def test_one_squeue_and_sacct_call_per_round(tmp_path):
+    edges = [(f"m{i}", f"m{i + 1}") for i in range(12)]
+    backend = FakeSlurmBackend(tmp_path / "run")
+    result = backend.execute(load_workflow(write_workflow(tmp_path / "wf", edges)))
+
+    assert result.status == "success"
+    # every job finishes within the first round of the fake cluster
+    assert backend.slurm.calls["sbatch"] == 13
+    assert backend.slurm.calls["squeue"] == 1
+    assert backend.slurm.calls["sacct"] == 1
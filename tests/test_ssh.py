@@ -0,0 +1,72 @@
+"""SSHSession: one ControlMaster per run, every command sent through it."""
+import json
+import os
+import sys
+
+import pytest
+
+from nexa.backends.ssh import SSHSession
+
+# Logs its argv, fails the master if told to, and runs the remote command locally
+FAKE_SSH = f'''\
+#!{sys.executable}
+import json, os, subprocess, sys
+args = sys.argv[1:]
+with open(os.environ["FAKE_SSH_LOG"], "a") as f:
+    f.write(json.dumps(args) + "\\n")
+if "ControlMaster=yes" in args and os.environ.get("FAKE_SSH_REFUSE"):
+    sys.stderr.write("Permission denied (publickey)\\n")
+    sys.exit(255)
+if "-N" in args or "-O" in args:
+    sys.exit(0)
+sys.exit(subprocess.call(["sh", "-c", args[-1]]))
+'''
+
+
+@pytest.fixture
+def ssh_log(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "ssh").write_text(FAKE_SSH)
+    (bin_dir / "ssh").chmod(0o755)
+    log = tmp_path / "ssh.log"
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log))
+    return lambda: [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def test_commands_reuse_the_master_connection(ssh_log):
+    with SSHSession("cluster", username="me", private_key="/keys/id") as session:
+        control_path = session.control_path
+        assert os.path.isdir(os.path.dirname(control_path))
+        assert session.run("echo hello; exit 3") == (3, "hello\n", "")
+        assert session.run("true")[0] == 0
+
+    master, first, second, stop = ssh_log()
+    assert master[-3:] == ["-N", "-f", "cluster"]
+    assert "ControlMaster=yes" in master and f"ControlPath={control_path}" in master
+    assert ["-o", "User=me", "-i", "/keys/id"] == master[:4]
+    for command in (first, second):
+        assert f"ControlPath={control_path}" in command and "ControlMaster=no" in command
+    assert stop == ["-o", f"ControlPath={control_path}", "-O", "exit", "cluster"]
+    assert session.control_path is None
+    assert not os.path.exists(os.path.dirname(control_path))
+
+
+def test_open_is_idempotent(ssh_log):
+    session = SSHSession("cluster")
+    session.open()
+    session.open()
+    session.close()
+    session.close()
+
+    assert len(ssh_log()) == 2
+
+
+def test_refused_connection_raises(ssh_log, monkeypatch):
+    monkeypatch.setenv("FAKE_SSH_REFUSE", "1")
+    session = SSHSession("cluster")
+
+    with pytest.raises(RuntimeError, match="Permission denied"):
+        session.open()
+    assert session.control_path is None
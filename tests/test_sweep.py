@@ -0,0 +1,74 @@
+"""Sweep points and their expansion into one graph with shared instances."""
+import json
+from pathlib import Path
+
+import pytest
+
+from nexa.core import registry
+from nexa.core.registry import ModuleRegistry
+from nexa.core.sweep import expand_sweep, load_sweep_points
+from nexa.executor import UnifiedExecutor
+
+EDGES = [("prep", "sim"), ("sim", "analyse")]
+MODULES = {"prep": {"parameters": {"n": 1}},
+           "sim": {"parameters": {"temperature": 300}},
+           "analyse": {"parameters": {"bins": 10}}}
+
+
+def test_grid_is_the_cartesian_product():
+    points = load_sweep_points({"grid": {"t": [1, 2], "s": ["a", "b"]}})
+
+    assert points == [{"t": 1, "s": "a"}, {"t": 1, "s": "b"},
+                      {"t": 2, "s": "a"}, {"t": 2, "s": "b"}]
+
+
+def test_points_from_a_file(tmp_path):
+    path = tmp_path / "sweep.json"
+    path.write_text(json.dumps({"sweep": {"points": [{"t": 1}, {"t": 2, "p": 3}]}}))
+
+    assert load_sweep_points(path) == [{"t": 1}, {"t": 2, "p": 3}]
+    assert load_sweep_points([{"t": 1}]) == [{"t": 1}]
+
+
+@pytest.mark.parametrize("spec", [{"values": [1]}, [], {"grid": {"t": []}}])
+def test_invalid_or_empty_sweeps_are_rejected(spec):
+    with pytest.raises(ValueError):
+        load_sweep_points(spec)
+
+
+def test_modules_unaffected_by_the_sweep_are_shared(make_workflow):
+    wf, manifest = expand_sweep(make_workflow(EDGES, MODULES), {},
+                                [{"temperature": 298}, {"temperature": 350}])
+
+    assert [m.id for m in wf.modules] == ["prep", "sim__0", "sim__1",
+                                          "analyse__0", "analyse__1"]
+    assert [m.parameters for m in wf.modules[1:3]] == [{"temperature": 298},
+                                                       {"temperature": 350}]
+    assert wf.index.upstream_ids("sim__1") == ["prep"]
+    assert wf.index.upstream_ids("analyse__1") == ["sim__1"]
+    assert manifest[1] == {"index": 1, "parameters": {"temperature": 350},
+                           "modules": {"prep": "prep", "sim": "sim__1",
+                                       "analyse": "analyse__1"}}
+
+
+def test_repeated_points_share_every_instance(make_workflow):
+    wf, manifest = expand_sweep(make_workflow(EDGES, MODULES), {},
+                                [{"temperature": 298}, {"temperature": 298}])
+
+    assert [m.id for m in wf.modules] == ["prep", "sim", "analyse"]
+    assert manifest[0]["modules"] == manifest[1]["modules"]
+
+
+def test_sweep_run_computes_shared_modules_once(tmp_path, monkeypatch, make_workflow):
+    monkeypatch.setattr(registry, "_default", ModuleRegistry(cache_file=None))
+    make_workflow(EDGES, MODULES)
+    executor = UnifiedExecutor(str(tmp_path / "wf" / "wf.json"),
+                               sweep={"grid": {"temperature": [298, 350]}})
+    result = executor.run(workdir=str(tmp_path / "run"), history=False)
+
+    assert result.status == "success"
+    assert sorted(result.modules) == ["analyse__0", "analyse__1", "prep", "sim__0", "sim__1"]
+    out = json.loads(Path(result.modules["sim__1"].outputs["out"]).read_text())
+    assert out["params"] == {"temperature": 350}
+    manifest = json.loads((tmp_path / "run" / "sweep.json").read_text())
+    assert [point["modules"]["sim"] for point in manifest] == ["sim__0", "sim__1"]
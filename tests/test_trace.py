@@ -0,0 +1,70 @@
+"""TraceRecorder: spans, worker slots, markers and flows of a run's timeline."""
+import json
+
+from nexa.backends.local import LocalBackend
+from nexa.core.trace import TraceRecorder
+
+
+def _metrics(submit, start, end):
+    return {"submit_time": submit, "start_time": start, "end_time": end,
+            "wall_time": end - start, "max_rss": None}
+
+
+def _local(start, end):
+    return {"metrics": _metrics(start - 1, start, end), "phases": {"staging": (start, start)}}
+
+
+def _by_name(events):
+    return {(e["name"], e["ph"]): e for e in events}
+
+
+def test_local_modules_are_packed_onto_worker_slots(make_workflow):
+    wf = make_workflow([("a", "c"), ("b", "c")], {"d": {}})
+    forwarded = []
+    recorder = TraceRecorder(wf, lambda *event: forwarded.append(event[:2]))
+    recorder("module_start", "a", {})
+    recorder("module_complete", "a", _local(10.0, 12.0))
+    recorder("module_failed", "b", {"error": "boom", **_local(11.0, 13.0)})
+    recorder("module_complete", "c", _local(14.0, 15.0))
+    recorder("module_complete", "d", {"cached": True})
+    events = _by_name(recorder.events())
+
+    assert forwarded[:2] == [("module_start", "a"), ("module_complete", "a")]
+    assert [events[m, "X"]["tid"] for m in "abc"] == [1, 2, 1]
+    assert events["b", "X"]["args"]["status"] == "failed"
+    # times are microseconds from the first event (a's submission)
+    assert events["a", "X"]["ts"] == 1e6 and events["a", "X"]["dur"] == 2e6
+    assert events["a", "b"]["pid"] == events["a", "e"]["pid"] == 2   # ready-queue wait
+    assert events["d (cached)", "i"]["pid"] == 0
+    flows = [e for e in recorder.events() if e.get("cat") == "flow"]
+    assert [(e["ph"], e["tid"]) for e in flows] == [("s", 1), ("f", 1), ("s", 2), ("f", 1)]
+
+
+def test_slurm_jobs_get_a_track_each(make_workflow):
+    wf = make_workflow([("a", "b")])
+    recorder = TraceRecorder(wf)
+    for mid, job_id, start in (("a", "1001", 10.0), ("b", "1002", 20.0)):
+        recorder("module_complete", mid, {"metrics": _metrics(5.0, start, start + 5),
+                                          "phases": {"sync": (start + 5, start + 6)},
+                                          "job_id": job_id})
+    # cancelled before it started: nothing to draw
+    recorder("module_failed", "c", {"skipped": True, "metrics": {"submit_time": 5.0},
+                                    "job_id": "1003"})
+    events = recorder.events()
+    names = {e["args"]["name"] for e in events if e["name"] == "thread_name"}
+
+    assert names == {"orchestrator", "job 1001 (a)", "job 1002 (b)"}
+    queue = _by_name(events)["b [queue]", "X"]
+    assert queue["ts"] == 0 and queue["dur"] == 15e6
+
+
+def test_run_writes_a_trace_file(tmp_path, make_workflow):
+    wf = make_workflow([("a", "b")])
+    recorder = TraceRecorder(wf)
+    result = LocalBackend(tmp_path / "run", on_event=recorder).execute(wf)
+    recorder.add_result(result)
+    recorder.write(tmp_path / "trace.json")
+
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    assert trace["displayTimeUnit"] == "ms"
+    assert {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"} >= {"a", "b"}
@@ -0,0 +1,61 @@
+"""WarmWorkerPool: modules run in pre-forked workers, and a dead worker fails only its module."""
+import threading
+
+import pytest
+
+from nexa.backends.async_local import AsyncLocalBackend
+from nexa.backends.local import LocalBackend
+from nexa.backends.worker_pool import WORKER_DIED, WarmWorkerPool
+
+
+@pytest.fixture
+def pool():
+    with WarmWorkerPool(workers=2) as pool:
+        yield pool
+
+
+def _script(tmp_path, name, body):
+    path = tmp_path / f"{name}.py"
+    path.write_text(body)
+    return path, tmp_path / f"{name}.out", tmp_path / f"{name}.err"
+
+
+def test_runs_script_as_main(tmp_path, pool):
+    script, out, err = _script(tmp_path, "ok", "import sys\nif __name__ == '__main__':\n"
+                                               "    print(sys.argv[1:])\n    sys.exit(4)\n")
+    returncode, usage = pool.run(script, ["--x", "1"], out, err)
+    assert returncode == 4
+    assert out.read_text() == "['--x', '1']\n"
+    assert usage["max_rss"] > 0
+
+
+def test_crashed_worker_fails_its_module_and_is_replaced(tmp_path, pool):
+    script, out, err = _script(tmp_path, "crash", "import os\nos._exit(3)\n")
+    returncode, _ = pool.run(script, [], out, err)
+    assert returncode == WORKER_DIED
+    assert "worker died" in err.read_text()
+
+    script, out, err = _script(tmp_path, "after", "print('still here')\n")
+    assert pool.run(script, [], out, err)[0] == 0
+    assert out.read_text() == "still here\n"
+
+
+def test_crash_does_not_fail_modules_in_other_workers(tmp_path, pool):
+    slow, out, err = _script(tmp_path, "slow", "import time\ntime.sleep(1)\nprint('done')\n")
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(slow=pool.run(slow, [], out, err)))
+    thread.start()
+    crash, out, err = _script(tmp_path, "crash", "import os\nos._exit(3)\n")
+    assert pool.run(crash, [], out, err)[0] == WORKER_DIED
+    thread.join()
+    assert results["slow"][0] == 0
+
+
+@pytest.mark.parametrize("backend", [LocalBackend, AsyncLocalBackend])
+def test_run_with_crashing_module_finishes(tmp_path, make_workflow, backend):
+    wf = make_workflow([("a", "b")], {"c": {"parameters": {"crash": True}}})
+    with WarmWorkerPool(workers=2) as pool:
+        result = backend(tmp_path / "run", warm_pool=pool).execute(wf)
+    assert result.status == "failed"
+    assert result.modules["c"].status == "failed"
+    assert result.modules["c"].returncode == WORKER_DIED